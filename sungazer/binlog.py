@@ -0,0 +1,638 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, get_args
+
+from . import jsonlib
+from .models import DeviceDetailResponse
+from .models.timestamps import parse_epoch_timestamp
+from .store import TABLES, _table_for
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import datetime
+
+    from .models.devices import BaseDeviceDetail
+
+#: The first bytes of every binary log: a signature and the format version
+MAGIC = b"SGZLOG\x00\x01"
+
+#: A frame defining the next string in the string table
+_STRING = 0x53  # "S"
+#: A frame defining the layout of one kind of device
+_KIND = 0x4B  # "K"
+#: A frame holding one device's sample
+_RECORD = 0x52  # "R"
+
+#: How each SQLite column type of :py:data:`sungazer.store.TABLES` is packed:
+#: a float64, an int64, or the index of a string in the string table
+_FORMATS = {"REAL": "d", "INTEGER": "q", "TEXT": "I"}
+
+#: A value of each format that stands in for ``None``
+_ZERO = {"d": 0.0, "q": 0, "?": False, "I": 0}
+
+
+class BinlogError(ValueError):
+    """
+    Raised when a file is not a binary log, or is corrupt before its end.
+    """
+
+
+def _varint(value: int) -> bytes:
+    """Encode a non-negative integer as an LEB128 varint."""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(buffer: Any, offset: int, end: int) -> tuple[int, int]:
+    """
+    Decode an LEB128 varint.
+
+    Args:
+        buffer: The bytes to read from
+        offset: Where the varint starts
+        end: Where the readable bytes end
+
+    Raises:
+        IndexError: If the varint runs past ``end``
+
+    Returns:
+        The value, and the offset just after the varint
+
+    """
+    value = shift = 0
+    while True:
+        if offset >= end:
+            raise IndexError(offset)
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    """Map a signed integer to an unsigned one, keeping small values small."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    """Undo :py:func:`_zigzag`."""
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def _frame(tag: int, payload: bytes) -> bytes:
+    """Wrap a payload in a frame: its tag, its length and the payload."""
+    return bytes((tag,)) + _varint(len(payload)) + payload
+
+
+def _text(value: str) -> bytes:
+    """Encode a string as its UTF-8 length and bytes."""
+    data = value.encode()
+    return _varint(len(data)) + data
+
+
+class RecordLayout:
+    """
+    The fixed-width layout of the samples of one kind of device.
+
+    A sample is a bitmap with a bit set for each column that is ``None``,
+    followed by every column packed little-endian at a fixed offset: floats
+    as float64, integers as int64, booleans as one byte, and text as the
+    index of the string in the log's string table.
+
+    Args:
+        kind: The kind of device, such as ``"inverter"``
+        columns: The name and :py:mod:`struct` format character of each
+            column
+
+    """
+
+    def __init__(self, kind: str, columns: list[tuple[str, str]]):
+        #: The kind of device
+        self.kind = kind
+        #: The name and format character of each column
+        self.columns = columns
+        #: The names of the columns
+        self.names = [name for name, _ in columns]
+        #: How many bytes the ``None`` bitmap takes
+        self.bitmap_size = (len(columns) + 7) // 8
+        formats = "".join(code for _, code in columns)
+        #: Packs and unpacks a whole sample
+        self.struct = struct.Struct(f"<{self.bitmap_size}s{formats}")
+        #: The offset and :py:class:`struct.Struct` of each column
+        self.fields: dict[str, tuple[int, int, struct.Struct]] = {}
+        offset = self.bitmap_size
+        for position, (name, code) in enumerate(columns):
+            field = struct.Struct(f"<{code}")
+            self.fields[name] = (position, offset, field)
+            offset += field.size
+
+    @classmethod
+    def for_model(cls, model: type[BaseDeviceDetail]) -> RecordLayout:
+        """
+        Derive the layout of a device model from its fields.
+
+        The columns are those of the model's table in
+        :py:data:`sungazer.store.TABLES`.
+
+        Args:
+            model: The device model
+
+        Returns:
+            The layout
+
+        """
+        table = _table_for(model)
+        columns = []
+        for name, column_type in table.columns:
+            code = _FORMATS[column_type]
+            if bool in get_args(model.model_fields[name].annotation):
+                code = "?"
+            columns.append((name, code))
+        return cls(table.kind, columns)
+
+    def pack(self, values: list[Any], strings: list[int | None]) -> bytes:
+        """
+        Pack one sample.
+
+        Args:
+            values: The value of each column, with ``None`` for missing ones;
+                text columns are ignored here
+            strings: For each column, the string table index of its text, or
+                ``None`` if it isn't a text column
+
+        Returns:
+            The packed sample
+
+        """
+        missing = 0
+        packed = []
+        for position, ((_, code), value, index) in enumerate(
+            zip(self.columns, values, strings, strict=True)
+        ):
+            if code == "I":
+                value = index  # noqa: PLW2901
+            if value is None:
+                missing |= 1 << position
+                value = _ZERO[code]  # noqa: PLW2901
+            packed.append(value)
+        return self.struct.pack(missing.to_bytes(self.bitmap_size, "little"), *packed)
+
+    def encode(self) -> bytes:
+        """Encode the layout for a kind frame."""
+        out = bytearray(_text(self.kind))
+        out += _varint(len(self.columns))
+        for name, code in self.columns:
+            out += _text(name)
+            out += code.encode()
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, buffer: Any, offset: int, end: int) -> RecordLayout:
+        """
+        Decode a layout written by :py:meth:`encode`.
+
+        Args:
+            buffer: The bytes to read from
+            offset: Where the layout starts
+            end: Where it ends
+
+        Returns:
+            The layout
+
+        """
+
+        def text(offset: int) -> tuple[str, int]:
+            size, offset = _read_varint(buffer, offset, end)
+            return bytes(buffer[offset : offset + size]).decode(), offset + size
+
+        kind, offset = text(offset)
+        count, offset = _read_varint(buffer, offset, end)
+        columns = []
+        for _ in range(count):
+            name, offset = text(offset)
+            columns.append((name, chr(buffer[offset])))
+            offset += 1
+        return cls(kind, columns)
+
+
+#: The layout of each device model
+LAYOUTS: dict[type[BaseDeviceDetail], RecordLayout] = {
+    model: RecordLayout.for_model(model) for model in TABLES
+}
+
+
+class BinlogRecord:
+    """
+    One device's sample, read from a binary log.
+
+    Values are unpacked from the reader's memory map when they are asked for,
+    so iterating over a log copies nothing but the record headers.  A record
+    can't be read once its reader is closed.
+    """
+
+    __slots__ = ("_offset", "_reader", "layout", "serial", "timestamp")
+
+    def __init__(
+        self,
+        reader: BinlogReader,
+        layout: RecordLayout,
+        serial: str,
+        timestamp: int,
+        offset: int,
+    ):
+        self._reader = reader
+        #: The layout of the sample
+        self.layout = layout
+        #: The serial number of the device
+        self.serial = serial
+        #: The ``DATATIME`` of the sample, in seconds since the epoch
+        self.timestamp = timestamp
+        self._offset = offset
+
+    def __repr__(self) -> str:
+        return f"<BinlogRecord {self.layout.kind} {self.serial} @ {self.timestamp}>"
+
+    @property
+    def kind(self) -> str:
+        """Return the kind of device, such as ``"inverter"``."""
+        return self.layout.kind
+
+    @property
+    def DATATIME(self) -> datetime:
+        """Return the ``DATATIME`` of the sample."""
+        return parse_epoch_timestamp(self.timestamp)
+
+    def __getitem__(self, name: str) -> Any:
+        """
+        Return the value of one column.
+
+        Args:
+            name: The name of the column
+
+        Raises:
+            KeyError: If the layout has no such column
+
+        Returns:
+            The value, or ``None`` if the device didn't report it
+
+        """
+        position, offset, field = self.layout.fields[name]
+        buffer = self._reader.buffer
+        if buffer[self._offset + position // 8] & (1 << position % 8):
+            return None
+        (value,) = field.unpack_from(buffer, self._offset + offset)
+        if field.format == "<I":
+            return self._reader.strings[value]
+        return value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return the value of a column, or ``default`` if there's no such column."""
+        if name not in self.layout.fields:
+            return default
+        return self[name]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the sample as a dict.
+
+        Returns:
+            ``SERIAL``, ``DATATIME`` (as a timezone-aware datetime) and every
+            column, with ``None`` for values the device didn't report
+
+        """
+        layout = self.layout
+        missing, *values = layout.struct.unpack_from(self._reader.buffer, self._offset)
+        missing = int.from_bytes(missing, "little")
+        strings = self._reader.strings
+        result: dict[str, Any] = {"SERIAL": self.serial, "DATATIME": self.DATATIME}
+        for position, ((name, code), value) in enumerate(
+            zip(layout.columns, values, strict=True)
+        ):
+            if missing & (1 << position):
+                result[name] = None
+            elif code == "I":
+                result[name] = strings[value]
+            else:
+                result[name] = value
+        return result
+
+
+class BinlogReader:
+    """
+    Read a binary log written by :py:class:`BinlogWriter`, through a memory
+    map.
+
+    The file is mapped read-only when the reader is created, so records
+    appended after that are not seen; create a new reader to see them.  A
+    frame cut short at the end of the file, as a crash while writing leaves
+    it, is ignored.
+
+    Example:
+        .. code-block:: python
+
+            with BinlogReader("site.sgzlog") as log:
+                for record in log:
+                    if record.kind == "inverter":
+                        print(record.serial, record.DATATIME, record["p_3phsum_kw"])
+
+    Args:
+        path: The log file
+
+    Raises:
+        BinlogError: If the file is not a binary log, or is corrupt
+
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        #: The log file
+        self.path = Path(path).expanduser()
+        #: The strings of the string table, by index
+        self.strings: list[str] = []
+        #: The layout of each kind of device, by index
+        self.layouts: list[RecordLayout] = []
+        #: Where the last complete frame ends
+        self.end = len(MAGIC)
+        with self.path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._map = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            )
+        #: The mapped file
+        self.buffer = (
+            memoryview(self._map) if self._map is not None else memoryview(b"")
+        )
+        if bytes(self.buffer[: len(MAGIC)]) != MAGIC:
+            self.close()
+            msg = f"{self.path} is not a sungazer binary log"
+            raise BinlogError(msg)
+
+    def __enter__(self):
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Unmap the file."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file.  Records read from it can't be used afterwards."""
+        self.buffer.release()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __iter__(self) -> Iterator[BinlogRecord]:
+        """
+        Iterate over the samples in the log, in the order they were written.
+
+        Raises:
+            BinlogError: If a frame is corrupt
+
+        Yields:
+            Each sample
+
+        """
+        buffer = self.buffer
+        size = len(buffer)
+        offset = len(MAGIC)
+        timestamp = 0
+        self.strings = strings = []
+        self.layouts = layouts = []
+        while offset < size:
+            try:
+                tag = buffer[offset]
+                length, start = _read_varint(buffer, offset + 1, size)
+            except IndexError:
+                break
+            end = start + length
+            if end > size:
+                break
+            if tag == _RECORD:
+                kind, position = _read_varint(buffer, start, end)
+                serial, position = _read_varint(buffer, position, end)
+                delta, position = _read_varint(buffer, position, end)
+                timestamp += _unzigzag(delta)
+                layout = layouts[kind]
+                if end - position != layout.struct.size:
+                    msg = f"Corrupt record at byte {offset} of {self.path}"
+                    raise BinlogError(msg)
+                self.end = end
+                yield BinlogRecord(self, layout, strings[serial], timestamp, position)
+            elif tag == _STRING:
+                strings.append(bytes(buffer[start:end]).decode())
+            elif tag == _KIND:
+                layouts.append(RecordLayout.decode(buffer, start, end))
+            else:
+                msg = f"Unknown frame {tag:#x} at byte {offset} of {self.path}"
+                raise BinlogError(msg)
+            self.end = end
+            offset = end
+
+
+class BinlogWriter:
+    """
+    Append ``DeviceList`` samples to a compact binary log.
+
+    Each device's sample is one record: the kind of device, the index of its
+    serial number in the log's string table, its ``DATATIME`` as a
+    zig-zag varint delta from the previous record's, and its metric fields
+    in the fixed-width layout of its :py:class:`RecordLayout`.  Strings
+    (serial numbers and text values such as ``STATE``) and layouts are
+    written once, the first time they are used.  Device metadata such as
+    ``MODEL`` or ``SWVER`` is not logged; see :py:mod:`sungazer.store` for
+    that.
+
+    The file is opened for appending: an existing log is read first, to
+    pick up its string table and layouts, and a frame cut short at its end
+    by a crash is dropped.  If a kind's layout in the log differs from the
+    current one, the current one is written again as a new layout.  Writes
+    are buffered and the file is fsynced at most every ``fsync_interval``
+    seconds, so an SD card sees a few large writes instead of one per poll.
+
+    Example:
+        .. code-block:: python
+
+            with BinlogWriter("site.sgzlog", fsync_interval=60) as log:
+                while True:
+                    log.write(client.devices.list())
+                    time.sleep(60)
+
+    Args:
+        path: The log file; it is created if needed
+
+    Keyword Args:
+        fsync_interval: The most seconds between fsyncs; ``0`` fsyncs after
+            every write, and ``None`` only on :py:meth:`sync` and
+            :py:meth:`close`
+
+    Raises:
+        BinlogError: If the file exists but is not a binary log
+
+    """
+
+    def __init__(self, path: str | os.PathLike, *, fsync_interval: float | None = 5.0):
+        #: The log file
+        self.path = Path(path).expanduser()
+        #: The most seconds between fsyncs
+        self.fsync_interval = fsync_interval
+        #: The index of each string in the string table
+        self._strings: dict[str, int] = {}
+        #: Every layout in the log, by index
+        self._layout_table: list[RecordLayout] = []
+        #: The index of the layout each kind is written with
+        self._layouts: dict[str, int] = {}
+        #: The timestamp of the last record
+        self._timestamp = 0
+        end = 0
+        if self.path.exists() and self.path.stat().st_size:
+            with BinlogReader(self.path) as reader:
+                for record in reader:
+                    self._timestamp = record.timestamp
+                self._strings = {value: i for i, value in enumerate(reader.strings)}
+                self._layout_table = list(reader.layouts)
+                self._layouts = {
+                    layout.kind: i for i, layout in enumerate(reader.layouts)
+                }
+                end = reader.end
+        self._file = self.path.open("ab")
+        if end:
+            self._file.truncate(end)
+        else:
+            self._file.truncate(0)
+            self._file.write(MAGIC)
+        self._synced = time.monotonic()
+
+    def __enter__(self):
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Write everything to disk and close the file."""
+        self.close()
+
+    def _string(self, value: str, out: bytearray) -> int:
+        """Return the index of a string, adding it to the string table if needed."""
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+            out += _frame(_STRING, value.encode())
+        return index
+
+    def _layout(self, layout: RecordLayout, out: bytearray) -> int:
+        """
+        Return the index of a layout, writing it to the log if needed.
+
+        A log written before a model gained or lost fields holds an older
+        layout for its kind; the current layout is then written as a new
+        kind frame, and later records refer to it.
+        """
+        index = self._layouts.get(layout.kind)
+        if index is not None:
+            stored = self._layout_table[index]
+            if stored is layout:
+                return index
+            if stored.columns == layout.columns:
+                self._layout_table[index] = layout
+                return index
+        index = self._layouts[layout.kind] = len(self._layout_table)
+        self._layout_table.append(layout)
+        out += _frame(_KIND, layout.encode())
+        return index
+
+    def write(self, snapshot: DeviceDetailResponse | Iterable[Any]) -> int:
+        """
+        Append one snapshot.
+
+        Devices without a ``SERIAL`` or a ``DATATIME`` are skipped.
+
+        Args:
+            snapshot: A response, or an iterable of device models
+
+        Returns:
+            How many records were written
+
+        """
+        devices = (
+            snapshot.devices or []
+            if isinstance(snapshot, DeviceDetailResponse)
+            else snapshot
+        )
+        out = bytearray()
+        count = 0
+        for device in devices:
+            if device.SERIAL is None or device.DATATIME is None:
+                continue
+            layout = LAYOUTS.get(type(device)) or RecordLayout.for_model(type(device))
+            kind = self._layout(layout, out)
+            serial = self._string(device.SERIAL, out)
+            timestamp = int(device.DATATIME.timestamp())
+            values = device.__dict__
+            row = [values[name] for name in layout.names]
+            strings = [
+                self._string(value, out) if code == "I" and value is not None else None
+                for (_, code), value in zip(layout.columns, row, strict=True)
+            ]
+            payload = (
+                _varint(kind)
+                + _varint(serial)
+                + _varint(_zigzag(timestamp - self._timestamp))
+                + layout.pack(row, strings)
+            )
+            out += _frame(_RECORD, payload)
+            self._timestamp = timestamp
+            count += 1
+        self._file.write(out)
+        if self.fsync_interval is not None and (
+            time.monotonic() - self._synced >= self.fsync_interval
+        ):
+            self.sync()
+        return count
+
+    def sync(self) -> None:
+        """Flush the write buffer and fsync the file."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced = time.monotonic()
+
+    def close(self) -> None:
+        """Write everything to disk and close the file."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+def convert_json(
+    sources: Iterable[str | os.PathLike], destination: str | os.PathLike
+) -> int:
+    """
+    Append ``Command=DeviceList`` bodies saved as JSON files to a binary log.
+
+    Each file is parsed with
+    ``DeviceDetailResponse.new(obj, tolerant=True)``, so records that fail
+    validation are skipped rather than stopping the conversion.
+
+    Args:
+        sources: The JSON files, in the order to append them
+        destination: The log file; it is created if needed
+
+    Returns:
+        How many records were written
+
+    """
+    count = 0
+    with BinlogWriter(destination, fsync_interval=None) as log:
+        for source in sources:
+            obj = jsonlib.loads(Path(source).read_bytes())
+            count += log.write(DeviceDetailResponse.new(obj, tolerant=True))
+    return count
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import enum
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+#: Status codes that mean the PVS6 (or a proxy in front of it) is unavailable
+BREAKER_STATUS_CODES: frozenset[int] = frozenset({502, 503, 504})
+
+#: Exceptions that mean the PVS6 could not be reached
+BREAKER_EXCEPTIONS: tuple[type[BaseException], ...] = (httpx.TransportError,)
+
+
+class BreakerState(str, enum.Enum):
+    """The states of a :py:class:`CircuitBreaker`."""
+
+    #: Requests are sent as usual
+    CLOSED = "closed"
+    #: Requests fail fast with :py:exc:`CircuitOpenError`
+    OPEN = "open"
+    #: The cooldown has passed; a trial request is allowed through
+    HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while a circuit breaker is open.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        """
+        Initialize the exception.
+
+        Args:
+            name: The name of the breaker, usually the device's base URL
+            retry_after: Seconds until the breaker will allow a trial request
+
+        """
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit for {name or 'device'} is open; retry in {retry_after:.1f}s"
+        )
+
+
+class BreakerStatus(BaseModel):
+    """
+    A point-in-time view of a :py:class:`CircuitBreaker`, for monitoring.
+    """
+
+    #: The name of the breaker, usually the device's base URL
+    name: str
+    #: The current state
+    state: BreakerState
+    #: Consecutive failures since the last success
+    consecutive_failures: int = 0
+    #: How many times the breaker has opened
+    times_opened: int = 0
+    #: How many calls were rejected without being sent
+    rejected: int = 0
+    #: Seconds until a trial request is allowed, if the breaker is open
+    retry_after: float | None = Field(None, examples=[12.5])
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a device that keeps failing.
+
+    The breaker starts *closed*.  After ``failure_threshold`` consecutive
+    failures it *opens*, and every call fails immediately with
+    :py:exc:`CircuitOpenError` instead of waiting for the device to time out.
+    Once ``cooldown`` seconds have passed it becomes *half-open* and lets
+    ``half_open_max_calls`` trial calls through: if one succeeds the breaker
+    closes again, and if one fails it re-opens for another cooldown.
+
+    A call fails if it raises one of ``failure_exceptions`` or returns a
+    response whose status code is in ``failure_status``.  Other errors (for
+    instance a ``500`` from a reachable PVS6) are passed through without
+    tripping the breaker.
+
+    This breaker is thread-safe; one instance may be shared by the sync and
+    async clients for the same device.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str = "",
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        half_open_max_calls: int = 1,
+        failure_status: Iterable[int] = BREAKER_STATUS_CODES,
+        failure_exceptions: Iterable[type[BaseException]] = BREAKER_EXCEPTIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the breaker.
+
+        Keyword Args:
+            name: A name for the breaker, used in errors and monitoring
+            failure_threshold: Consecutive failures before the breaker opens
+            cooldown: Seconds to stay open before allowing a trial call
+            half_open_max_calls: Trial calls allowed at once while half-open
+            failure_status: Status codes that count as failures
+            failure_exceptions: Exception types that count as failures
+            clock: The monotonic clock the cooldown is measured against
+
+        Raises:
+            ValueError: If ``failure_threshold`` or ``half_open_max_calls`` is
+                less than 1, or ``cooldown`` is negative
+
+        """
+        if failure_threshold < 1:
+            msg = f"failure_threshold must be at least 1, got {failure_threshold}"
+            raise ValueError(msg)
+        if half_open_max_calls < 1:
+            msg = f"half_open_max_calls must be at least 1, got {half_open_max_calls}"
+            raise ValueError(msg)
+        if cooldown < 0:
+            msg = f"cooldown must not be negative, got {cooldown}"
+            raise ValueError(msg)
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_status = frozenset(failure_status)
+        self.failure_exceptions = tuple(failure_exceptions)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        #: Consecutive failures since the last success
+        self.consecutive_failures: int = 0
+        #: How many times the breaker has opened
+        self.times_opened: int = 0
+        #: How many calls were rejected without being sent
+        self.rejected: int = 0
+
+    def _current_state(self) -> BreakerState:
+        """
+        Return the state, moving from open to half-open once cooled down.
+
+        The caller must hold :py:attr:`_lock`.
+        """
+        if (
+            self._state is BreakerState.OPEN
+            and self.clock() - self._opened_at >= self.cooldown
+        ):
+            self._state = BreakerState.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def _retry_after(self) -> float:
+        """
+        Return the seconds until the breaker half-opens.
+
+        The caller must hold :py:attr:`_lock`.
+        """
+        return max(0.0, self._opened_at + self.cooldown - self.clock())
+
+    @property
+    def state(self) -> BreakerState:
+        """The current state of the breaker."""
+        with self._lock:
+            return self._current_state()
+
+    def status(self) -> BreakerStatus:
+        """
+        Return a snapshot of the breaker for monitoring.
+
+        Returns:
+            The breaker's current state and counters
+
+        """
+        with self._lock:
+            state = self._current_state()
+            return BreakerStatus(
+                name=self.name,
+                state=state,
+                consecutive_failures=self.consecutive_failures,
+                times_opened=self.times_opened,
+                rejected=self.rejected,
+                retry_after=(
+                    self._retry_after() if state is BreakerState.OPEN else None
+                ),
+            )
+
+    def before_call(self) -> None:
+        """
+        Reserve permission to make a call.
+
+        Every successful :py:meth:`before_call` must be followed by exactly one
+        of :py:meth:`record_success`, :py:meth:`record_failure` or
+        :py:meth:`release`.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all
+                trial calls already in flight
+
+        """
+        with self._lock:
+            state = self._current_state()
+            if state is BreakerState.CLOSED:
+                return
+            if (
+                state is BreakerState.HALF_OPEN
+                and self._trials < self.half_open_max_calls
+            ):
+                self._trials += 1
+                return
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self._retry_after())
+
+    def record_success(self) -> None:
+        """
+        Record a successful call, closing the breaker.
+        """
+        with self._lock:
+            self.consecutive_failures = 0
+            self._state = BreakerState.CLOSED
+            self._trials = 0
+
+    def record_failure(self) -> None:
+        """
+        Record a failed call, opening the breaker if the threshold is reached.
+
+        A failed trial call while half-open re-opens the breaker at once.
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            state = self._current_state()
+            if state is BreakerState.HALF_OPEN or (
+                state is BreakerState.CLOSED
+                and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._state = BreakerState.OPEN
+                self._opened_at = self.clock()
+                self.times_opened += 1
+
+    def release(self) -> None:
+        """
+        Give back a reserved call whose outcome says nothing about the device,
+        e.g. one that was cancelled.
+        """
+        with self._lock:
+            if self._state is BreakerState.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def _record(self, response: httpx.Response) -> httpx.Response:
+        """
+        Record the outcome of a call that returned ``response``.
+        """
+        if response.status_code in self.failure_status:
+            self.record_failure()
+        else:
+            self.record_success()
+        return response
+
+    def call(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Call ``send`` through the breaker.
+
+        Args:
+            send: Sends the request and returns the response
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+
+        Returns:
+            The response returned by ``send``
+
+        """
+        self.before_call()
+        try:
+            response = send()
+        except self.failure_exceptions:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        return self._record(response)
+
+    async def acall(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Await ``send()`` through the breaker.
+
+        This is the asyncio counterpart of :py:meth:`call`.
+
+        Args:
+            send: Returns an awaitable that sends the request
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+
+        Returns:
+            The response returned by ``send``
+
+        """
+        self.before_call()
+        try:
+            response = await send()
+        except self.failure_exceptions:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        return self._record(response)
+
+
+class CircuitBreakerRegistry:
+    """
+    Hand out one :py:class:`CircuitBreaker` per device base URL.
+
+    Keep a single registry for a fleet so that every client talking to the
+    same PVS6 shares its breaker, and use :py:meth:`snapshot` to see which
+    devices are currently being skipped.
+
+    Example:
+        .. code-block:: python
+
+            breakers = CircuitBreakerRegistry(failure_threshold=3, cooldown=300)
+            client = SungazerClient(base_url=url, breaker=breakers.get(url))
+            ...
+            for status in breakers.snapshot():
+                print(status.name, status.state)
+
+    """
+
+    def __init__(self, **breaker_kwargs):
+        """
+        Initialize the registry.
+
+        Keyword Args:
+            **breaker_kwargs: Passed to each new :py:class:`CircuitBreaker`
+
+        """
+        self.breaker_kwargs = breaker_kwargs
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, base_url: str) -> CircuitBreaker:
+        """
+        Return the breaker for ``base_url``, creating it if needed.
+
+        Args:
+            base_url: The base URL of the device's API
+
+        """
+        with self._lock:
+            breaker = self._breakers.get(base_url)
+            if breaker is None:
+                breaker = CircuitBreaker(name=base_url, **self.breaker_kwargs)
+                self._breakers[base_url] = breaker
+            return breaker
+
+    def state(self, base_url: str) -> BreakerState:
+        """
+        Return the state of the breaker for ``base_url``.
+
+        Devices that have never been called are reported as closed.
+
+        Args:
+            base_url: The base URL of the device's API
+
+        """
+        with self._lock:
+            breaker = self._breakers.get(base_url)
+        return BreakerState.CLOSED if breaker is None else breaker.state
+
+    def snapshot(self) -> list[BreakerStatus]:
+        """
+        Return the status of every breaker, for monitoring.
+
+        Returns:
+            One :py:class:`BreakerStatus` per device seen so far
+
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.status() for breaker in breakers]
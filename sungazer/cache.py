@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import abc
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+
+#: Default time-to-live in seconds for each ``Command``.  Commands that are not
+#: listed here (``Start``, ``Stop``, ``DeviceList``, ...) are not cached.
+DEFAULT_TTLS: dict[str, float] = {
+    "GridProfileRefresh": 24 * 60 * 60,
+    # :py:meth:`sungazer.client.GridProfileClient.refresh` sends this command
+    "GridProfileRefreshResponse": 24 * 60 * 60,
+    "GridProfileGet": 24 * 60 * 60,
+    "CheckFW": 60 * 60,
+    "Get_Comm": 60,
+}
+
+#: The commands :py:class:`DiskCache` stores by default: those used by the
+#: ``network``, ``firmware`` and ``grid-profile`` CLI subcommands
+DISK_CACHE_COMMANDS: frozenset[str] = frozenset(
+    {
+        "Get_Comm",
+        "CheckFW",
+        "GridProfileGet",
+        "GridProfileRefresh",
+        "GridProfileRefreshResponse",
+    }
+)
+
+
+class ResponseCache(abc.ABC):
+    """
+    Interface for caches of parsed API responses.
+
+    The clients call :py:meth:`get` before sending a request and :py:meth:`set`
+    after parsing a response, so a hit skips both the round trip and model
+    validation.  Subclass this to plug in a different storage strategy; a
+    subclass must implement every method before it can be instantiated.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Return the cached value for ``key``, or ``None`` on a miss.
+
+        Args:
+            key: The request key
+
+        """
+
+    @abc.abstractmethod
+    def set(self, key: Hashable, value: Any, command: str | None = None) -> None:
+        """
+        Cache ``value`` for ``key``.
+
+        Args:
+            key: The request key
+            value: The parsed response
+
+        Keyword Args:
+            command: The ``Command`` the request was for, used to pick a TTL
+                and for :py:meth:`invalidate`
+
+        """
+
+    @abc.abstractmethod
+    def invalidate(self, command: str | None = None) -> None:
+        """
+        Drop cached responses.
+
+        Keyword Args:
+            command: If given, only drop responses for this ``Command``;
+                otherwise drop everything
+
+        """
+
+
+class TTLCache(ResponseCache):
+    """
+    An in-memory, size-bounded LRU cache with a time-to-live per ``Command``.
+
+    This holds the parsed pydantic models themselves, so callers that get a
+    cached response share the same object.  Treat cached responses as
+    read-only.
+
+    This cache is thread-safe, and may be shared between several clients,
+    even of different sites: client requests are keyed by base URL and PVS6
+    serial number as well as by request.
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        maxsize: int = 256,
+        default_ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Keyword Args:
+            ttls: Time-to-live in seconds for each ``Command``; defaults to
+                :py:data:`DEFAULT_TTLS`
+            maxsize: The maximum number of responses to keep; the least
+                recently used response is evicted first
+            default_ttl: Time-to-live for commands not in ``ttls``; ``0``
+                means they are not cached
+            clock: The monotonic clock to measure expiry against
+
+        Raises:
+            ValueError: If ``maxsize`` is not positive
+
+        """
+        if maxsize < 1:
+            msg = f"maxsize must be at least 1, got {maxsize}"
+            raise ValueError(msg)
+        self.ttls: dict[str, float] = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        #: key -> (expires_at, command, value)
+        self._entries: OrderedDict[Hashable, tuple[float, str | None, Any]] = (
+            OrderedDict()
+        )
+        #: The number of lookups answered from the cache
+        self.hits: int = 0
+        #: The number of lookups that missed or found an expired response
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def ttl_for(self, command: str | None) -> float:
+        """
+        Return the time-to-live in seconds for ``command``.
+
+        Args:
+            command: The ``Command`` name
+
+        """
+        if command is None:
+            return self.default_ttl
+        return self.ttls.get(command, self.default_ttl)
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, command: str | None = None) -> None:
+        ttl = self.ttl_for(command)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, command, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, command: str | None = None) -> None:
+        with self._lock:
+            if command is None:
+                self._entries.clear()
+                return
+            for key in [k for k, v in self._entries.items() if v[1] == command]:
+                del self._entries[key]
+
+
+class DiskCache:
+    """
+    A persistent cache of raw response bodies, shared between processes.
+
+    Each entry is keyed by base URL, PVS6 serial number and ``Command`` and
+    stored in its own file as a one-line JSON header (including the time it
+    was stored) followed by the response bytes exactly as the device sent
+    them.  Entries older than ``max_age`` seconds are ignored.
+
+    Entries are written to a temporary file and moved into place with
+    :py:func:`os.replace`, so readers never see a partial entry.  On a miss,
+    the process holds an exclusive lock on the entry while it fetches from
+    the device, so several processes started at once (e.g. by ``cron``) send
+    only one request between them.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        max_age: float = 300,
+        commands: Iterable[str] = DISK_CACHE_COMMANDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: The directory to store entries in; it is created if
+                needed
+
+        Keyword Args:
+            max_age: How many seconds an entry may be served for
+            commands: The ``Command`` names this cache applies to
+
+        """
+        self.directory = Path(directory).expanduser()
+        self.max_age = max_age
+        self.commands = frozenset(commands)
+
+    def path_for(self, base_url: str, serial: str | None, command: str) -> Path:
+        """
+        Return the path of the entry for a request.
+
+        Args:
+            base_url: The base URL of the device's API
+            serial: The serial number of the PVS6
+            command: The ``Command`` name
+
+        """
+        key = "\0".join((base_url, serial or "", command))
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{command}-{digest[:32]}.cache"
+
+    def _read(self, path: Path) -> bytes | None:
+        """
+        Return the body stored at ``path`` if it is younger than ``max_age``.
+        """
+        try:
+            with path.open("rb") as f:
+                header = json.loads(f.readline())
+                if time.time() - header["stored_at"] >= self.max_age:
+                    return None
+                return f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write(
+        self,
+        path: Path,
+        content: bytes,
+        base_url: str,
+        serial: str | None,
+        command: str,
+    ) -> None:
+        """
+        Atomically replace the entry at ``path`` with ``content``.
+        """
+        header = {
+            "stored_at": time.time(),
+            "base_url": base_url,
+            "serial": serial,
+            "command": command,
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            Path(tmp_name).replace(path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @contextlib.contextmanager
+    def _locked(self, path: Path) -> Iterator[None]:
+        """
+        Hold an exclusive lock on the entry at ``path``.
+
+        Where :py:mod:`fcntl` is unavailable this does nothing; atomic
+        replacement still prevents torn reads.
+        """
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+        lock_path = path.with_suffix(".lock")
+        with lock_path.open("a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def get(self, base_url: str, serial: str | None, command: str) -> bytes | None:
+        """
+        Return the cached body for a request, or ``None`` if missing or stale.
+
+        Args:
+            base_url: The base URL of the device's API
+            serial: The serial number of the PVS6
+            command: The ``Command`` name
+
+        """
+        return self._read(self.path_for(base_url, serial, command))
+
+    def get_or_fetch(
+        self,
+        base_url: str,
+        serial: str | None,
+        command: str,
+        fetch: Callable[[], bytes],
+    ) -> bytes:
+        """
+        Return the cached body for a request, fetching and storing it on a miss.
+
+        Args:
+            base_url: The base URL of the device's API
+            serial: The serial number of the PVS6
+            command: The ``Command`` name
+            fetch: Called with no arguments to get the body from the device
+                on a miss; if it raises, nothing is stored
+
+        Returns:
+            The response body
+
+        """
+        path = self.path_for(base_url, serial, command)
+        content = self._read(path)
+        if content is not None:
+            return content
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._locked(path):
+            # Another process may have refreshed the entry while we waited
+            content = self._read(path)
+            if content is not None:
+                return content
+            content = fetch()
+            self._write(path, content, base_url, serial, command)
+        return content
+
+    def invalidate(
+        self,
+        base_url: str | None = None,
+        serial: str | None = None,
+        command: str | None = None,
+    ) -> None:
+        """
+        Delete cached entries.
+
+        With no arguments every entry in :py:attr:`directory` is deleted;
+        otherwise only the entries whose request matches every argument
+        given are, so ``invalidate(command="CheckFW")`` drops the
+        ``CheckFW`` entries of every device and keeps the rest.
+
+        Keyword Args:
+            base_url: The base URL of the device's API
+            serial: The serial number of the PVS6
+            command: The ``Command`` name
+
+        """
+        wanted = {
+            name: value
+            for name, value in (
+                ("base_url", base_url),
+                ("serial", serial),
+                ("command", command),
+            )
+            if value is not None
+        }
+        # Entry file names start with their command, which narrows the search
+        pattern = "*.cache" if command is None else f"{command}-*.cache"
+        for path in self.directory.glob(pattern):
+            if wanted:
+                header = self._header(path)
+                if header is None or any(
+                    header.get(name) != value for name, value in wanted.items()
+                ):
+                    continue
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _header(path: Path) -> dict[str, Any] | None:
+        """
+        Return the header of the entry at ``path``, or ``None`` if unreadable.
+        """
+        try:
+            with path.open("rb") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
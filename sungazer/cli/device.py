@@ -1,12 +1,11 @@
 """Device management commands for Sungazer PVS6 API."""
 
-import json
-
 import click
 from rich.console import Console
 from rich.table import Table
 
-from sungazer.cli.main import OddTypeEncoder, handle_exceptions
+from sungazer import jsonlib
+from sungazer.cli.main import handle_exceptions
 
 
 @click.group(help="Device information commands.")
@@ -43,7 +42,7 @@ def list_devices(ctx):
     result = client.devices.list()
 
     if output_format == "json":
-        click.echo(json.dumps(result.model_dump(), indent=2, cls=OddTypeEncoder))
+        click.echo(jsonlib.dumps(result.model_dump(), indent=True))
     elif output_format == "table":
         console = Console()
 
@@ -74,7 +73,7 @@ def list_devices(ctx):
             # Add rows for each field in the device
             for key, value in device.items():
                 if isinstance(value, (dict, list)):
-                    formatted_value = json.dumps(value, indent=2, cls=OddTypeEncoder)
+                    formatted_value = jsonlib.dumps(value, indent=True)
                 else:
                     formatted_value = str(value)
 
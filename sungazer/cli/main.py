@@ -11,11 +11,19 @@ import click
 from rich.console import Console
 from rich.table import Table
 
+from sungazer import jsonlib
+from sungazer.cache import DiskCache
 from sungazer.client import SungazerClient
 
 
 class OddTypeEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime and IPv4Address objects."""
+    """
+    Custom JSON encoder that handles datetime and IPv4Address objects.
+
+    The CLI itself now encodes through :py:mod:`sungazer.jsonlib`, whose
+    backends handle these types natively; this is kept for code that passes
+    it to :py:func:`json.dumps`.
+    """
 
     def default(self, obj):
         if isinstance(obj, datetime):
@@ -50,6 +58,8 @@ def load_config() -> dict[str, Any]:
         "base_url": "http://sunpowerconsole.com/cgi-bin",
         "timeout": 30,
         "serial": None,
+        "cache_dir": None,
+        "cache_max_age": 300,
     }
 
     for config_file in config_files:
@@ -62,6 +72,10 @@ def load_config() -> dict[str, Any]:
                     result["timeout"] = int(config["sungazer"]["timeout"])
                 if "serial" in config["sungazer"]:
                     result["serial"] = config["sungazer"]["serial"]
+                if "cache_dir" in config["sungazer"]:
+                    result["cache_dir"] = config["sungazer"]["cache_dir"]
+                if "cache_max_age" in config["sungazer"]:
+                    result["cache_max_age"] = int(config["sungazer"]["cache_max_age"])
             break
 
     return result
@@ -78,8 +92,7 @@ def read_json_file(file_path: str) -> dict[str, Any]:
         Parsed JSON data
 
     """
-    with Path(file_path).open() as f:
-        return json.load(f)
+    return jsonlib.loads(Path(file_path).read_bytes())
 
 
 def output_formatter(data: Any, output_format: str):  # noqa: PLR0912
@@ -92,7 +105,7 @@ def output_formatter(data: Any, output_format: str):  # noqa: PLR0912
 
     """
     if output_format == "json":
-        click.echo(json.dumps(data, indent=2, cls=OddTypeEncoder))
+        click.echo(jsonlib.dumps(data, indent=True))
     elif output_format == "table":
         console = Console()
 
@@ -129,7 +142,7 @@ def output_formatter(data: Any, output_format: str):  # noqa: PLR0912
 
             for key, value in data.items():
                 if isinstance(value, (dict, list)):
-                    table.add_row(key, json.dumps(value, indent=2, cls=OddTypeEncoder))
+                    table.add_row(key, jsonlib.dumps(value, indent=True))
                 else:
                     table.add_row(key, str(value))
 
@@ -179,8 +192,31 @@ def handle_exceptions(func: Callable):
     default="json",
     help="Output format",
 )
+@click.option(
+    "--cache-dir",
+    help=(
+        "Directory for caching network, firmware and grid-profile responses "
+        "between runs"
+    ),
+    envvar="SUNGAZER_CACHE_DIR",
+)
+@click.option(
+    "--cache-max-age",
+    type=int,
+    help="Maximum age in seconds of cached responses",
+    envvar="SUNGAZER_CACHE_MAX_AGE",
+)
 @click.pass_context
-def cli(ctx, base_url: str, timeout: int, serial: str, output: str):
+def cli(
+    ctx,
+    *,
+    base_url: str,
+    timeout: int,
+    serial: str,
+    output: str,
+    cache_dir: str | None,
+    cache_max_age: int | None,
+):
     """Sungazer CLI - Command line interface for Sungazer PVS6 API."""
     # Load config from file
     config = load_config()
@@ -192,12 +228,21 @@ def cli(ctx, base_url: str, timeout: int, serial: str, output: str):
         config["timeout"] = timeout
     if serial:
         config["serial"] = serial
+    if cache_dir:
+        config["cache_dir"] = cache_dir
+    if cache_max_age is not None:
+        config["cache_max_age"] = cache_max_age
+
+    disk_cache = None
+    if config["cache_dir"]:
+        disk_cache = DiskCache(config["cache_dir"], max_age=config["cache_max_age"])
 
     # Create client
     client = SungazerClient(
         base_url=config["base_url"],
         timeout=config["timeout"],
         serial=config["serial"],
+        disk_cache=disk_cache,
     )
 
     # Store in context
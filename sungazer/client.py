@@ -1,28 +1,53 @@
 from __future__ import annotations
 
-import json
 from re import I
-from typing import Any, TypeVar, cast
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 import httpx
+from pydantic import BaseModel
 
+from . import jsonlib
 from .models import (
     CheckFWResponse,
+    DeviceClass,
     DeviceDetailResponse,
     GetCommResponse,
     GridProfileGetResponse,
     GridProfileRefreshResponse,
+    LazyDeviceDetailResponse,
     StartResponse,
     StopResponse,
 )
+from .sanitize import sanitize
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .streaming import DeviceListParser
 
-T = TypeVar("T")
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+    from .breaker import CircuitBreaker
+    from .cache import DiskCache, ResponseCache
+    from .ratelimit import AdaptiveRateLimiter
+    from .retry import RetryPolicy
+
+T = TypeVar("T", bound=BaseModel)
 
 
 class BaseClient:
     """Base client with common HTTP methods."""
 
-    def __init__(self, client: httpx.Client, serial: str | None = None):
+    def __init__(
+        self,
+        client: httpx.Client | httpx.AsyncClient,
+        serial: str | None = None,
+        *,
+        single_flight: SingleFlight | AsyncSingleFlight | None = None,
+        cache: ResponseCache | None = None,
+        disk_cache: DiskCache | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
         """
         Initialize with an httpx client.
 
@@ -30,9 +55,33 @@ class BaseClient:
             client: The httpx client to use for requests
             serial: The serial number of the PVS6 device
 
+        Keyword Args:
+            single_flight: If given, concurrent identical requests are coalesced
+                through this so that they share one round trip and one parsed
+                model
+            cache: If given, parsed responses are cached here and served
+                without contacting the device until they expire
+            disk_cache: If given, raw response bodies for the commands it
+                covers are shared with other processes through this.  Only
+                honoured by the synchronous clients.
+            retry: If given, failed requests are retried according to this
+                policy
+            breaker: If given, requests fail fast with
+                :py:exc:`~sungazer.breaker.CircuitOpenError` while this breaker
+                is open
+            rate_limiter: If given, every request sent to the device waits
+                for a token from this, and ``DeviceList`` responses feed the
+                unit's reported load back into it
+
         """
         self.client = client
         self.serial = serial
+        self.single_flight = single_flight
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.retry = retry
+        self.breaker = breaker
+        self.rate_limiter = rate_limiter
 
     def _handle_response(self, response: httpx.Response, model_class: type[T]) -> T:
         """
@@ -55,25 +104,127 @@ class BaseClient:
         if not response.content:
             return model_class()
 
-        _content = response.text
-        content = []
-        # for some reason we get the http headers in the response.text sometimes
-        # so we have to remove them
-        for line in _content.splitlines():
-            if not line.startswith(("{", "\t", "}")):
-                continue
-            content.append(line)
-        _content = "\n".join(content)
-        return model_class(**json.loads(_content))  # type: ignore[attr-defined]
+        return self._parse(response.content, model_class)
 
-    def _get(
+    def _parse(self, content: bytes, model_class: type[T]) -> T:
+        """
+        Parse a raw response body into ``model_class``.
+
+        The body is validated straight from JSON bytes with
+        :py:meth:`pydantic.BaseModel.model_validate_json`, so it is never
+        decoded into intermediate Python ``dict`` objects first.
+        :py:class:`~sungazer.models.DeviceDetailResponse` is the exception: it
+        needs its custom :py:meth:`~sungazer.models.DeviceDetailResponse.new`
+        constructor to pick the right model for each device.
+
+        Args:
+            content: The response body
+            model_class: The Pydantic model class to deserialize the response to
+
+        Returns:
+            The deserialized response
+
+        """
+        if not content:
+            return model_class()
+        # for some reason we get the http headers in the response body
+        # sometimes, so we have to remove them
+        content = sanitize(content)
+        if issubclass(model_class, DeviceDetailResponse):
+            return cast("T", model_class.new(jsonlib.loads(content)))
+        return model_class.model_validate_json(content)
+
+    @staticmethod
+    def _parse_lazy(content: bytes, tolerant: bool = False) -> LazyDeviceDetailResponse:
+        """
+        Wrap a raw ``Command=DeviceList`` body in lazy device views.
+
+        Args:
+            content: The response body
+
+        Keyword Args:
+            tolerant: Set aside devices of unknown type instead of raising
+
+        Returns:
+            The response, with each device validated field by field as it is
+            read
+
+        """
+        if not content:
+            return LazyDeviceDetailResponse(devices=[], result="unknown")
+        return LazyDeviceDetailResponse.new(
+            jsonlib.loads(sanitize(content)), tolerant=tolerant
+        )
+
+    @staticmethod
+    def _parse_tolerant(content: bytes) -> DeviceDetailResponse:
+        """
+        Parse a raw ``Command=DeviceList`` body, setting aside bad devices.
+
+        Args:
+            content: The response body
+
+        Returns:
+            The response, with every valid device, and the records that could
+            not be parsed in
+            :py:attr:`~sungazer.models.DeviceDetailResponse.unknown_devices` and
+            :py:attr:`~sungazer.models.DeviceDetailResponse.invalid_devices`
+
+        """
+        obj = jsonlib.loads(sanitize(content)) if content else {}
+        return DeviceDetailResponse.new(obj, tolerant=True)
+
+    def _request_key(
+        self, path: str, model_class: type | None, params: dict[str, Any] | None
+    ) -> tuple:
+        """
+        Build a hashable key identifying a request and how it is parsed.
+
+        Like the :py:class:`~sungazer.cache.DiskCache` key, this includes the
+        base URL and the PVS6 serial number, so that clients of different
+        sites can share a cache.
+
+        Args:
+            path: The path to append to the base URL
+            model_class: The Pydantic model class the response is parsed into
+            params: Optional query parameters
+
+        Returns:
+            A key that is equal for identical requests to the same device
+
+        """
+        return (
+            str(self.client.base_url),
+            self.serial,
+            path,
+            tuple(sorted((params or {}).items())),
+            model_class,
+        )
+
+    def _observe_load(
+        self, response: DeviceDetailResponse | LazyDeviceDetailResponse
+    ) -> None:
+        """
+        Feed the PVS's self-reported load in ``response`` to the rate limiter.
+
+        Args:
+            response: A ``Command=DeviceList`` response
+
+        """
+        if self.rate_limiter is None:
+            return
+        pvs = response.pvs
+        if pvs is not None:
+            self.rate_limiter.observe(pvs)
+
+    def _request(
         self,
         path: str,
         model_class: type[T] | None = None,
         params: dict[str, Any] | None = None,
     ) -> T | dict:
         """
-        Send a GET request to the API.
+        Send a GET request to the API and parse the response.
 
         Args:
             path: The path to append to the base URL
@@ -84,11 +235,117 @@ class BaseClient:
             The deserialized response
 
         """
-        response = self.client.get(path, params=params)
+        command = (params or {}).get("Command")
+        if (
+            model_class is not None
+            and self.disk_cache is not None
+            and command in self.disk_cache.commands
+        ):
+            content = self.disk_cache.get_or_fetch(
+                str(self.client.base_url),
+                self.serial,
+                command,
+                lambda: self._fetch_content(path, params),
+            )
+            return self._parse(content, model_class)
+        response = self._send(path, params)
         if model_class is None:
-            return cast("dict", json.loads(response.text))
+            return cast("dict", jsonlib.loads(response.text))
         return self._handle_response(response, model_class)
 
+    def _fetch_content(self, path: str, params: dict[str, Any] | None) -> bytes:
+        """
+        Send a GET request to the API and return the raw response body.
+
+        Args:
+            path: The path to append to the base URL
+            params: Optional query parameters
+
+        Raises:
+            httpx.HTTPStatusError: If the response contains an error status code
+
+        Returns:
+            The response body
+
+        """
+        response = self._send(path, params)
+        response.raise_for_status()
+        return response.content
+
+    def _send(self, path: str, params: dict[str, Any] | None) -> httpx.Response:
+        """
+        Send a GET request to the API, retrying it if :py:attr:`retry` says so.
+
+        If :py:attr:`breaker` is set, the whole exchange, retries included,
+        counts as one call through it.  If :py:attr:`rate_limiter` is set,
+        each attempt waits for a token first.
+
+        Args:
+            path: The path to append to the base URL
+            params: Optional query parameters
+
+        Raises:
+            CircuitOpenError: If :py:attr:`breaker` is open
+
+        Returns:
+            The last response received
+
+        """
+
+        def get() -> httpx.Response:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            return self.client.get(path, params=params)
+
+        def send() -> httpx.Response:
+            if self.retry is None:
+                return get()
+            return self.retry.call(get, command=(params or {}).get("Command"))
+
+        if self.breaker is None:
+            return send()
+        return self.breaker.call(send)
+
+    def _get(
+        self,
+        path: str,
+        model_class: type[T] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T | dict:
+        """
+        Send a GET request to the API.
+
+        If :py:attr:`cache` is set, typed responses are served from it while
+        fresh.  If :py:attr:`single_flight` is set, concurrent calls with the
+        same ``path``, ``params`` and ``model_class`` share a single request
+        and receive the same parsed object.
+
+        Args:
+            path: The path to append to the base URL
+            model_class: The Pydantic model class to deserialize the response to
+            params: Optional query parameters
+
+        Returns:
+            The deserialized response
+
+        """
+        key = self._request_key(path, model_class, params)
+        cache = self.cache if model_class is not None else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        def fetch() -> T | dict:
+            result = self._request(path, model_class, params)
+            if cache is not None:
+                cache.set(key, result, command=(params or {}).get("Command"))
+            return result
+
+        if self.single_flight is None:
+            return fetch()
+        return cast("SingleFlight", self.single_flight).do(key, fetch)
+
 
 class SessionClient(BaseClient):
     """Client for session operations."""
@@ -113,9 +370,12 @@ class SessionClient(BaseClient):
         """
         Stop the current session.
 
+        Any cached responses are dropped, since they belong to the session
+        that just ended.
+
         """
         try:
-            return cast(
+            response = cast(
                 "StopResponse",
                 self._get("/dl_cgi", StopResponse, params={"Command": "Stop"}),
             )
@@ -124,6 +384,9 @@ class SessionClient(BaseClient):
                 msg = f"Stop failed: {e.response.json()}"
                 raise ValueError(msg) from e
             raise
+        if self.cache is not None:
+            self.cache.invalidate()
+        return response
 
 
 class NetworkClient(BaseClient):
@@ -159,16 +422,138 @@ class NetworkClient(BaseClient):
 class DeviceClient(BaseClient):
     """Client for device operations."""
 
-    def list(self) -> DeviceDetailResponse:
+    def list(
+        self, stream: bool = False, lazy: bool = False, tolerant: bool = False
+    ) -> DeviceDetailResponse | LazyDeviceDetailResponse:
         """
         Get the discovery progress.
 
+        If a rate limiter is configured, the load reported by the PVS is fed
+        back into it.
+
+        Keyword Args:
+            stream: If ``True``, parse the body incrementally as it arrives
+                instead of reading it whole first, as :py:meth:`iter` does.
+                This keeps peak memory down on sites with many devices.
+                The response cache, the disk cache, single-flight
+                coalescing, retries and the circuit breaker do not apply to
+                streamed requests; the rate limiter does.
+            lazy: If ``True``, return a
+                :py:class:`~sungazer.models.LazyDeviceDetailResponse` whose
+                devices validate each field only when it is first read, which
+                is much cheaper when only a few fields of each device are
+                used.  The response cache, the disk cache and single-flight
+                coalescing do not apply to lazy requests; retries, the
+                circuit breaker and the rate limiter do.
+            tolerant: If ``True``, a device record that is of an unknown
+                type or fails validation does not fail the whole response:
+                every valid device is returned, and the bad records are listed
+                in ``unknown_devices`` and ``invalid_devices``.  Lazy views
+                only check device types up front.  The response cache, the
+                disk cache and single-flight coalescing do not apply to
+                tolerant requests; retries, the circuit breaker and the rate
+                limiter do.
+
+        Raises:
+            ValueError: If both ``stream`` and ``lazy`` are ``True``
+
         Returns:
             The discovery progress
 
         """
-        response: dict = self._get("/dl_cgi", params={"Command": "DeviceList"})
-        return DeviceDetailResponse.new(response)
+        if stream and lazy:
+            msg = "stream and lazy can't be combined"
+            raise ValueError(msg)
+        if stream and tolerant:
+            parser = DeviceListParser()
+            records = list(self._stream_records(parser))
+            response = DeviceDetailResponse.new(
+                {"devices": records, "result": parser.close().get("result", "unknown")},
+                tolerant=True,
+            )
+        elif stream:
+            parser = DeviceListParser()
+            devices = list(self._stream(parser))
+            response = DeviceDetailResponse(
+                devices=devices, result=parser.close().get("result", "unknown")
+            )
+        elif lazy:
+            response = self._parse_lazy(
+                self._fetch_content("/dl_cgi", {"Command": "DeviceList"}),
+                tolerant=tolerant,
+            )
+        elif tolerant:
+            response = self._parse_tolerant(
+                self._fetch_content("/dl_cgi", {"Command": "DeviceList"})
+            )
+        else:
+            response = cast(
+                "DeviceDetailResponse",
+                self._get(
+                    "/dl_cgi", DeviceDetailResponse, params={"Command": "DeviceList"}
+                ),
+            )
+        self._observe_load(response)
+        return response
+
+    def iter(self) -> Iterator[DeviceClass]:
+        """
+        Yield each device as soon as its record has arrived.
+
+        The body is read from the device in chunks and each entry of its
+        ``devices`` array is turned into a model as soon as it is complete,
+        so processing can start before the whole response has arrived.  The
+        response cache, single-flight coalescing, retries and the circuit
+        breaker do not apply to streamed requests; the rate limiter does.
+
+        Raises:
+            httpx.HTTPStatusError: If the response contains an error status code
+            ValueError: If the body is truncated or holds an unknown device
+                type
+
+        Yields:
+            One device model per record, in the order the device sent them
+
+        """
+        parser = DeviceListParser()
+        yield from self._stream(parser)
+        parser.close()
+
+    def _stream(self, parser: DeviceListParser) -> Iterator[DeviceClass]:
+        """
+        Stream ``Command=DeviceList`` through ``parser``, yielding each device.
+
+        Args:
+            parser: The parser to feed the body to
+
+        Yields:
+            One device model per record
+
+        """
+        for record in self._stream_records(parser):
+            device = DeviceDetailResponse.parse_device(record)
+            if device is not None:
+                yield device
+
+    def _stream_records(self, parser: DeviceListParser) -> Iterator[dict]:
+        """
+        Stream ``Command=DeviceList`` through ``parser``, yielding each record.
+
+        Args:
+            parser: The parser to feed the body to
+
+        Yields:
+            One decoded record per entry of the ``devices`` array
+
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with self.client.stream(
+            "GET", "/dl_cgi", params={"Command": "DeviceList"}
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                yield from parser.feed(chunk)
 
 
 class FirmwareClient(BaseClient):
@@ -262,6 +647,13 @@ class SungazerClient:
         timeout: int = 30,
         serial: str | None = None,
         client: httpx.Client | None = None,
+        *,
+        single_flight: bool = False,
+        cache: ResponseCache | None = None,
+        disk_cache: DiskCache | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
     ):
         """
         Initialize the Sungazer client.
@@ -271,6 +663,19 @@ class SungazerClient:
             timeout: Request timeout in seconds
             serial: The serial number of the PVS6 device
             client: An optional httpx client to use for requests
+            single_flight: If ``True``, identical requests made concurrently
+                from several threads share one round trip and one parsed model
+            cache: An optional cache for parsed responses, e.g. a
+                :py:class:`~sungazer.cache.TTLCache`
+            disk_cache: An optional on-disk cache of raw responses shared
+                between processes
+            retry: An optional :py:class:`~sungazer.retry.RetryPolicy`; by
+                default each request is attempted once
+            breaker: An optional :py:class:`~sungazer.breaker.CircuitBreaker`
+                that makes requests fail fast while the device is unreachable
+            rate_limiter: An optional
+                :py:class:`~sungazer.ratelimit.AdaptiveRateLimiter` that paces
+                requests to the load the device reports
 
         """
         self.base_url = base_url
@@ -280,13 +685,28 @@ class SungazerClient:
             timeout=timeout,
             verify=False,  # noqa: S501
         )
+        self.single_flight = SingleFlight() if single_flight else None
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.retry = retry
+        self.breaker = breaker
+        self.rate_limiter = rate_limiter
 
         # Initialize specialized clients
-        self.session = SessionClient(self.client, serial=serial)
-        self.network = NetworkClient(self.client, serial=serial)
-        self.devices = DeviceClient(self.client, serial=serial)
-        self.firmware = FirmwareClient(self.client, serial=serial)
-        self.grid_profiles = GridProfileClient(self.client, serial=serial)
+        kwargs: dict[str, Any] = {
+            "serial": serial,
+            "single_flight": self.single_flight,
+            "cache": cache,
+            "disk_cache": disk_cache,
+            "retry": retry,
+            "breaker": breaker,
+            "rate_limiter": rate_limiter,
+        }
+        self.session = SessionClient(self.client, **kwargs)
+        self.network = NetworkClient(self.client, **kwargs)
+        self.devices = DeviceClient(self.client, **kwargs)
+        self.firmware = FirmwareClient(self.client, **kwargs)
+        self.grid_profiles = GridProfileClient(self.client, **kwargs)
 
     def __enter__(self):
         """Enter the context manager."""
@@ -299,3 +719,491 @@ class SungazerClient:
     def close(self):
         """Close the client."""
         self.client.close()
+
+
+class AsyncBaseClient(BaseClient):
+    """
+    Base client with common HTTP methods for use with :py:class:`httpx.AsyncClient`.
+
+    Response parsing is shared with :py:class:`BaseClient`; only the transport
+    differs.
+    """
+
+    client: httpx.AsyncClient
+    single_flight: AsyncSingleFlight | None
+
+    async def _request(  # type: ignore[override]
+        self,
+        path: str,
+        model_class: type[T] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T | dict:
+        """
+        Send a GET request to the API and parse the response.
+
+        Args:
+            path: The path to append to the base URL
+            model_class: The Pydantic model class to deserialize the response to
+            params: Optional query parameters
+
+        Returns:
+            The deserialized response
+
+        """
+        response = await self._send(path, params)
+        if model_class is None:
+            return cast("dict", jsonlib.loads(response.text))
+        return self._handle_response(response, model_class)
+
+    async def _send(  # type: ignore[override]
+        self, path: str, params: dict[str, Any] | None
+    ) -> httpx.Response:
+        """
+        Send a GET request to the API, retrying it if :py:attr:`retry` says so.
+
+        If :py:attr:`breaker` is set, the whole exchange, retries included,
+        counts as one call through it.  If :py:attr:`rate_limiter` is set,
+        each attempt waits for a token first.
+
+        Args:
+            path: The path to append to the base URL
+            params: Optional query parameters
+
+        Raises:
+            CircuitOpenError: If :py:attr:`breaker` is open
+
+        Returns:
+            The last response received
+
+        """
+
+        async def get() -> httpx.Response:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire()
+            return await self.client.get(path, params=params)
+
+        async def send() -> httpx.Response:
+            if self.retry is None:
+                return await get()
+            return await self.retry.acall(get, command=(params or {}).get("Command"))
+
+        if self.breaker is None:
+            return await send()
+        return await self.breaker.acall(send)
+
+    async def _get(  # type: ignore[override]
+        self,
+        path: str,
+        model_class: type[T] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T | dict:
+        """
+        Send a GET request to the API.
+
+        If :py:attr:`cache` is set, typed responses are served from it while
+        fresh.  If :py:attr:`single_flight` is set, concurrent calls with the
+        same ``path``, ``params`` and ``model_class`` share a single request
+        and receive the same parsed object.
+
+        Args:
+            path: The path to append to the base URL
+            model_class: The Pydantic model class to deserialize the response to
+            params: Optional query parameters
+
+        Returns:
+            The deserialized response
+
+        """
+        key = self._request_key(path, model_class, params)
+        cache = self.cache if model_class is not None else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def fetch() -> T | dict:
+            result = await self._request(path, model_class, params)
+            if cache is not None:
+                cache.set(key, result, command=(params or {}).get("Command"))
+            return result
+
+        if self.single_flight is None:
+            return await fetch()
+        return await cast("AsyncSingleFlight", self.single_flight).do(key, fetch)
+
+
+class AsyncSessionClient(AsyncBaseClient):
+    """Asynchronous client for session operations."""
+
+    async def start(self) -> StartResponse:
+        """
+        Start a new session.
+
+        """
+        try:
+            return cast(
+                "StartResponse",
+                await self._get("/dl_cgi", StartResponse, params={"Command": "Start"}),
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 500:
+                msg = f"Start failed: {e.response!s}"
+                raise ValueError(msg) from e
+            raise
+
+    async def stop(self) -> StopResponse:
+        """
+        Stop the current session.
+
+        Any cached responses are dropped, since they belong to the session
+        that just ended.
+
+        """
+        try:
+            response = cast(
+                "StopResponse",
+                await self._get("/dl_cgi", StopResponse, params={"Command": "Stop"}),
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 500:
+                msg = f"Stop failed: {e.response.json()}"
+                raise ValueError(msg) from e
+            raise
+        if self.cache is not None:
+            self.cache.invalidate()
+        return response
+
+
+class AsyncNetworkClient(AsyncBaseClient):
+    """Asynchronous client for network operations."""
+
+    async def list(self) -> GetCommResponse:
+        """
+        Get the list of network interfaces.
+
+        Returns:
+            The list of network interfaces
+
+        Raises:
+            ValueError: If the operation fails
+
+        """
+        try:
+            return cast(
+                "GetCommResponse",
+                await self._get(
+                    "/dl_cgi",
+                    GetCommResponse,
+                    params={"Command": "Get_Comm", "SerialNumber": self.serial},
+                ),
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 500:
+                msg = f"Failed to list interfaces: {e.response.json()}"
+                raise ValueError(msg) from e
+            raise
+
+
+class AsyncDeviceClient(AsyncBaseClient):
+    """Asynchronous client for device operations."""
+
+    async def list(
+        self, stream: bool = False, lazy: bool = False, tolerant: bool = False
+    ) -> DeviceDetailResponse | LazyDeviceDetailResponse:
+        """
+        Get the discovery progress.
+
+        If a rate limiter is configured, the load reported by the PVS is fed
+        back into it.
+
+        Keyword Args:
+            stream: If ``True``, parse the body incrementally as it arrives
+                instead of reading it whole first, as :py:meth:`iter` does.
+                This keeps peak memory down on sites with many devices.
+                The response cache, the disk cache, single-flight
+                coalescing, retries and the circuit breaker do not apply to
+                streamed requests; the rate limiter does.
+            lazy: If ``True``, return a
+                :py:class:`~sungazer.models.LazyDeviceDetailResponse` whose
+                devices validate each field only when it is first read, which
+                is much cheaper when only a few fields of each device are
+                used.  The response cache, the disk cache and single-flight
+                coalescing do not apply to lazy requests; retries, the
+                circuit breaker and the rate limiter do.
+            tolerant: If ``True``, a device record that is of an unknown
+                type or fails validation does not fail the whole response:
+                every valid device is returned, and the bad records are listed
+                in ``unknown_devices`` and ``invalid_devices``.  Lazy views
+                only check device types up front.  The response cache, the
+                disk cache and single-flight coalescing do not apply to
+                tolerant requests; retries, the circuit breaker and the rate
+                limiter do.
+
+        Raises:
+            ValueError: If both ``stream`` and ``lazy`` are ``True``
+
+        Returns:
+            The discovery progress
+
+        """
+        if stream and lazy:
+            msg = "stream and lazy can't be combined"
+            raise ValueError(msg)
+        if stream and tolerant:
+            parser = DeviceListParser()
+            records = [record async for record in self._stream_records(parser)]
+            response = DeviceDetailResponse.new(
+                {"devices": records, "result": parser.close().get("result", "unknown")},
+                tolerant=True,
+            )
+        elif stream:
+            parser = DeviceListParser()
+            devices = [device async for device in self._stream(parser)]
+            response = DeviceDetailResponse(
+                devices=devices, result=parser.close().get("result", "unknown")
+            )
+        elif lazy or tolerant:
+            raw = await self._send("/dl_cgi", {"Command": "DeviceList"})
+            raw.raise_for_status()
+            if lazy:
+                response = self._parse_lazy(raw.content, tolerant=tolerant)
+            else:
+                response = self._parse_tolerant(raw.content)
+        else:
+            response = cast(
+                "DeviceDetailResponse",
+                await self._get(
+                    "/dl_cgi", DeviceDetailResponse, params={"Command": "DeviceList"}
+                ),
+            )
+        self._observe_load(response)
+        return response
+
+    async def iter(self) -> AsyncIterator[DeviceClass]:
+        """
+        Yield each device as soon as its record has arrived.
+
+        This is the asyncio counterpart of :py:meth:`DeviceClient.iter`.
+
+        Raises:
+            httpx.HTTPStatusError: If the response contains an error status code
+            ValueError: If the body is truncated or holds an unknown device
+                type
+
+        Yields:
+            One device model per record, in the order the device sent them
+
+        """
+        parser = DeviceListParser()
+        async for device in self._stream(parser):
+            yield device
+        parser.close()
+
+    async def _stream(  # type: ignore[override]
+        self, parser: DeviceListParser
+    ) -> AsyncIterator[DeviceClass]:
+        """
+        Stream ``Command=DeviceList`` through ``parser``, yielding each device.
+
+        Args:
+            parser: The parser to feed the body to
+
+        Yields:
+            One device model per record
+
+        """
+        async for record in self._stream_records(parser):
+            device = DeviceDetailResponse.parse_device(record)
+            if device is not None:
+                yield device
+
+    async def _stream_records(  # type: ignore[override]
+        self, parser: DeviceListParser
+    ) -> AsyncIterator[dict]:
+        """
+        Stream ``Command=DeviceList`` through ``parser``, yielding each record.
+
+        Args:
+            parser: The parser to feed the body to
+
+        Yields:
+            One decoded record per entry of the ``devices`` array
+
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire()
+        async with self.client.stream(
+            "GET", "/dl_cgi", params={"Command": "DeviceList"}
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                for record in parser.feed(chunk):
+                    yield record
+
+
+class AsyncFirmwareClient(AsyncBaseClient):
+    """Asynchronous client for firmware operations."""
+
+    async def check(self) -> CheckFWResponse:
+        """
+        See if we need new firmware.
+
+        Returns:
+            The firmware information
+
+        Raises:
+            ValueError: If the operation fails
+
+        """
+        try:
+            return cast(
+                "CheckFWResponse",
+                await self._get(
+                    "/dl_cgi", CheckFWResponse, params={"Command": "CheckFW"}
+                ),
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 500:
+                msg = f"Failed to get firmware info: {e.response.json()}"
+                raise ValueError(msg) from e
+            raise
+
+
+class AsyncGridProfileClient(AsyncBaseClient):
+    """Asynchronous client for grid profile operations."""
+
+    async def get(self) -> GridProfileGetResponse:
+        """
+        Get the list of grid profiles.
+
+        Returns:
+            The current grid profile
+
+        Raises:
+            ValueError: If the operation fails
+
+        """
+        try:
+            return cast(
+                "GridProfileGetResponse",
+                await self._get(
+                    "/dl_cgi",
+                    GridProfileGetResponse,
+                    params={"Command": "GridProfileGet"},
+                ),
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 500:
+                msg = f"Failed to get grid profiles: {e.response.json()}"
+                raise ValueError(msg) from e
+            raise
+
+    async def refresh(self) -> GridProfileRefreshResponse:
+        """
+        Refresh the list of grid profiles.
+
+        Returns:
+            The grid profile refresh response
+
+        Raises:
+            ValueError: If the operation fails
+
+        """
+        try:
+            return cast(
+                "GridProfileRefreshResponse",
+                await self._get(
+                    "/dl_cgi",
+                    GridProfileRefreshResponse,
+                    params={"Command": "GridProfileRefreshResponse"},
+                ),
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 500:
+                msg = f"Failed to get grid profile status: {e.response.json()}"
+                raise ValueError(msg) from e
+            raise
+
+
+class AsyncSungazerClient:
+    """
+    Asynchronous client for interacting with the Sungazer PVS6 API.
+
+    This has the same sub-client surface as :py:class:`SungazerClient`, but
+    every operation is a coroutine, so a single event loop can talk to many
+    PVS6 units at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://sunpowerconsole.com/cgi-bin",
+        timeout: int = 30,
+        serial: str | None = None,
+        client: httpx.AsyncClient | None = None,
+        *,
+        single_flight: bool = False,
+        cache: ResponseCache | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
+        """
+        Initialize the asynchronous Sungazer client.
+
+        Keyword Args:
+            base_url: The base URL for the API
+            timeout: Request timeout in seconds
+            serial: The serial number of the PVS6 device
+            client: An optional httpx async client to use for requests
+            single_flight: If ``True``, identical requests awaited concurrently
+                share one round trip and one parsed model
+            cache: An optional cache for parsed responses, e.g. a
+                :py:class:`~sungazer.cache.TTLCache`
+            retry: An optional :py:class:`~sungazer.retry.RetryPolicy`; by
+                default each request is attempted once
+            breaker: An optional :py:class:`~sungazer.breaker.CircuitBreaker`
+                that makes requests fail fast while the device is unreachable
+            rate_limiter: An optional
+                :py:class:`~sungazer.ratelimit.AdaptiveRateLimiter` that paces
+                requests to the load the device reports
+
+        """
+        self.base_url = base_url
+        self.serial = serial
+        self.client = client or httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            verify=False,  # noqa: S501
+        )
+        self.single_flight = AsyncSingleFlight() if single_flight else None
+        self.cache = cache
+        self.retry = retry
+        self.breaker = breaker
+        self.rate_limiter = rate_limiter
+
+        # Initialize specialized clients
+        kwargs: dict[str, Any] = {
+            "serial": serial,
+            "single_flight": self.single_flight,
+            "cache": cache,
+            "retry": retry,
+            "breaker": breaker,
+            "rate_limiter": rate_limiter,
+        }
+        self.session = AsyncSessionClient(self.client, **kwargs)
+        self.network = AsyncNetworkClient(self.client, **kwargs)
+        self.devices = AsyncDeviceClient(self.client, **kwargs)
+        self.firmware = AsyncFirmwareClient(self.client, **kwargs)
+        self.grid_profiles = AsyncGridProfileClient(self.client, **kwargs)
+
+    async def __aenter__(self):
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Exit the async context manager and close the client."""
+        await self.close()
+
+    async def close(self):
+        """Close the client."""
+        await self.client.aclose()
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from .models import DeviceDetailResponse
+
+#: A snapshot of a site's devices: a
+#: :py:class:`~sungazer.models.DeviceDetailResponse`, a decoded
+#: ``Command=DeviceList`` body, or the device records themselves
+Snapshot = DeviceDetailResponse | Mapping[str, Any] | Iterable[Mapping[str, Any]]
+
+#: Stands in for a field a record doesn't have
+_MISSING = object()
+
+
+class DeviceDelta(BaseModel):
+    """
+    The fields of one device that changed between two snapshots.
+    """
+
+    #: The serial number of the device
+    SERIAL: str = Field(..., examples=["E00122142080335"])
+    #: The new value of each field that was added or changed
+    changed: dict[str, Any] = Field(
+        default_factory=dict, examples=[{"p_3phsum_kw": "0.2315"}]
+    )
+    #: The fields the device no longer reports
+    removed: list[str] = Field(default_factory=list, examples=[["t_htsnk_degc"]])
+
+
+class SnapshotDiff(BaseModel):
+    """
+    What changed in a site's devices between two snapshots, keyed on
+    ``SERIAL``.
+
+    Devices that did not change at all are left out, and for the others only
+    the fields that changed are included, so this is usually a small fraction
+    of the size of a full snapshot.  :py:func:`apply_diff` turns the previous
+    snapshot and this diff back into the current snapshot.
+    """
+
+    #: The full record of each device that appeared
+    added: list[dict[str, Any]] = Field(default_factory=list)
+    #: The serial number of each device that disappeared
+    removed: list[str] = Field(default_factory=list, examples=[["E00122142080335"]])
+    #: The changed fields of each device present in both snapshots
+    changed: list[DeviceDelta] = Field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Return ``True`` if nothing changed."""
+        return not (self.added or self.removed or self.changed)
+
+
+def device_records(snapshot: Snapshot) -> dict[str, Mapping[str, Any]]:
+    """
+    Return the device records of a snapshot, keyed on ``SERIAL``.
+
+    Records without a ``SERIAL`` can't be matched between snapshots and are
+    left out.  If several records share a serial number, the last one wins.
+
+    Args:
+        snapshot: A :py:class:`~sungazer.models.DeviceDetailResponse`, whose
+            devices are dumped with ``model_dump()``; a decoded
+            ``Command=DeviceList`` body; or an iterable of device records
+
+    Returns:
+        The records, by serial number
+
+    """
+    if isinstance(snapshot, DeviceDetailResponse):
+        records: Iterable[Mapping[str, Any]] = [
+            device.model_dump() for device in snapshot.devices or []
+        ]
+    elif isinstance(snapshot, Mapping):
+        records = snapshot.get("devices") or []
+    else:
+        records = snapshot
+    return {
+        record["SERIAL"]: record
+        for record in records
+        if isinstance(record, Mapping) and record.get("SERIAL") is not None
+    }
+
+
+def _delta(
+    serial: str,
+    previous: Mapping[str, Any],
+    current: Mapping[str, Any],
+    ignore: frozenset[str],
+) -> DeviceDelta | None:
+    """
+    Compare two records of the same device.
+
+    Args:
+        serial: The serial number of the device
+        previous: The earlier record
+        current: The later record
+        ignore: Fields to leave out of the comparison
+
+    Returns:
+        The changes, or ``None`` if no field outside ``ignore`` changed
+
+    """
+    changed = {
+        key: value
+        for key, value in current.items()
+        if key not in ignore and previous.get(key, _MISSING) != value
+    }
+    removed = (
+        [key for key in previous if key not in current and key not in ignore]
+        if previous.keys() != current.keys()
+        else []
+    )
+    if not (changed or removed):
+        return None
+    return DeviceDelta(SERIAL=serial, changed=changed, removed=removed)
+
+
+def _diff_records(
+    before: Mapping[str, Mapping[str, Any]],
+    after: Mapping[str, Mapping[str, Any]],
+    ignore: frozenset[str],
+) -> SnapshotDiff:
+    """
+    Diff two snapshots' records, keyed on serial number.
+
+    Args:
+        before: The earlier records
+        after: The later records
+        ignore: Fields that never count as changed
+
+    Returns:
+        The differences
+
+    """
+    added = []
+    changed = []
+    for serial, record in after.items():
+        old = before.get(serial)
+        if old is None:
+            added.append(dict(record))
+        elif old != record:
+            delta = _delta(serial, old, record, ignore)
+            if delta is not None:
+                changed.append(delta)
+    removed = [serial for serial in before if serial not in after]
+    return SnapshotDiff(added=added, removed=removed, changed=changed)
+
+
+def diff_snapshots(
+    previous: Snapshot, current: Snapshot, *, ignore: Iterable[str] = ()
+) -> SnapshotDiff:
+    """
+    Work out what changed in a site's devices between two snapshots.
+
+    Raw records (decoded ``Command=DeviceList`` bodies) are the cheapest to
+    compare: a device whose record is unchanged costs a single ``dict``
+    comparison, and the field-by-field comparison only runs on devices that
+    did change.
+
+    Args:
+        previous: The earlier snapshot; see :py:func:`device_records`
+        current: The later snapshot
+
+    Keyword Args:
+        ignore: Fields that never count as changed, such as ``CURTIME``
+
+    Returns:
+        The differences
+
+    """
+    return _diff_records(
+        device_records(previous), device_records(current), frozenset(ignore)
+    )
+
+
+def apply_diff(
+    records: Mapping[str, Mapping[str, Any]], diff: SnapshotDiff
+) -> dict[str, dict[str, Any]]:
+    """
+    Bring a snapshot up to date with a diff.
+
+    Args:
+        records: The earlier snapshot's records, by serial number, as returned
+            by :py:func:`device_records`
+        diff: The differences between that snapshot and a later one
+
+    Returns:
+        The later snapshot's records, by serial number; fields listed in the
+        ``ignore`` argument of :py:func:`diff_snapshots` keep their earlier
+        values
+
+    """
+    result = {serial: dict(record) for serial, record in records.items()}
+    for serial in diff.removed:
+        result.pop(serial, None)
+    for delta in diff.changed:
+        record = result.setdefault(delta.SERIAL, {"SERIAL": delta.SERIAL})
+        for key in delta.removed:
+            record.pop(key, None)
+        record.update(delta.changed)
+    for record in diff.added:
+        result[record["SERIAL"]] = dict(record)
+    return result
+
+
+class SnapshotDiffer:
+    """
+    Turn a stream of snapshots of one site into a stream of diffs.
+
+    Each call to :py:meth:`update` diffs the new snapshot against the one
+    before it.  The first one is diffed against an empty site, so every device
+    shows up in :py:attr:`SnapshotDiff.added`.
+
+    Example:
+        .. code-block:: python
+
+            differ = SnapshotDiffer(ignore=["CURTIME"])
+            while True:
+                diff = differ.update(jsonlib.loads(fetch_device_list()))
+                if not diff.is_empty:
+                    publish(diff.model_dump_json())
+
+    Keyword Args:
+        ignore: Fields that never count as changed
+
+    """
+
+    def __init__(self, *, ignore: Iterable[str] = ()):
+        #: Fields that never count as changed
+        self.ignore = frozenset(ignore)
+        #: The records of the last snapshot, by serial number
+        self.records: dict[str, Mapping[str, Any]] = {}
+
+    def update(self, snapshot: Snapshot) -> SnapshotDiff:
+        """
+        Diff a new snapshot against the last one, and remember it.
+
+        Args:
+            snapshot: The new snapshot; see :py:func:`device_records`
+
+        Returns:
+            What changed since the last snapshot
+
+        """
+        current = device_records(snapshot)
+        diff = _diff_records(self.records, current, self.ignore)
+        self.records = current
+        return diff
+
+    def reset(self) -> None:
+        """Forget the last snapshot, so the next one is reported in full."""
+        self.records = {}
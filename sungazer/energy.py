@@ -0,0 +1,494 @@
+from __future__ import annotations
+
+import enum
+import math
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; see the "numpy" extra
+    np = None  # type: ignore[assignment]
+
+from .models.timestamps import epoch_seconds
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from datetime import datetime
+
+    from .models import PVSDeviceDetail
+    from .store import DeviceStore
+
+#: The power field integrated when a counter can't be trusted
+POWER_FIELD = "p_3phsum_kw"
+
+#: Restart times closer together than this, in seconds, are the same restart
+RESTART_TOLERANCE = 120
+
+
+class EnergySource(enum.IntEnum):
+    """Where the energy of an interval in an :py:class:`EnergyAccount` came from."""
+
+    #: The increase of the counter
+    COUNTER = 0
+    #: The increase of the counter, which wrapped around to zero past a power
+    #: of ten
+    ROLLOVER = 1
+    #: The counter went backwards, so power was integrated instead
+    RESET = 2
+    #: The counter rose more than the device could have produced, so power
+    #: was integrated instead
+    JUMP = 3
+    #: A counter reading was missing, so power was integrated instead
+    GAP = 4
+    #: Neither the counter nor power could be used; the energy is 0
+    MISSING = 5
+
+
+def _require_numpy() -> None:
+    """
+    Make sure numpy is installed.
+
+    Raises:
+        ImportError: If it isn't
+
+    """
+    if np is None:
+        msg = "EnergyAccount needs numpy; install it with: pip install sungazer[numpy]"
+        raise ImportError(msg)
+
+
+def _floats(values: Iterable[Any]) -> np.ndarray:
+    """Build a float64 array, with NaN for ``None``."""
+    return np.array(
+        [math.nan if value is None else value for value in values], dtype=np.float64
+    )
+
+
+def _factorize(serials: Any) -> tuple[list[str], np.ndarray]:
+    """
+    Number the distinct serial numbers, in the order they're first seen.
+
+    Samples usually come in runs of one device, as from
+    :py:meth:`~sungazer.store.DeviceStore.series`, so only the first serial
+    number of each run is looked up; this is much faster than
+    :py:func:`numpy.unique` on strings.
+
+    Returns:
+        The serial numbers, and the index of each sample's in them
+
+    """
+    values = np.array(
+        serials.tolist() if isinstance(serials, np.ndarray) else list(serials),
+        dtype=object,
+    )
+    heads = np.ones(values.size, dtype=bool)
+    np.not_equal(values[1:], values[:-1], out=heads[1:])
+    starts = np.flatnonzero(heads)
+    index: dict[str, int] = {}
+    codes = [index.setdefault(serial, len(index)) for serial in values[starts].tolist()]
+    lengths = np.diff(starts, append=values.size)
+    return list(index), np.repeat(np.array(codes, dtype=np.intp), lengths)
+
+
+def restart_times(
+    times: Iterable[datetime | float | None], tolerance: float = RESTART_TOLERANCE
+) -> np.ndarray:
+    """
+    Turn restart times seen on many polls into the distinct restarts.
+
+    Each poll of the PVS gives the time it last restarted (see
+    :py:attr:`~sungazer.models.PVSDeviceDetail.last_restart_time`), which
+    jitters by a few seconds from poll to poll.  Times within ``tolerance``
+    of the one before are taken to be the same restart.
+
+    Args:
+        times: Restart times, as datetimes or seconds since the epoch;
+            ``None`` is skipped
+        tolerance: How far apart, in seconds, two restarts must be
+
+    Raises:
+        ImportError: If numpy is not installed
+
+    Returns:
+        The restart times, in seconds since the epoch, sorted
+
+    """
+    _require_numpy()
+    values = np.sort(
+        np.array([epoch_seconds(t) for t in times if t is not None], dtype=np.float64)
+    )
+    if not values.size:
+        return values
+    keep = np.empty(values.size, dtype=bool)
+    keep[0] = True
+    np.greater(np.diff(values), tolerance, out=keep[1:])
+    return values[keep]
+
+
+def pvs_restarts(samples: Iterable[PVSDeviceDetail]) -> np.ndarray:
+    """
+    Return the distinct restarts seen in polls of the PVS.
+
+    Args:
+        samples: The PVS of each poll, such as
+            :py:attr:`~sungazer.models.DeviceDetailResponse.pvs`
+
+    Raises:
+        ImportError: If numpy is not installed
+
+    Returns:
+        The restart times, in seconds since the epoch, sorted
+
+    """
+    return restart_times(pvs.last_restart_time for pvs in samples)
+
+
+class EnergyAccount:
+    """
+    The energy of many devices, worked out from their cumulative kWh
+    counters, with resets and glitches repaired.
+
+    Each pair of consecutive samples of a device is an interval, whose energy
+    is the increase of the counter.  Where the counter can't be trusted, the
+    interval's ``p_3phsum_kw`` readings are integrated over its length (the
+    trapezoid rule) instead:
+
+    * the counter went backwards: a reset, after a firmware update or a
+      device replacement (:py:attr:`EnergySource.RESET`).  A fall from near
+      a power of ten to near zero is a rollover instead, and the counter
+      increase across it is used (:py:attr:`EnergySource.ROLLOVER`).
+    * the counter rose by more than ``headroom`` times the device's highest
+      power seen, over the interval, plus ``jump_tolerance`` kWh
+      (:py:attr:`EnergySource.JUMP`).
+    * a counter reading is missing (:py:attr:`EnergySource.GAP`).
+
+    Energy is never negative, so the counters must only ever rise:
+    ``ltea_3phsum_kwh`` on inverters, and ``net_ltea_3phsum_kwh`` on
+    production meters or ``pos_ltea_3phsum_kwh`` and
+    ``neg_ltea_3phsum_kwh`` on consumption meters.  Intervals spanning a
+    restart of the PVS are flagged in :py:attr:`restarted`.
+
+    Everything runs as numpy array operations over every device at once, so
+    accounting for a fleet's day or week of samples takes well under a
+    second.
+
+    Needs numpy, which is an optional dependency: ``pip install
+    sungazer[numpy]``.
+
+    Example:
+        .. code-block:: python
+
+            account = EnergyAccount.from_store(store, start=yesterday, end=today)
+            account.totals()  # kWh per inverter
+            starts, energy = account.intervals(900)  # kWh per inverter per 15m
+
+    Args:
+        serials: The serial number of the device of each sample
+        timestamps: The ``DATATIME`` of each sample, in seconds since the epoch
+        counters: The counter reading of each sample, in kWh, with NaN where
+            it is missing
+        powers: The ``p_3phsum_kw`` reading of each sample, in kW, with NaN
+            where it is missing; without it, untrusted intervals get no energy
+
+    Keyword Args:
+        restarts: The times the PVS restarted, in seconds since the epoch; see
+            :py:func:`restart_times`
+        headroom: How many times its highest power a device may seem to
+            produce before a counter increase counts as a jump
+        jump_tolerance: How many kWh an interval's counter increase may go
+            over that before it counts as a jump, to allow for counters that
+            lag behind the power readings
+
+    Raises:
+        ImportError: If numpy is not installed
+        ValueError: If the arrays are not all as long
+
+    """
+
+    def __init__(
+        self,
+        serials: Any,
+        timestamps: Any,
+        counters: Any,
+        powers: Any = None,
+        *,
+        restarts: Any = (),
+        headroom: float = 1.5,
+        jump_tolerance: float = 1.0,
+    ):
+        _require_numpy()
+        names, device = _factorize(serials)
+        t = np.asarray(timestamps, dtype=np.float64)
+        c = np.asarray(counters, dtype=np.float64)
+        p = (
+            np.full(t.shape, np.nan)
+            if powers is None
+            else np.asarray(powers, dtype=np.float64)
+        )
+        if not device.shape == t.shape == c.shape == p.shape:
+            msg = "serials, timestamps, counters and powers must be as long"
+            raise ValueError(msg)
+        #: The serial numbers of the devices, in the order they were first
+        #: seen; :py:attr:`device` indexes into this
+        self.serials: list[str] = names
+        # Samples from a store are already in order, by device and then time
+        step = device[1:] - device[:-1]
+        if not ((step > 0) | ((step == 0) & (t[1:] >= t[:-1]))).all():
+            order = np.lexsort((t, device))
+            device, t, c, p = device[order], t[order], c[order], p[order]
+
+        # Each interval runs from a sample to the next one of the same device
+        same = device[1:] == device[:-1]
+        #: The device of each interval, as an index into :py:attr:`serials`
+        self.device: np.ndarray = device[1:][same]
+        #: When each interval starts, in seconds since the epoch
+        self.start: np.ndarray = t[:-1][same]
+        #: When each interval ends, in seconds since the epoch
+        self.end: np.ndarray = t[1:][same]
+        before, after = c[:-1][same], c[1:][same]
+        p0, p1 = p[:-1][same], p[1:][same]
+        hours = (self.end - self.start) / 3600
+
+        # Trapezoid rule, or the one power reading there is
+        power = np.where(
+            np.isnan(p0), p1, np.where(np.isnan(p1), p0, (p0 + p1) / 2)
+        ).clip(min=0)
+        integrated = power * hours
+
+        # The most energy the device could have produced in each interval
+        highest = np.full(len(self.serials), np.nan)
+        np.fmax.at(highest, device, p)
+        limit = headroom * highest.clip(min=0)[self.device] * hours + jump_tolerance
+        limit[np.isnan(limit)] = np.inf
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            increase = after - before
+            valid = ~(np.isnan(before) | np.isnan(after))
+            falls = valid & (increase < 0)
+            modulus = 10 ** (np.floor(np.log10(np.where(falls, before, 1))) + 1)
+            wrapped = after + modulus - before
+            rollover = (
+                falls
+                & (before >= 0.9 * modulus)
+                & (after < 0.1 * modulus)
+                & (wrapped <= limit)
+            )
+            jump = valid & (increase > limit)
+        reset = falls & ~rollover
+
+        source = np.full(self.end.shape, EnergySource.COUNTER, dtype=np.int8)
+        source[~valid] = EnergySource.GAP
+        source[reset] = EnergySource.RESET
+        source[jump] = EnergySource.JUMP
+        source[rollover] = EnergySource.ROLLOVER
+        untrusted = source >= EnergySource.RESET
+        missing = untrusted & np.isnan(integrated)
+        source[missing] = EnergySource.MISSING
+
+        energy = np.where(rollover, wrapped, increase)
+        energy[untrusted] = integrated[untrusted]
+        energy[missing] = 0.0
+        #: The energy of each interval, in kWh; never negative
+        self.energy: np.ndarray = energy
+        #: Where the energy of each interval came from, as
+        #: :py:class:`EnergySource` values
+        self.source: np.ndarray = source
+
+        restarts = np.sort(np.asarray(restarts, dtype=np.float64))
+        #: Whether the PVS restarted during each interval
+        self.restarted: np.ndarray = np.searchsorted(
+            restarts, self.start, side="right"
+        ) < np.searchsorted(restarts, self.end, side="right")
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        counter: str = "ltea_3phsum_kwh",
+        **kwargs: Any,
+    ) -> EnergyAccount:
+        """
+        Account for samples given as dicts.
+
+        Args:
+            records: Dicts with ``SERIAL``, ``DATATIME`` (a datetime or
+                seconds since the epoch), the counter and, optionally,
+                ``p_3phsum_kw``, such as rows from
+                :py:meth:`~sungazer.store.DeviceStore.metrics` or
+                :py:meth:`~sungazer.binlog.BinlogRecord.to_dict`
+            counter: The name of the counter field
+
+        Keyword Args:
+            **kwargs: The keyword arguments of :py:class:`EnergyAccount`
+
+        Raises:
+            ImportError: If numpy is not installed
+
+        Returns:
+            The account
+
+        """
+        _require_numpy()
+        records = list(records)
+        return cls(
+            [record["SERIAL"] for record in records],
+            [epoch_seconds(record["DATATIME"]) for record in records],
+            _floats(record.get(counter) for record in records),
+            _floats(record.get(POWER_FIELD) for record in records),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        store: DeviceStore,
+        kind: str = "inverter",
+        counter: str = "ltea_3phsum_kwh",
+        *,
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+        **kwargs: Any,
+    ) -> EnergyAccount:
+        """
+        Account for the samples in a :py:class:`~sungazer.store.DeviceStore`.
+
+        PVS restarts are read from the store too, as each stored PVS sample's
+        ``DATATIME`` less its ``dl_uptime``.
+
+        Args:
+            store: The store
+            kind: The kind of device, such as ``"inverter"`` or
+                ``"production_power_meter"``
+            counter: The name of the counter column
+
+        Keyword Args:
+            start: Only use samples with a ``DATATIME`` at or after this
+            end: Only use samples with a ``DATATIME`` before this
+            **kwargs: The keyword arguments of :py:class:`EnergyAccount`
+
+        Raises:
+            ImportError: If numpy is not installed
+            ValueError: If ``kind`` or ``counter`` is unknown
+
+        Returns:
+            The account
+
+        """
+        _require_numpy()
+        columns = store.series(
+            kind, start=start, end=end, columns=[counter, POWER_FIELD]
+        )
+        if "restarts" not in kwargs:
+            pvs = store.series("pvs", start=start, end=end, columns=["dl_uptime"])
+            kwargs["restarts"] = restart_times(
+                when - uptime
+                for when, uptime in zip(pvs["DATATIME"], pvs["dl_uptime"], strict=True)
+                if uptime is not None
+            )
+        return cls(
+            columns["SERIAL"],
+            columns["DATATIME"],
+            _floats(columns[counter]),
+            _floats(columns[POWER_FIELD]),
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self.energy)
+
+    def __repr__(self) -> str:
+        return f"<EnergyAccount {len(self.serials)} devices, {len(self)} intervals>"
+
+    def total(self, serial: str | None = None) -> float:
+        """
+        Return the energy of one device, or of every device.
+
+        Args:
+            serial: The serial number of the device; ``None`` for all of them
+
+        Raises:
+            ValueError: If there is no device with that serial number
+
+        Returns:
+            The energy, in kWh
+
+        """
+        if serial is None:
+            return float(self.energy.sum())
+        return float(self.energy[self.device == self.serials.index(serial)].sum())
+
+    def totals(self) -> dict[str, float]:
+        """
+        Return the energy of each device.
+
+        Returns:
+            The energy in kWh, by serial number
+
+        """
+        sums = np.bincount(
+            self.device, weights=self.energy, minlength=len(self.serials)
+        )
+        return dict(zip(self.serials, sums.tolist(), strict=True))
+
+    def counts(self) -> dict[EnergySource, int]:
+        """
+        Return how many intervals got their energy from each source.
+
+        Returns:
+            The number of intervals, by :py:class:`EnergySource`
+
+        """
+        counts = np.bincount(self.source, minlength=len(EnergySource))
+        return {source: int(counts[source]) for source in EnergySource}
+
+    def intervals(
+        self,
+        width: float,
+        *,
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the energy of each device in fixed-length intervals.
+
+        The energy between two samples is counted in the interval its second
+        sample falls in.  Intervals are aligned on the Unix epoch, so with a
+        ``width`` of 86400 they are UTC days.
+
+        Args:
+            width: The length of the intervals, in seconds
+
+        Keyword Args:
+            start: The start of the first interval; by default, the one
+                holding the first sample
+            end: The end of the last interval; by default, the one holding
+                the last sample
+
+        Raises:
+            ValueError: If ``width`` is not positive
+
+        Returns:
+            The start of each interval, in seconds since the epoch, and the
+            energy in kWh as an array with a row per device (in the order of
+            :py:attr:`serials`) and a column per interval
+
+        """
+        if width <= 0:
+            msg = f"width must be positive, not {width}"
+            raise ValueError(msg)
+        if start is not None:
+            first = epoch_seconds(start) // width * width
+        else:
+            first = self.end.min() // width * width if len(self) else 0.0
+        if end is not None:
+            count = max(math.ceil((epoch_seconds(end) - first) / width), 0)
+        else:
+            count = int((self.end.max() - first) // width) + 1 if len(self) else 0
+        starts = first + np.arange(count) * width
+        bucket = ((self.end - first) // width).astype(np.int64)
+        inside = (bucket >= 0) & (bucket < count)
+        flat = self.device[inside] * count + bucket[inside]
+        energy = np.bincount(
+            flat, weights=self.energy[inside], minlength=len(self.serials) * count
+        )
+        return starts, energy.reshape(len(self.serials), count)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import TYPE_CHECKING, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .client import AsyncSungazerClient
+from .models import (  # noqa: TC001 - pydantic resolves them at runtime
+    DeviceDetailResponse,
+    GetCommResponse,
+)
+
+if TYPE_CHECKING:
+    from .breaker import CircuitBreakerRegistry
+    from .ratelimit import RateLimiterRegistry
+
+#: The commands the fleet poller knows how to run against each target
+FleetCommand = Literal["devices", "network"]
+
+
+class FleetTarget(BaseModel):
+    """
+    A single PVS6 unit to poll as part of a fleet sweep.
+    """
+
+    #: The base URL for the unit's API
+    base_url: str = Field(..., examples=["http://sunpowerconsole.com/cgi-bin"])
+    #: The serial number of the unit's PVS6
+    serial: str | None = Field(None, examples=["ZT01234567890ABCDEF"])
+
+
+class FleetResult(BaseModel):
+    """
+    The outcome of polling a single :py:class:`FleetTarget`.
+
+    If the poll failed or ran past its deadline, :py:attr:`error` describes
+    why and :py:attr:`exception` holds the original exception.  The response
+    fields still hold the responses of any commands that finished before the
+    failure, so a unit whose ``Command=Get_Comm`` fails still reports its
+    devices.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    #: The target that was polled
+    target: FleetTarget
+    #: The ``Command=DeviceList`` response, if requested and successful, even
+    #: if a later command failed
+    devices: DeviceDetailResponse | None = None
+    #: The ``Command=Get_Comm`` response, if requested and successful, even if
+    #: a later command failed
+    network: GetCommResponse | None = None
+    #: A description of the failure, if the poll failed
+    error: str | None = None
+    #: The exception raised by the poll, if it failed
+    exception: BaseException | None = Field(None, exclude=True)
+    #: Wall-clock seconds spent on this target, excluding time queued
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Return ``True`` if the poll succeeded."""
+        return self.error is None
+
+
+#: A callable that builds the async client used to poll a target
+ClientFactory = Callable[[FleetTarget], AsyncSungazerClient]
+
+
+class FleetPoller:
+    """
+    Poll many PVS6 units concurrently with a bounded number of requests in
+    flight.
+
+    Each target gets its own :py:class:`~sungazer.client.AsyncSungazerClient`
+    and runs the requested commands in order.  At most ``concurrency`` targets
+    are polled at once, and each target must finish within ``deadline``
+    seconds of starting or it is reported as failed.  Results are yielded by
+    :py:meth:`stream` in the order the units answer, so one slow site never
+    holds up the others.
+
+    Example:
+        .. code-block:: python
+
+            targets = [
+                ("http://pvs-a.local/cgi-bin", "ZT01234567890ABCDEF"),
+                ("http://pvs-b.local/cgi-bin", "ZT01234567890ABCDEG"),
+            ]
+            poller = FleetPoller(targets, concurrency=50, deadline=45)
+            async for result in poller.stream():
+                print(result.target.serial, result.ok)
+
+    """
+
+    def __init__(
+        self,
+        targets: Iterable[FleetTarget | tuple[str, str | None]],
+        *,
+        concurrency: int = 10,
+        deadline: float = 60.0,
+        timeout: int = 30,
+        commands: Iterable[FleetCommand] = ("devices", "network"),
+        client_factory: ClientFactory | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
+        rate_limiters: RateLimiterRegistry | None = None,
+    ):
+        """
+        Initialize the poller.
+
+        Args:
+            targets: The units to poll, as :py:class:`FleetTarget` objects or
+                ``(base_url, serial)`` tuples
+
+        Keyword Args:
+            concurrency: The maximum number of targets polled at once
+            deadline: The maximum number of seconds to spend on one target
+            timeout: The request timeout in seconds for each target's client
+            commands: Which commands to run against each target
+            client_factory: An optional callable that builds the client for a
+                target; defaults to an :py:class:`AsyncSungazerClient` using
+                ``timeout``, ``breakers`` and ``rate_limiters``
+            breakers: An optional registry of per-device circuit breakers.
+                Reuse one registry across sweeps so that units that keep
+                timing out are skipped immediately until their cooldown ends.
+            rate_limiters: An optional registry of per-device adaptive rate
+                limiters.  Reuse one registry across sweeps so that each
+                unit's learned rate carries over.
+
+        Raises:
+            ValueError: If ``concurrency`` or ``deadline`` is not positive
+
+        """
+        if concurrency < 1:
+            msg = f"concurrency must be at least 1, got {concurrency}"
+            raise ValueError(msg)
+        if deadline <= 0:
+            msg = f"deadline must be positive, got {deadline}"
+            raise ValueError(msg)
+        self.targets: list[FleetTarget] = [
+            target
+            if isinstance(target, FleetTarget)
+            else FleetTarget(base_url=target[0], serial=target[1])
+            for target in targets
+        ]
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self.timeout = timeout
+        self.commands: tuple[FleetCommand, ...] = tuple(commands)
+        self.breakers = breakers
+        self.rate_limiters = rate_limiters
+        self.client_factory = client_factory or self._default_client_factory
+
+    def _default_client_factory(self, target: FleetTarget) -> AsyncSungazerClient:
+        return AsyncSungazerClient(
+            base_url=target.base_url,
+            timeout=self.timeout,
+            serial=target.serial,
+            breaker=(
+                self.breakers.get(target.base_url)
+                if self.breakers is not None
+                else None
+            ),
+            rate_limiter=(
+                self.rate_limiters.get(target.base_url)
+                if self.rate_limiters is not None
+                else None
+            ),
+        )
+
+    async def _poll_one(self, result: FleetResult) -> None:
+        """
+        Run the configured commands against ``result.target``.
+
+        Each response is stored on ``result`` as soon as it arrives, so that
+        it is kept if a later command fails.
+
+        Args:
+            result: The result to fill in
+
+        """
+        async with self.client_factory(result.target) as client:
+            for command in self.commands:
+                if command == "devices":
+                    result.devices = await client.devices.list()
+                elif command == "network":
+                    result.network = await client.network.list()
+
+    async def _run(
+        self, target: FleetTarget, semaphore: asyncio.Semaphore
+    ) -> FleetResult:
+        """
+        Poll ``target`` once a concurrency slot is free, enforcing the deadline.
+
+        Failures are captured in the returned result rather than raised, so
+        that one bad unit never aborts the sweep.  Responses received before
+        the failure are kept.
+        """
+        result = FleetResult(target=target)
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self._poll_one(result), timeout=self.deadline)
+            except asyncio.TimeoutError as e:
+                result.error = f"Deadline of {self.deadline}s exceeded"
+                result.exception = e
+            except Exception as e:  # noqa: BLE001
+                result.error = f"{type(e).__name__}: {e!s}"
+                result.exception = e
+            result.elapsed = time.monotonic() - started
+            return result
+
+    async def stream(self) -> AsyncIterator[FleetResult]:
+        """
+        Poll every target, yielding each result as soon as its unit answers.
+
+        If the consumer stops iterating early, any polls still in flight are
+        cancelled.
+
+        Yields:
+            One :py:class:`FleetResult` per target, in completion order
+
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [
+            asyncio.ensure_future(self._run(target, semaphore))
+            for target in self.targets
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def poll(self) -> list[FleetResult]:
+        """
+        Poll every target and return all the results.
+
+        Returns:
+            One :py:class:`FleetResult` per target, in completion order
+
+        """
+        return [result async for result in self.stream()]
+
+    def run(self) -> list[FleetResult]:
+        """
+        Poll every target from synchronous code.
+
+        This starts a new event loop, so it must not be called from inside a
+        running one; use :py:meth:`poll` or :py:meth:`stream` there instead.
+
+        Returns:
+            One :py:class:`FleetResult` per target, in completion order
+
+        """
+        return asyncio.run(self.poll())
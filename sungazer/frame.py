@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; see the "numpy" extra
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from .models import DeviceDetailResponse, SolarBridgeDeviceDetail
+
+#: The columns of an :py:class:`InverterFrame`, and the keys the PVS may use
+#: for each in an inverter record, in order of preference.  These are the
+#: spellings :py:class:`~sungazer.models.SolarBridgeDeviceDetail` accepts for
+#: the same field.  ``vln_3phavg_v`` fills ``vln_3phsum_v`` because a
+#: single-phase microinverter has one line voltage, so the two are the same
+#: reading.  DC power is in kW, so its column is ``p_mppt1_kw`` even though
+#: the model calls the field ``p_mppt1_v``.
+COLUMNS: dict[str, tuple[str, ...]] = {
+    "p_3phsum_kw": ("p_3phsum_kw",),
+    "vln_3phsum_v": ("vln_3phsum_v", "vln_3phavg_v"),
+    "i_3phsum_a": ("i_3phsum_a",),
+    "p_mppt1_kw": ("p_mppt1_kw", "p_mppt1_v"),
+    "v_mppt1_v": ("v_mppt1_v",),
+    "i_mppt1_a": ("i_mppt1_a",),
+    "t_htsink_degc": ("t_htsink_degc", "t_htsnk_degc"),
+    "freq_hz": ("freq_hz",),
+    "ltea_3phsum_kwh": ("ltea_3phsum_kwh",),
+}
+
+#: The :py:class:`~sungazer.models.SolarBridgeDeviceDetail` field of each
+#: column whose name differs from the column's
+_MODEL_FIELDS: dict[str, str] = {"p_mppt1_kw": "p_mppt1_v"}
+
+
+def _require_numpy() -> None:
+    """
+    Make sure numpy is installed.
+
+    Raises:
+        ImportError: If it isn't
+
+    """
+    if np is None:
+        msg = "InverterFrame needs numpy; install it with: pip install sungazer[numpy]"
+        raise ImportError(msg)
+
+
+def _number(value: Any) -> float:
+    """
+    Convert one raw value to a float, with NaN for anything that isn't a number.
+
+    Args:
+        value: The value from the record
+
+    Returns:
+        The value as a float
+
+    """
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _column(values: list[Any]) -> np.ndarray:
+    """
+    Build a float64 column from raw values.
+
+    Numbers and numeric strings (which is what the PVS sends) are converted
+    in a single numpy call; only a column holding something else falls back
+    to converting value by value.
+
+    Args:
+        values: The raw values, with ``None`` for missing ones
+
+    Returns:
+        The column, with NaN for missing or non-numeric values
+
+    """
+    try:
+        return np.array(
+            [math.nan if value is None or value == "" else value for value in values],
+            dtype=np.float64,
+        )
+    except (TypeError, ValueError):
+        return np.fromiter(
+            (_number(value) for value in values), dtype=np.float64, count=len(values)
+        )
+
+
+class InverterFrame:
+    """
+    The metrics of many inverters as columns of float64 numpy arrays.
+
+    Each column of :py:data:`COLUMNS` is one array with a value per inverter,
+    in the same order as :py:attr:`serials`, with NaN where the inverter did
+    not report a value.  Site totals, means and percentiles are then single
+    vectorized numpy calls instead of Python loops over models.
+
+    Needs numpy, which is an optional dependency: ``pip install
+    sungazer[numpy]``.
+
+    Example:
+        .. code-block:: python
+
+            frame = InverterFrame.from_payload(payload)
+            frame.total("p_3phsum_kw")  # site AC power, kW
+            frame.percentile("t_htsink_degc", 95)
+            frame["freq_hz"][frame.index("E00122142080335")]
+
+    Args:
+        serials: The serial number of each inverter
+        columns: A float64 array per column, each as long as ``serials``
+
+    Raises:
+        ImportError: If numpy is not installed
+        ValueError: If a column is missing or is not as long as ``serials``
+
+    """
+
+    def __init__(self, serials: list[str], columns: Mapping[str, np.ndarray]):
+        _require_numpy()
+        missing = set(COLUMNS) - set(columns)
+        if missing:
+            msg = f"Missing columns: {', '.join(sorted(missing))}"
+            raise ValueError(msg)
+        #: The serial number of each inverter, in row order
+        self.serials = serials
+        #: The columns, by name
+        self.columns: dict[str, np.ndarray] = {}
+        for name in COLUMNS:
+            column = np.asarray(columns[name], dtype=np.float64)
+            if column.shape != (len(serials),):
+                msg = f"Column {name} has shape {column.shape}, not ({len(serials)},)"
+                raise ValueError(msg)
+            self.columns[name] = column
+        #: The row of each serial number
+        self._rows = {serial: row for row, serial in enumerate(serials)}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> InverterFrame:
+        """
+        Build a frame from raw inverter records, without validating them.
+
+        Args:
+            records: Decoded inverter records, as found in the ``devices``
+                array of a ``Command=DeviceList`` response
+
+        Raises:
+            ImportError: If numpy is not installed
+
+        Returns:
+            The frame, with a row per record
+
+        """
+        _require_numpy()
+        records = list(records)
+        columns = {}
+        for name, keys in COLUMNS.items():
+            if len(keys) == 1:
+                key = keys[0]
+                values = [record.get(key) for record in records]
+            else:
+                values = [
+                    next((record[k] for k in keys if k in record), None)
+                    for record in records
+                ]
+            columns[name] = _column(values)
+        return cls([record.get("SERIAL") for record in records], columns)
+
+    @classmethod
+    def from_payload(cls, obj: Mapping[str, Any]) -> InverterFrame:
+        """
+        Build a frame from a decoded ``Command=DeviceList`` body.
+
+        Only the inverter records are read, straight from the payload, so no
+        device models are built at all.
+
+        Args:
+            obj: The decoded response body
+
+        Raises:
+            ImportError: If numpy is not installed
+
+        Returns:
+            The frame, with a row per inverter
+
+        """
+        return cls.from_records(
+            device
+            for device in obj.get("devices") or []
+            if isinstance(device, dict) and device.get("DEVICE_TYPE") == "Inverter"
+        )
+
+    @classmethod
+    def from_devices(cls, devices: Iterable[SolarBridgeDeviceDetail]) -> InverterFrame:
+        """
+        Build a frame from inverter models.
+
+        The models have already read the alternate key spellings in
+        :py:data:`COLUMNS`, so this gives the same frame as
+        :py:meth:`from_payload` on the body the models came from.
+
+        Args:
+            devices: The inverters, for example
+                :py:attr:`~sungazer.models.DeviceDetailResponse.inverters`
+
+        Raises:
+            ImportError: If numpy is not installed
+
+        Returns:
+            The frame, with a row per inverter
+
+        """
+        return cls.from_records(
+            {
+                "SERIAL": device.SERIAL,
+                **{
+                    name: getattr(device, _MODEL_FIELDS.get(name, name))
+                    for name in COLUMNS
+                },
+            }
+            for device in devices
+        )
+
+    @classmethod
+    def from_response(cls, response: DeviceDetailResponse) -> InverterFrame:
+        """
+        Build a frame from the inverters of a response.
+
+        Args:
+            response: The ``Command=DeviceList`` response
+
+        Raises:
+            ImportError: If numpy is not installed
+
+        Returns:
+            The frame, with a row per inverter
+
+        """
+        return cls.from_devices(response.inverters)
+
+    def __len__(self) -> int:
+        return len(self.serials)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Return one column.
+
+        Args:
+            name: The name of the column
+
+        Raises:
+            KeyError: If there is no such column
+
+        Returns:
+            The column
+
+        """
+        return self.columns[name]
+
+    def __repr__(self) -> str:
+        return f"<InverterFrame {len(self)} inverters>"
+
+    def index(self, serial: str) -> int:
+        """
+        Return the row of an inverter.
+
+        Args:
+            serial: The serial number of the inverter
+
+        Raises:
+            KeyError: If there is no inverter with that serial number
+
+        Returns:
+            The row, usable as an index into every column
+
+        """
+        return self._rows[serial]
+
+    def row(self, serial: str) -> dict[str, float]:
+        """
+        Return every metric of one inverter.
+
+        Args:
+            serial: The serial number of the inverter
+
+        Raises:
+            KeyError: If there is no inverter with that serial number
+
+        Returns:
+            The value of each column for that inverter
+
+        """
+        row = self._rows[serial]
+        return {name: float(column[row]) for name, column in self.columns.items()}
+
+    def total(self, name: str) -> float:
+        """
+        Return the sum of a column, ignoring missing values.
+
+        Args:
+            name: The name of the column
+
+        Returns:
+            The sum; ``0.0`` if no inverter reported a value
+
+        """
+        return float(np.nansum(self.columns[name]))
+
+    def count(self, name: str) -> int:
+        """
+        Return how many inverters reported a value for a column.
+
+        Args:
+            name: The name of the column
+
+        Returns:
+            The number of non-NaN values
+
+        """
+        return int(np.count_nonzero(~np.isnan(self.columns[name])))
+
+    def mean(self, name: str) -> float:
+        """
+        Return the mean of a column, ignoring missing values.
+
+        Args:
+            name: The name of the column
+
+        Returns:
+            The mean; NaN if no inverter reported a value
+
+        """
+        column = self.columns[name]
+        reported = column[~np.isnan(column)]
+        return float(reported.mean()) if reported.size else math.nan
+
+    def percentile(self, name: str, q: float | Iterable[float]) -> float | np.ndarray:
+        """
+        Return percentiles of a column, ignoring missing values.
+
+        Values between data points are interpolated linearly, as
+        :py:func:`numpy.percentile` does by default, but without its fixed
+        overhead, which dominates on columns of a few hundred values.
+
+        Args:
+            name: The name of the column
+            q: The percentile, or percentiles, between 0 and 100
+
+        Raises:
+            ValueError: If a percentile is outside 0 to 100
+
+        Returns:
+            The percentile as a float, or an array of them if ``q`` is a
+            sequence; NaN if no inverter reported a value
+
+        """
+        scalar = isinstance(q, (int, float))
+        qs = np.asarray(q if scalar else list(q), dtype=np.float64)
+        if ((qs < 0) | (qs > 100)).any():
+            msg = f"Percentiles must be between 0 and 100, not {q}"
+            raise ValueError(msg)
+        column = self.columns[name]
+        reported = np.sort(column[~np.isnan(column)])
+        if not reported.size:
+            result = np.full(qs.shape, np.nan)
+        else:
+            position = qs / 100 * (reported.size - 1)
+            below = np.floor(position).astype(np.intp)
+            above = np.minimum(below + 1, reported.size - 1)
+            low = reported[below]
+            result = low + (reported[above] - low) * (position - below)
+        return float(result) if scalar else result
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from datetime import date, datetime
+from ipaddress import IPv4Address
+from typing import TYPE_CHECKING, Any
+
+from pydantic import AnyUrl
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _default(obj: Any) -> Any:
+    """
+    Encode the types that come out of ``model_dump()`` that JSON has no
+    type for.
+
+    Args:
+        obj: The object the encoder couldn't serialize
+
+    Raises:
+        TypeError: If ``obj`` is not one of the handled types
+
+    Returns:
+        A JSON-serializable stand-in for ``obj``
+
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (IPv4Address, AnyUrl)):
+        return str(obj)
+    msg = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+class JSONBackend:
+    """
+    A JSON implementation: how to decode bytes and encode objects.
+
+    Every backend handles :py:class:`~datetime.datetime` and
+    :py:class:`~ipaddress.IPv4Address` values, so ``model_dump()`` output can
+    be encoded directly.  Datetimes are written in ISO 8601 / RFC 3339 form,
+    though the exact text (``+00:00`` versus ``Z`` for UTC, say) may differ
+    between backends.
+
+    Args:
+        name: The name of the backend
+        loads: Decode a JSON document from ``bytes``, ``bytearray`` or ``str``
+        dumps: Encode an object to JSON text; the ``indent`` keyword argument
+            asks for output indented by two spaces
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[bytes | bytearray | str], Any],
+        dumps: Callable[..., str],
+    ) -> None:
+        #: The name of the backend: ``orjson``, ``msgspec`` or ``json``
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"<JSONBackend {self.name}>"
+
+
+def _orjson_backend() -> JSONBackend:
+    import orjson  # noqa: PLC0415
+
+    def dumps(obj: Any, *, indent: bool = False) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option).decode()
+
+    return JSONBackend("orjson", orjson.loads, dumps)
+
+
+def _msgspec_backend() -> JSONBackend:
+    import msgspec  # noqa: PLC0415
+
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: bytes | bytearray | str) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # Match json.loads and orjson.loads, which raise ValueError
+            raise ValueError(str(e)) from e
+
+    def dumps(obj: Any, *, indent: bool = False) -> str:
+        data = encoder.encode(obj)
+        if indent:
+            data = msgspec.json.format(data, indent=2)
+        return data.decode()
+
+    return JSONBackend("msgspec", loads, dumps)
+
+
+def _stdlib_backend() -> JSONBackend:
+    def dumps(obj: Any, *, indent: bool = False) -> str:
+        return json.dumps(
+            obj,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+            ensure_ascii=False,
+            default=_default,
+        )
+
+    return JSONBackend("json", json.loads, dumps)
+
+
+#: The backends in order of preference
+BACKENDS: dict[str, Callable[[], JSONBackend]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend,
+}
+
+
+def get_backend(name: str | None = None) -> JSONBackend:
+    """
+    Build a JSON backend.
+
+    Args:
+        name: The backend to build, one of the keys of :py:data:`BACKENDS`.
+            If ``None``, the first one whose library is installed is used.
+
+    Raises:
+        ValueError: If ``name`` is not a known backend
+        ImportError: If the library for ``name`` is not installed
+
+    Returns:
+        The backend
+
+    """
+    if name is not None:
+        if name not in BACKENDS:
+            msg = f"Unknown JSON backend {name!r}; choose from {', '.join(BACKENDS)}"
+            raise ValueError(msg)
+        return BACKENDS[name]()
+    for backend_name, factory in BACKENDS.items():
+        if backend_name == "json" or importlib.util.find_spec(backend_name):
+            return factory()
+    # The stdlib backend is always there
+    return _stdlib_backend()  # pragma: no cover
+
+
+#: The backend used by :py:func:`loads` and :py:func:`dumps`
+backend: JSONBackend = get_backend()
+
+
+def use(name: str | None = None) -> JSONBackend:
+    """
+    Switch the backend used by :py:func:`loads` and :py:func:`dumps`.
+
+    Args:
+        name: The backend to use; ``None`` picks the fastest one installed
+
+    Raises:
+        ValueError: If ``name`` is not a known backend
+        ImportError: If the library for ``name`` is not installed
+
+    Returns:
+        The backend now in use
+
+    """
+    global backend  # noqa: PLW0603
+    backend = get_backend(name)
+    return backend
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    """
+    Decode a JSON document with the current backend.
+
+    Args:
+        data: The JSON document
+
+    Raises:
+        ValueError: If ``data`` is not valid JSON
+
+    Returns:
+        The decoded document
+
+    """
+    return backend.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> str:
+    """
+    Encode ``obj`` as JSON with the current backend.
+
+    Args:
+        obj: The object to encode
+
+    Keyword Args:
+        indent: If ``True``, indent the output by two spaces
+
+    Raises:
+        TypeError: If ``obj`` holds a type that can't be encoded
+
+    Returns:
+        The JSON text
+
+    """
+    return backend.dumps(obj, indent=indent)
@@ -1,5 +1,6 @@
 from .devices import *  # noqa: F403
 from .firmware import *  # noqa: F403
 from .grid import *  # noqa: F403
+from .lazy import *  # noqa: F403
 from .network import *  # noqa: F403
 from .session import *  # noqa: F403
@@ -1,8 +1,23 @@
+import sys
 from datetime import datetime, timedelta
-from typing import Literal, Union
+from typing import Annotated, Any, Literal, Union
 from zoneinfo import ZoneInfo
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import (
+    AfterValidator,
+    AliasChoices,
+    BaseModel,
+    Discriminator,
+    Field,
+    PrivateAttr,
+    Tag,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
+from pydantic_core import ErrorDetails
+
+from .timestamps import parse_pvs_timestamp
 
 DeviceType = Literal[
     "PVS",
@@ -16,6 +31,13 @@ DeviceType = Literal[
     "Energy Storage System",
 ]
 
+#: A string that is interned with :py:func:`sys.intern` once validated.  Used
+#: for low-cardinality metadata (states, models, firmware versions, ports) and
+#: for serial numbers, which repeat in every poll, so that every device and
+#: every response held in memory shares one copy of each distinct value instead
+#: of keeping the copy its JSON decoder made.
+InternedStr = Annotated[str, AfterValidator(sys.intern)]
+
 
 class BaseDeviceDetail(BaseModel):
     """
@@ -32,40 +54,40 @@ class BaseDeviceDetail(BaseModel):
         description="Details about the device",
         examples=[True],
     )
-    STATE: str | None = Field(
+    STATE: InternedStr | None = Field(
         None, description="State of the device", examples=["working"]
     )
-    STATEDESCR: str | None = Field(
+    STATEDESCR: InternedStr | None = Field(
         None, description="Description of the state", examples=["Working"]
     )
-    SERIAL: str | None = Field(
+    SERIAL: InternedStr | None = Field(
         None,
         description="The serial number of the device",
         examples=["ZT112345678912A0069"],
     )
-    MODEL: str | None = Field(
+    MODEL: InternedStr | None = Field(
         None,
         description="The manufacturer's model of the device",
         examples=["PVS6M0400p"],
     )
-    HWVER: str | None = Field(
+    HWVER: InternedStr | None = Field(
         None, description="The hardware version", examples=["6.02"]
     )
-    SWVER: str | None = Field(
+    SWVER: InternedStr | None = Field(
         None,
         description="The software version  of the firmware",
         examples=["2021.9, Build 41001"],
     )
     #: The device type
     DEVICE_TYPE: DeviceType | None = None
-    TYPE: str | None = Field(
+    TYPE: InternedStr | None = Field(
         None,
         description=(
             "The detailed type of the device (usually includes the manufacturer)"
         ),
         examples=["PVS5-METER-P"],
     )
-    PORT: str | None = Field(
+    PORT: InternedStr | None = Field(
         None, description="The port the device is connected to", examples=["COM1"]
     )
     DATATIME: datetime | None = Field(
@@ -74,8 +96,10 @@ class BaseDeviceDetail(BaseModel):
     CURTIME: datetime | None = Field(
         None, description="The current time as reported by the device"
     )
-    OPERATION: str | None = Field(None, description="Operation type", examples=["noop"])
-    origin: str | None = Field(
+    OPERATION: InternedStr | None = Field(
+        None, description="Operation type", examples=["noop"]
+    )
+    origin: InternedStr | None = Field(
         None, description="Origin of this data", examples=["data_logger"]
     )
     panid: float | None = Field(
@@ -112,21 +136,9 @@ class BaseDeviceDetail(BaseModel):
             return v
 
         if isinstance(v, str):
-            # Handle PVS6 comma-separated format
-            if "," in v and len(v.split(",")) == 6:
-                try:
-                    year, month, day, hour, minute, second = v.split(",")
-                    return datetime(
-                        int(year),
-                        int(month),
-                        int(day),
-                        int(hour),
-                        int(minute),
-                        int(second),
-                        tzinfo=ZoneInfo("UTC"),
-                    )
-                except (ValueError, TypeError):
-                    pass
+            # Handle PVS6 comma-separated format.  Devices in the same response
+            # mostly share timestamps, so this is memoized.
+            return parse_pvs_timestamp(v)
 
         msg = f"Invalid datetime value: {v}"
         raise ValueError(msg)
@@ -222,10 +234,10 @@ class PowerMeterDeviceDetail(BaseDeviceDetail):
     and building electrical infrastructure.
     """
 
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None, description="The type of interface used by the device", examples=["mime"]
     )
-    subtype: str | None = Field(
+    subtype: InternedStr | None = Field(
         None, description="The subtype of meter", examples=["GROSS_PRODUCTION_SITE"]
     )
     ct_scl_fctr: int | None = Field(
@@ -297,7 +309,7 @@ class ProductionPowerMeterDeviceDetail(PowerMeterDeviceDetail):
     """
 
     #: The production meter subtype enum
-    production_subtype_enum: str | None = Field(
+    production_subtype_enum: InternedStr | None = Field(
         None,
         description="The production subtype enum",
         examples=["GROSS_PRODUCTION_SITE"],
@@ -323,7 +335,7 @@ class ConsumptionPowerMeterDeviceDetail(PowerMeterDeviceDetail):
     PVS6.
     """
 
-    consumption_subtype_enum: str | None = Field(
+    consumption_subtype_enum: InternedStr | None = Field(
         None,
         description="The consumption subtype enum",
         examples=["NET_CONSUMPTION_LOADSIDE"],
@@ -378,18 +390,18 @@ class SolarBridgeDeviceDetail(BaseDeviceDetail):
     PVS6.
     """
 
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None, description="The type of interface used by the panel?", examples=["mime"]
     )
-    hw_version: str | None = Field(
+    hw_version: InternedStr | None = Field(
         None, description="Hardware version", examples=["1.0"]
     )
-    module_serial: str | None = Field(
+    module_serial: InternedStr | None = Field(
         None,
         description="Serial number of the inverter module",
         examples=["12345678901234"],
     )
-    PANEL: str | None = Field(
+    PANEL: InternedStr | None = Field(
         None,
         description="Model of the solar panel module",
         examples=["SPR-A410-G-AC"],
@@ -397,12 +409,12 @@ class SolarBridgeDeviceDetail(BaseDeviceDetail):
     slave: bool | None = Field(
         None, description="Is this a slave device?", examples=[False]
     )
-    MOD_SN: str | None = Field(
+    MOD_SN: InternedStr | None = Field(
         None,
         description="Serial number of the microinverter",
         examples=["12345678901234"],
     )
-    NMPLT_SKU: str | None = Field(
+    NMPLT_SKU: InternedStr | None = Field(
         None,
         description="SKU of the microinverter",
         examples=["SB250-1BD-US"],
@@ -414,15 +426,26 @@ class SolarBridgeDeviceDetail(BaseDeviceDetail):
         None, description="AC Power (kW)", examples=[0.0471]
     )
     vln_3phsum_v: float | None = Field(
-        None, description="AC Voltage (V)", examples=[246.5]
+        None,
+        description=(
+            "AC Voltage (V).  Some firmware sends it as ``vln_3phavg_v``; a "
+            "single-phase microinverter has one line voltage, so the two are "
+            "the same reading"
+        ),
+        examples=[246.5],
+        validation_alias=AliasChoices("vln_3phsum_v", "vln_3phavg_v"),
     )
     i_3phsum_a: float | None = Field(
         None, description="AC Current (A)", examples=[0.19]
     )
     p_mppt1_v: float | None = Field(
         None,
-        description="DC Power (kW) for MPTT (Maximum Power Point Tracking)",
+        description=(
+            "DC Power (kW) for MPTT (Maximum Power Point Tracking).  Some "
+            "firmware sends it as ``p_mppt1_kw``"
+        ),
         examples=[0.0502],
+        validation_alias=AliasChoices("p_mppt1_v", "p_mppt1_kw"),
     )
     v_mppt1_v: float | None = Field(
         None,
@@ -439,7 +462,13 @@ class SolarBridgeDeviceDetail(BaseDeviceDetail):
         description="Legacy? Seems replaced by p_mppt1_kw",
     )
     t_htsink_degc: float | None = Field(
-        None, description="Heatsink temperature in degrees C", examples=[45.0]
+        None,
+        description=(
+            "Heatsink temperature in degrees C.  Some firmware sends it as "
+            "``t_htsnk_degc``"
+        ),
+        examples=[45.0],
+        validation_alias=AliasChoices("t_htsink_degc", "t_htsnk_degc"),
     )
     freq_hz: float | None = Field(
         None, description="Operating Frequency in Hz", examples=[60.0]
@@ -464,10 +493,10 @@ class PVDisconnectDetail(BaseDeviceDetail):
     event_history: int | None = Field(
         None, description="Count of 'events' seen so far", examples=[32]
     )
-    hw_version: str | None = Field(
+    hw_version: InternedStr | None = Field(
         None, description="The hardware version", examples=["0.2.0"]
     )
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None,
         description="The type of interface used by the panel",
         examples=["ttymxc5"],
@@ -589,12 +618,12 @@ class Gateway(BaseDeviceDetail):
     if a gateway device is connected to the PVS6 system.
     """
 
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None,
         description="The type of interface used by the gateway",
         examples=["sunspec"],
     )
-    mac_address: str | None = Field(
+    mac_address: InternedStr | None = Field(
         None,
         description="The MAC address of the gateway device",
         examples=["d8:a9:ab:cd:12:34"],
@@ -616,12 +645,12 @@ class SchneiderXwPro(BaseDeviceDetail):
     if a Schneider XW Pro storage inverter is connected to the PVS6 system.
     """
 
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None,
         description="The type of interface used by the storage inverter",
         examples=["sunspec"],
     )
-    mac_address: str | None = Field(
+    mac_address: InternedStr | None = Field(
         None,
         description="The MAC address of the storage inverter device",
         examples=["d8:a9:ab:cd:12:34"],
@@ -634,7 +663,7 @@ class SchneiderXwPro(BaseDeviceDetail):
         description="The slave number for the storage inverter device",
         examples=[10],
     )
-    PARENT: str | None = Field(
+    PARENT: InternedStr | None = Field(
         None,
         description="The parent device serial number",
         examples=["00001ABC1234_01234567890ABCDEF"],
@@ -655,12 +684,12 @@ class EquinioxBMS(BaseDeviceDetail):
     if an Equiniox BMS is connected to the PVS6 system.
     """
 
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None,
         description="The type of interface used by the BMS",
         examples=["sunspec"],
     )
-    mac_address: str | None = Field(
+    mac_address: InternedStr | None = Field(
         None,
         description="The MAC address of the BMS device",
         examples=["d8:a9:ab:cd:12:34"],
@@ -671,7 +700,7 @@ class EquinioxBMS(BaseDeviceDetail):
     slave: int | None = Field(
         None, description="The slave number of the BMS device", examples=[230]
     )
-    PARENT: str | None = Field(
+    PARENT: InternedStr | None = Field(
         None,
         description="The parent device serial number",
         examples=["00001ABC1234_01234567890ABCDEF"],
@@ -691,7 +720,7 @@ class Battery(BaseDeviceDetail):
     if a Battery is connected to the PVS6 system.
     """
 
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None,
         description="The type of interface used by the battery",
         examples=["none"],
@@ -699,17 +728,17 @@ class Battery(BaseDeviceDetail):
     parent: int | None = Field(
         None, description="The parent device identifier", examples=[11]
     )
-    PARENT: str | None = Field(
+    PARENT: InternedStr | None = Field(
         None,
         description="The parent device serial number",
         examples=["00001ABC1234_01234567890ABCDEF"],
     )
-    hw_version: str | None = Field(
+    hw_version: InternedStr | None = Field(
         None,
         description="The hardware version of the battery",
         examples=["4.34"],
     )
-    DESCR: str | None = Field(
+    DESCR: InternedStr | None = Field(
         None,
         description="Description of the battery",
         examples=["Battery M00122109A0355"],
@@ -729,17 +758,17 @@ class EquinoxESS(BaseDeviceDetail):
     if an Equinox ESS is connected to the PVS6 system.
     """
 
-    interface: str | None = Field(
+    interface: InternedStr | None = Field(
         None,
         description="The type of interface used by the ESS",
         examples=["none"],
     )
-    hw_version: str | None = Field(
+    hw_version: InternedStr | None = Field(
         None,
         description="The hardware version of the ESS",
         examples=["0"],
     )
-    DESCR: str | None = Field(
+    DESCR: InternedStr | None = Field(
         None,
         description="Description of the ESS",
         examples=["Energy Storage System 00001ABC1234_01234567890ABCDEF"],
@@ -761,6 +790,327 @@ DeviceClass = Union[  # noqa: UP007
 ]
 
 
+#: The union tag of each device model: its ``DEVICE_TYPE``, except for power
+#: meters, which are told apart by which subtype field they have
+_MODEL_TAGS: dict[type[BaseDeviceDetail], str] = {
+    PVSDeviceDetail: "PVS",
+    ProductionPowerMeterDeviceDetail: "Production Power Meter",
+    ConsumptionPowerMeterDeviceDetail: "Consumption Power Meter",
+    SolarBridgeDeviceDetail: "Inverter",
+    PVDisconnectDetail: "PV Disconnect",
+    Gateway: "Gateway",
+    SchneiderXwPro: "Storage Inverter",
+    EquinioxBMS: "ESS BMS",
+    Battery: "Battery",
+    EquinoxESS: "Energy Storage System",
+}
+
+
+def device_tag(value: Any) -> str | None:
+    """
+    Return the union tag that picks the model for a device.
+
+    This is the :py:class:`pydantic.Discriminator` of :py:data:`Device`.
+
+    Args:
+        value: A decoded device record, or an already built device model
+
+    Returns:
+        The tag, or ``None`` if there is none (no ``DEVICE_TYPE``, or a power
+        meter with neither subtype field)
+
+    """
+    if isinstance(value, dict):
+        device_type = value.get("DEVICE_TYPE")
+        if device_type == "Power Meter":
+            if "production_subtype_enum" in value:
+                return "Production Power Meter"
+            if "consumption_subtype_enum" in value:
+                return "Consumption Power Meter"
+            return None
+        return device_type
+    return _MODEL_TAGS.get(type(value))
+
+
+#: Any device, validated straight to the right model by :py:func:`device_tag`
+Device = Annotated[
+    Union[  # noqa: UP007
+        Annotated[PVSDeviceDetail, Tag("PVS")],
+        Annotated[ProductionPowerMeterDeviceDetail, Tag("Production Power Meter")],
+        Annotated[ConsumptionPowerMeterDeviceDetail, Tag("Consumption Power Meter")],
+        Annotated[SolarBridgeDeviceDetail, Tag("Inverter")],
+        Annotated[PVDisconnectDetail, Tag("PV Disconnect")],
+        Annotated[Gateway, Tag("Gateway")],
+        Annotated[SchneiderXwPro, Tag("Storage Inverter")],
+        Annotated[EquinioxBMS, Tag("ESS BMS")],
+        Annotated[Battery, Tag("Battery")],
+        Annotated[EquinoxESS, Tag("Energy Storage System")],
+    ],
+    Discriminator(device_tag),
+]
+
+#: Validates one device record
+_DEVICE = TypeAdapter(Device)
+#: Validates a whole ``devices`` array in one call
+_DEVICES = TypeAdapter(list[Device])
+#: The device model for each tag returned by :py:func:`device_tag`
+_TAG_MODELS: dict[str, type[BaseDeviceDetail]] = {
+    tag: model for model, tag in _MODEL_TAGS.items()
+}
+
+
+def device_model(device: dict) -> type[BaseDeviceDetail] | None:
+    """
+    Return the model class for a decoded device record without validating it.
+
+    Args:
+        device: One decoded device record
+
+    Raises:
+        ValueError: If ``DEVICE_TYPE`` is not a known device type
+
+    Returns:
+        The model class, or ``None`` for power meters that are neither
+        production nor consumption meters
+
+    """
+    if _is_unclassified_meter(device):
+        return None
+    model = _TAG_MODELS.get(device_tag(device))  # type: ignore[arg-type]
+    if model is None:
+        device_type = device.get("DEVICE_TYPE") if isinstance(device, dict) else None
+        msg = f"Unknown device type: {device_type}"
+        raise ValueError(msg)
+    return model
+
+
+def _is_unclassified_meter(device: dict) -> bool:
+    """
+    Tell whether ``device`` is a power meter that is neither a production nor a
+    consumption meter.  :py:meth:`DeviceDetailResponse.new` skips these.
+    """
+    return (
+        isinstance(device, dict)
+        and device.get("DEVICE_TYPE") == "Power Meter"
+        and "production_subtype_enum" not in device
+        and "consumption_subtype_enum" not in device
+    )
+
+
+#: The error types pydantic reports when :py:func:`device_tag` picks no model
+_UNKNOWN_TAG_ERRORS = ("union_tag_invalid", "union_tag_not_found")
+
+
+def _unknown_device_type(error: ValidationError) -> ValueError | None:
+    """
+    Turn a failure to pick a device model into the error ``new()`` has always
+    raised for an unknown ``DEVICE_TYPE``.
+
+    Args:
+        error: The error raised while validating devices
+
+    Returns:
+        The ``ValueError`` to raise instead, or ``None`` if ``error`` is about
+        something else
+
+    """
+    for detail in error.errors(include_url=False):
+        if detail["type"] in _UNKNOWN_TAG_ERRORS:
+            device = detail["input"]
+            device_type = (
+                device.get("DEVICE_TYPE") if isinstance(device, dict) else None
+            )
+            return ValueError(f"Unknown device type: {device_type}")
+    return None
+
+
+class UnknownDevice(BaseModel):
+    """
+    A ``devices`` record whose ``DEVICE_TYPE`` sungazer has no model for.
+
+    :py:meth:`DeviceDetailResponse.new` keeps these in
+    :py:attr:`DeviceDetailResponse.unknown_devices` instead of failing when
+    called with ``tolerant=True``.
+    """
+
+    #: The position of the record in the ``devices`` array
+    index: int = Field(..., examples=[7])
+    #: The device type the PVS reported, if any
+    DEVICE_TYPE: Any = Field(default=None, examples=["Toaster"])
+    #: The serial number the PVS reported, if any
+    SERIAL: Any = Field(default=None, examples=["ZT01234567890ABCDEF"])
+    #: The record, as decoded
+    raw: Any = None
+
+
+class DeviceParseError(BaseModel):
+    """
+    A ``devices`` record of a known type that failed validation.
+
+    :py:meth:`DeviceDetailResponse.new` keeps these in
+    :py:attr:`DeviceDetailResponse.invalid_devices` instead of failing when
+    called with ``tolerant=True``.
+    """
+
+    #: The position of the record in the ``devices`` array
+    index: int = Field(..., examples=[7])
+    #: The device type the PVS reported
+    DEVICE_TYPE: Any = Field(default=None, examples=["Inverter"])
+    #: The serial number the PVS reported, if any
+    SERIAL: Any = Field(default=None, examples=["E00122142080335"])
+    #: What is wrong with the record, one ``"field: message"`` string per problem
+    errors: list[str] = Field(
+        default_factory=list,
+        examples=[["p_3phsum_kw: Input should be a valid number"]],
+    )
+    #: The record, as decoded
+    raw: Any = None
+
+
+def _rejected_device(
+    index: int, device: Any, details: list[ErrorDetails]
+) -> UnknownDevice | DeviceParseError:
+    """
+    Describe a record that failed validation as part of a ``devices`` array.
+
+    Args:
+        index: The position of the record in the ``devices`` array
+        device: The record
+        details: The validation errors for the record; their locations start
+            with the position of the record in the validated list
+
+    Returns:
+        An :py:class:`UnknownDevice` if no model could be picked for the
+        record, otherwise a :py:class:`DeviceParseError`
+
+    """
+    fields = device if isinstance(device, dict) else {}
+    kwargs = {
+        "index": index,
+        "DEVICE_TYPE": fields.get("DEVICE_TYPE"),
+        "SERIAL": fields.get("SERIAL"),
+        "raw": device,
+    }
+    if any(detail["type"] in _UNKNOWN_TAG_ERRORS for detail in details):
+        return UnknownDevice(**kwargs)
+    errors = []
+    for detail in details:
+        # Skip the list index and the union tag
+        loc = ".".join(str(part) for part in detail["loc"][2:])
+        errors.append(f"{loc}: {detail['msg']}" if loc else detail["msg"])
+    return DeviceParseError(**kwargs, errors=errors)
+
+
+class _DeviceIndex:
+    """
+    Lookup tables over the devices of a :py:class:`DeviceDetailResponse`.
+
+    Devices are grouped by their exact model class and by serial number up
+    front.  Lookups by a base class and the parent to children map are worked
+    out the first time they are asked for.
+
+    Args:
+        devices: The devices to index
+
+    """
+
+    __slots__ = ("_by_type", "_children", "_exact", "by_serial", "devices", "size")
+
+    def __init__(self, devices: list[Any] | None):
+        #: The list that was indexed
+        self.devices = devices
+        #: How many devices it held when it was indexed
+        self.size = len(devices) if devices is not None else 0
+        #: The devices of each exact model class
+        self._exact: dict[type, list[Any]] = {}
+        for device in devices or []:
+            group = self._exact.get(type(device))
+            if group is None:
+                group = self._exact[type(device)] = []
+            group.append(device)
+        #: The devices of each model class asked about, subclasses included
+        self._by_type: dict[type, list[Any]] = {}
+        #: The first device with each serial number
+        self.by_serial: dict[str, Any] = {
+            device.SERIAL: device for device in reversed(devices or [])
+        }
+        self.by_serial.pop(None, None)  # type: ignore[call-overload]
+        #: The devices that name each serial number as their ``PARENT``
+        self._children: dict[str, list[Any]] | None = None
+
+    def of_type(self, model_class: type) -> list[Any]:
+        """
+        Return the devices that are instances of ``model_class``.
+
+        Args:
+            model_class: The device model
+
+        Returns:
+            The devices, in the order they are listed
+
+        """
+        devices = self._by_type.get(model_class)
+        if devices is None:
+            if any(
+                cls is not model_class and issubclass(cls, model_class)
+                for cls in self._exact
+            ):
+                devices = [
+                    device
+                    for device in self.devices or []
+                    if isinstance(device, model_class)
+                ]
+            else:
+                devices = self._exact.get(model_class, [])
+            self._by_type[model_class] = devices
+        return devices
+
+    def children(self, serial: str) -> list[Any]:
+        """
+        Return the devices that name ``serial`` as their ``PARENT``.
+
+        Args:
+            serial: The serial number of the parent device
+
+        Returns:
+            The devices, in the order they are listed
+
+        """
+        if self._children is None:
+            self._children = {}
+            for device in self.devices or []:
+                # Only some models have the field, and reading a missing
+                # attribute through pydantic's ``__getattr__`` is slow
+                if "PARENT" in type(device).model_fields and device.PARENT:
+                    self._children.setdefault(device.PARENT, []).append(device)
+        return self._children.get(serial, [])
+
+    def is_current(self, devices: list[Any] | None) -> bool:
+        """
+        Tell whether this index still describes ``devices``.
+
+        Assigning a new list, or adding or removing devices, is noticed;
+        replacing a device in place is not.
+
+        Args:
+            devices: The response's devices now
+
+        Returns:
+            ``True`` if the index can be used as is
+
+        """
+        return devices is self.devices and (
+            devices is None or len(devices) == self.size
+        )
+
+    def __eq__(self, other: object) -> bool:
+        # Derived entirely from ``devices``, which pydantic already compares,
+        # so an index never makes two responses unequal
+        return isinstance(other, _DeviceIndex)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
 class DeviceDetailResponse(BaseModel):
     """
     Response model for the ``Command=DeviceList`` API endpoint.
@@ -773,108 +1123,240 @@ class DeviceDetailResponse(BaseModel):
 
     The response includes convenience properties to easily access specific
     device types (pvs, inverters, production_meter, consumption_meter) without
-    having to filter the devices list manually.
+    having to filter the devices list manually.  They, :py:meth:`by_serial`
+    and :py:meth:`children` are answered from indexes built once, when the
+    response is created, instead of scanning the devices on every call.
     """
 
     #: The devices
-    devices: list[DeviceClass] | None = None
+    devices: list[Device] | None = None
     #: The result
     result: str = Field(..., examples=["success"])
+    #: Records with an unknown ``DEVICE_TYPE``, set aside by
+    #: ``new(obj, tolerant=True)``
+    unknown_devices: list[UnknownDevice] = Field(default_factory=list)
+    #: Records that failed validation, set aside by ``new(obj, tolerant=True)``
+    invalid_devices: list[DeviceParseError] = Field(default_factory=list)
+
+    #: Lookup tables over :py:attr:`devices`
+    _index: _DeviceIndex = PrivateAttr(default_factory=lambda: _DeviceIndex(None))
+
+    def model_post_init(self, context: Any, /) -> None:  # noqa: ARG002
+        """Build the lookup tables over :py:attr:`devices`."""
+        self._index = _DeviceIndex(self.devices)
+
+    def _indexed(self) -> _DeviceIndex:
+        """
+        Return the indexes over :py:attr:`devices`, rebuilding them if the
+        list has been replaced or resized since they were built.
+        """
+        # Read straight from the private storage; ``self._index`` goes through
+        # pydantic's much slower ``__getattr__``
+        index = self.__pydantic_private__["_index"]
+        if not index.is_current(self.devices):
+            index = self._index = _DeviceIndex(self.devices)
+        return index
+
+    def _only(self, model_class: type, what: str) -> Any:
+        """
+        Return the one device of ``model_class``, or ``None`` if there is none.
+
+        Raises:
+            ValueError: If there is more than one
+
+        """
+        devices = self._indexed().of_type(model_class)
+        if not devices:
+            return None
+        if len(devices) > 1:
+            msg = f"Multiple {what} found"
+            raise ValueError(msg)
+        return devices[0]
+
+    def by_type(self, model_class: type[BaseDeviceDetail]) -> list[DeviceClass]:
+        """
+        Return the devices of one type.
+
+        Args:
+            model_class: The device model, such as
+                :py:class:`SolarBridgeDeviceDetail`.  Devices of its
+                subclasses are included.
+
+        Returns:
+            The devices, in the order the PVS listed them
+
+        """
+        return list(self._indexed().of_type(model_class))
+
+    def by_serial(self, serial: str) -> DeviceClass | None:
+        """
+        Return the device with a serial number.
+
+        Args:
+            serial: The serial number
+
+        Returns:
+            The device (the first one listed, if several share the serial
+            number), or ``None`` if there is none
+
+        """
+        return self._indexed().by_serial.get(serial)
+
+    def children(self, serial: str) -> list[DeviceClass]:
+        """
+        Return the devices that belong to another device.
+
+        The storage devices (storage inverters, BMS units and batteries) name
+        their Energy Storage System in their ``PARENT`` field.
+
+        Args:
+            serial: The serial number of the parent device
+
+        Returns:
+            The devices whose ``PARENT`` is ``serial``, in the order the PVS
+            listed them
+
+        """
+        return list(self._indexed().children(serial))
 
     @classmethod
-    def new(cls, obj: dict) -> "DeviceDetailResponse":  # noqa: PLR0912
+    def new(cls, obj: dict, tolerant: bool = False) -> "DeviceDetailResponse":
         """
         Custom parsing to handle different device types from the
         payload returned by the PVS6 API for Command=DeviceList.
+
+        The whole ``devices`` array is validated in a single call, with
+        :py:func:`device_tag` picking the model for each record.  Power meters
+        that are neither production nor consumption meters are skipped.
+
+        With ``tolerant=True``, a bad record doesn't fail the response: every
+        valid device is kept in :py:attr:`devices`, and the other records are
+        described in :py:attr:`unknown_devices` and :py:attr:`invalid_devices`.
+        Responses with no bad records cost the same as before.
+
+        Args:
+            obj: The decoded response body
+
+        Keyword Args:
+            tolerant: Set aside bad device records instead of raising
+
+        Raises:
+            ValueError: If a device has an unknown ``DEVICE_TYPE``, and
+                ``tolerant`` is ``False``
+            pydantic.ValidationError: If a device record is invalid, and
+                ``tolerant`` is ``False``
+
+        Returns:
+            The response
+
+        """
+        records = [
+            device
+            for device in obj.get("devices") or []
+            if not _is_unclassified_meter(device)
+        ]
+        try:
+            devices = _DEVICES.validate_python(records)
+        except ValidationError as e:
+            if tolerant:
+                return cls._salvage(obj, records, e)
+            unknown = _unknown_device_type(e)
+            if unknown is None:
+                raise
+            raise unknown from e
+        return cls(devices=devices, result=obj.get("result", "unknown"))
+
+    @classmethod
+    def _salvage(
+        cls, obj: dict, records: list, error: ValidationError
+    ) -> "DeviceDetailResponse":
         """
-        devices: list[DeviceClass] = []
-        if "devices" in obj:
-            for device in obj["devices"]:
-                device_type = device.get("DEVICE_TYPE")
-                if device_type == "PVS":
-                    devices.append(PVSDeviceDetail(**device))
-                elif device_type == "Power Meter":
-                    if "production_subtype_enum" in device:
-                        devices.append(ProductionPowerMeterDeviceDetail(**device))
-                    elif "consumption_subtype_enum" in device:
-                        devices.append(ConsumptionPowerMeterDeviceDetail(**device))
-                elif device_type == "Inverter":
-                    devices.append(SolarBridgeDeviceDetail(**device))
-                elif device_type == "PV Disconnect":
-                    devices.append(PVDisconnectDetail(**device))
-                elif device_type == "Gateway":
-                    devices.append(Gateway(**device))
-                elif device_type == "Storage Inverter":
-                    devices.append(SchneiderXwPro(**device))
-                elif device_type == "ESS BMS":
-                    devices.append(EquinioxBMS(**device))
-                elif device_type == "Battery":
-                    devices.append(Battery(**device))
-                elif device_type == "Energy Storage System":
-                    devices.append(EquinoxESS(**device))
-                else:
-                    msg = f"Unknown device type: {device_type}"
-                    raise ValueError(msg)
-        return DeviceDetailResponse(
-            devices=devices, result=obj.get("result", "unknown")
+        Build the response from the records that did validate.
+
+        Args:
+            obj: The decoded response body
+            records: The records that were validated, without the unclassified
+                power meters
+            error: The error raised while validating ``records``
+
+        Returns:
+            The response, with the bad records set aside
+
+        """
+        details: dict[int, list[ErrorDetails]] = {}
+        for detail in error.errors(include_url=False):
+            details.setdefault(detail["loc"][0], []).append(detail)  # type: ignore[arg-type]
+        # Where each of ``records`` is in the original ``devices`` array
+        positions = [
+            i
+            for i, device in enumerate(obj.get("devices") or [])
+            if not _is_unclassified_meter(device)
+        ]
+        unknown: list[UnknownDevice] = []
+        invalid: list[DeviceParseError] = []
+        for i, record_details in sorted(details.items()):
+            rejected = _rejected_device(positions[i], records[i], record_details)
+            if isinstance(rejected, UnknownDevice):
+                unknown.append(rejected)
+            else:
+                invalid.append(rejected)
+        # Each record validates independently, so the rest can't fail now
+        good = [record for i, record in enumerate(records) if i not in details]
+        return cls(
+            devices=_DEVICES.validate_python(good),
+            result=obj.get("result", "unknown"),
+            unknown_devices=unknown,
+            invalid_devices=invalid,
         )
 
+    @staticmethod
+    def parse_device(device: dict) -> DeviceClass | None:
+        """
+        Build the right device model for one entry of the ``devices`` array.
+
+        Args:
+            device: One decoded device record
+
+        Raises:
+            ValueError: If ``DEVICE_TYPE`` is not a known device type
+            pydantic.ValidationError: If the record is invalid
+
+        Returns:
+            The device model, or ``None`` for power meters that are neither
+            production nor consumption meters
+
+        """
+        if _is_unclassified_meter(device):
+            return None
+        try:
+            return _DEVICE.validate_python(device)
+        except ValidationError as e:
+            unknown = _unknown_device_type(e)
+            if unknown is None:
+                raise
+            raise unknown from e
+
+    @property
+    def rejected_count(self) -> int:
+        """Return how many device records were set aside as unknown or invalid."""
+        return len(self.unknown_devices) + len(self.invalid_devices)
+
     @property
     def pvs(self) -> PVSDeviceDetail | None:
         """Return The PVS device, or None if not found."""
-        if self.devices is None:
-            return None
-        pvs_devices = [
-            device for device in self.devices if isinstance(device, PVSDeviceDetail)
-        ]
-        if not pvs_devices:
-            return None
-        if len(pvs_devices) > 1:
-            msg = "Multiple PVS devices found"
-            raise ValueError(msg)
-        return pvs_devices[0]
+        return self._only(PVSDeviceDetail, "PVS devices")
 
     @property
     def inverters(self) -> list[SolarBridgeDeviceDetail]:
         """Return a list of inverters (SolarBridge devices)"""
-        if self.devices is None:
-            return []
-        return [
-            device
-            for device in self.devices
-            if isinstance(device, SolarBridgeDeviceDetail)
-        ]
+        return list(self._indexed().of_type(SolarBridgeDeviceDetail))
 
     @property
     def production_meter(self) -> ProductionPowerMeterDeviceDetail | None:
         """Return a list of production power meters, or None if not found."""
-        if self.devices is None:
-            return None
-        meters = [
-            device
-            for device in self.devices
-            if isinstance(device, ProductionPowerMeterDeviceDetail)
-        ]
-        if not meters:
-            return None
-        if len(meters) > 1:
-            msg = "Multiple production power meters found"
-            raise ValueError(msg)
-        return meters[0]
+        return self._only(ProductionPowerMeterDeviceDetail, "production power meters")
 
     @property
     def consumption_meter(self) -> ConsumptionPowerMeterDeviceDetail | None:
         """Return a list of consumption power meters, or None if not found."""
-        if self.devices is None:
-            return None
-        meters = [
-            device
-            for device in self.devices
-            if isinstance(device, ConsumptionPowerMeterDeviceDetail)
-        ]
-        if not meters:
-            return None
-        if len(meters) > 1:
-            msg = "Multiple consumption power meters found"
-            raise ValueError(msg)
-        return meters[0]
+        return self._only(ConsumptionPowerMeterDeviceDetail, "consumption power meters")
@@ -1,8 +1,9 @@
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, Field, field_validator
 
+from .timestamps import parse_epoch_timestamp
+
 
 class Zipcode(BaseModel):
     """
@@ -101,10 +102,10 @@ class GridProfileRefreshResponse(BaseModel):
             try:
                 # Convert to integer if it's a string
                 timestamp = int(v) if isinstance(v, str) else v
-                return datetime.fromtimestamp(timestamp, tz=ZoneInfo("UTC"))
-            except (ValueError, OSError) as e:
+            except ValueError as e:
                 msg = f"Invalid Unix timestamp: {v}"
                 raise ValueError(msg) from e
+            return parse_epoch_timestamp(timestamp)
 
         msg = f"Invalid value type for timestamp: {type(v)}"
         raise ValueError(msg)
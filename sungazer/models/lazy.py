@@ -0,0 +1,324 @@
+from collections.abc import Callable
+from typing import Annotated, Any
+
+from pydantic import (
+    AfterValidator,
+    AliasChoices,
+    BeforeValidator,
+    PlainValidator,
+    TypeAdapter,
+    WrapValidator,
+)
+from pydantic.fields import FieldInfo
+
+from .devices import (
+    BaseDeviceDetail,
+    ConsumptionPowerMeterDeviceDetail,
+    DeviceDetailResponse,
+    ProductionPowerMeterDeviceDetail,
+    PVSDeviceDetail,
+    SolarBridgeDeviceDetail,
+    UnknownDevice,
+    device_model,
+)
+
+#: The wrapper for each ``@field_validator`` mode
+_VALIDATOR_MODES = {
+    "before": BeforeValidator,
+    "after": AfterValidator,
+    "plain": PlainValidator,
+    "wrap": WrapValidator,
+}
+
+#: For each model, the keys in the raw record, the validator and the definition
+#: of each field that has been read so far
+_FIELD_SPECS: dict[
+    type[BaseDeviceDetail],
+    dict[str, tuple[tuple[str, ...], Callable[[Any], Any], FieldInfo]],
+] = {}
+
+
+def _raw_keys(name: str, field: FieldInfo) -> tuple[str, ...]:
+    """
+    Return the keys a field may have in a raw record, in order of preference.
+
+    Args:
+        name: The name of the field
+        field: The definition of the field
+
+    Returns:
+        The keys the model would validate the field from
+
+    """
+    if isinstance(field.validation_alias, AliasChoices):
+        return tuple(
+            choice
+            for choice in field.validation_alias.choices
+            if isinstance(choice, str)
+        )
+    if isinstance(field.validation_alias, str):
+        return (field.validation_alias,)
+    return (field.alias or name,)
+
+
+def _field_spec(
+    model: type[BaseDeviceDetail], name: str
+) -> tuple[tuple[str, ...], Callable[[Any], Any], FieldInfo] | None:
+    """
+    Return how to read one field of ``model`` from a raw record.
+
+    The validator applies the field's type and constraints and the model's
+    ``@field_validator`` functions for the field, just as validating the whole
+    model would.
+
+    Args:
+        model: The model class
+        name: The name of the field
+
+    Returns:
+        The keys of the field in the raw record, its validator and its
+        definition, or ``None`` if ``model`` has no such field
+
+    """
+    specs = _FIELD_SPECS.setdefault(model, {})
+    spec = specs.get(name)
+    if spec is None:
+        field = model.model_fields.get(name)
+        if field is None:
+            return None
+        validators = [
+            _VALIDATOR_MODES[decorator.info.mode](decorator.func)
+            for decorator in model.__pydantic_decorators__.field_validators.values()
+            if name in decorator.info.fields or "*" in decorator.info.fields
+        ]
+        extras = (*field.metadata, *validators)
+        annotation = (
+            Annotated[(field.annotation, *extras)]  # type: ignore[valid-type]
+            if extras
+            else field.annotation
+        )
+        spec = (
+            _raw_keys(name, field),
+            TypeAdapter(annotation).validator.validate_python,
+            field,
+        )
+        specs[name] = spec
+    return spec
+
+
+class LazyDevice:
+    """
+    A read-only view of one device record that validates fields on first use.
+
+    Reading a field of the model validates just that value from the raw
+    record, with the same rules as the full model, and caches the result, so
+    fields that are never read cost nothing.  Properties of the model (such as
+    :py:attr:`~sungazer.models.PVSDeviceDetail.last_restart_time`) work too.
+    Use :py:meth:`to_model` to get the fully validated model.
+
+    Args:
+        raw: The decoded device record
+        model_class: The device model the record validates to
+
+    """
+
+    def __init__(self, raw: dict[str, Any], model_class: type[BaseDeviceDetail]):
+        self.__dict__["_raw"] = raw
+        self.__dict__["_model_class"] = model_class
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        """The decoded device record."""
+        return self._raw
+
+    @property
+    def model_class(self) -> type[BaseDeviceDetail]:
+        """The device model the record validates to."""
+        return self._model_class
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when ``name`` isn't in the instance __dict__ yet, so each
+        # field is validated once and then read like a plain attribute
+        if name.startswith("_"):
+            # Not set up yet (copy and pickle make instances without __init__)
+            raise AttributeError(name)
+        model_class = self._model_class
+        spec = _field_spec(model_class, name)
+        if spec is None:
+            attr = getattr(model_class, name, None)
+            if isinstance(attr, property) and attr.fget is not None:
+                return attr.fget(self)
+            msg = f"{model_class.__name__!r} has no field {name!r}"
+            raise AttributeError(msg)
+        keys, validate, field = spec
+        raw = self._raw
+        for key in keys:
+            if key in raw:
+                value = validate(raw[key])
+                break
+        else:
+            value = field.get_default(call_default_factory=True)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        msg = "LazyDevice views are read-only"
+        raise AttributeError(msg)
+
+    def __repr__(self) -> str:
+        return f"<LazyDevice {self._model_class.__name__} {self._raw.get('SERIAL')}>"
+
+    def to_model(self) -> BaseDeviceDetail:
+        """
+        Validate the whole record.
+
+        Raises:
+            pydantic.ValidationError: If the record is invalid
+
+        Returns:
+            The device model
+
+        """
+        return self._model_class.model_validate(self._raw)
+
+
+class LazyDeviceDetailResponse:
+    """
+    A ``Command=DeviceList`` response whose devices are :py:class:`LazyDevice`
+    views.
+
+    It has the same convenience properties as
+    :py:class:`~sungazer.models.DeviceDetailResponse`, and
+    :py:meth:`to_model` builds that fully validated response.
+
+    Args:
+        devices: The device views
+        result: The result
+
+    Keyword Args:
+        unknown_devices: The records of unknown device type that were set
+            aside
+
+    """
+
+    def __init__(
+        self,
+        devices: list[LazyDevice],
+        result: str,
+        unknown_devices: list[UnknownDevice] | None = None,
+    ):
+        #: The devices
+        self.devices = devices
+        #: The result
+        self.result = result
+        #: Records with an unknown ``DEVICE_TYPE``, set aside by
+        #: ``new(obj, tolerant=True)``
+        self.unknown_devices = unknown_devices or []
+
+    @classmethod
+    def new(cls, obj: dict, tolerant: bool = False) -> "LazyDeviceDetailResponse":
+        """
+        Wrap a decoded ``Command=DeviceList`` body without validating it.
+
+        Only ``DEVICE_TYPE`` (and the power meter subtype fields) are looked
+        at, to pick each device's model.  Power meters that are neither
+        production nor consumption meters are skipped, as in
+        :py:meth:`~sungazer.models.DeviceDetailResponse.new`.
+
+        Args:
+            obj: The decoded response body
+
+        Keyword Args:
+            tolerant: Set aside records of unknown device type in
+                :py:attr:`unknown_devices` instead of raising.  Invalid field
+                values still only raise when they are read.
+
+        Raises:
+            ValueError: If a device has an unknown ``DEVICE_TYPE``, and
+                ``tolerant`` is ``False``
+
+        Returns:
+            The response
+
+        """
+        devices = []
+        unknown = []
+        for index, device in enumerate(obj.get("devices") or []):
+            try:
+                model_class = device_model(device)
+            except ValueError:
+                if not tolerant:
+                    raise
+                fields = device if isinstance(device, dict) else {}
+                unknown.append(
+                    UnknownDevice(
+                        index=index,
+                        DEVICE_TYPE=fields.get("DEVICE_TYPE"),
+                        SERIAL=fields.get("SERIAL"),
+                        raw=device,
+                    )
+                )
+                continue
+            if model_class is not None:
+                devices.append(LazyDevice(device, model_class))
+        return cls(
+            devices=devices,
+            result=obj.get("result", "unknown"),
+            unknown_devices=unknown,
+        )
+
+    @property
+    def rejected_count(self) -> int:
+        """Return how many device records were set aside as of unknown type."""
+        return len(self.unknown_devices)
+
+    def to_model(self) -> DeviceDetailResponse:
+        """
+        Validate every device.
+
+        Raises:
+            pydantic.ValidationError: If a device record is invalid
+
+        Returns:
+            The fully validated response
+
+        """
+        response = DeviceDetailResponse.new(
+            {"devices": [device.raw for device in self.devices], "result": self.result}
+        )
+        response.unknown_devices = list(self.unknown_devices)
+        return response
+
+    def _of_type(self, model_class: type[BaseDeviceDetail]) -> list[LazyDevice]:
+        return [device for device in self.devices if device.model_class is model_class]
+
+    def _only(
+        self, model_class: type[BaseDeviceDetail], what: str
+    ) -> LazyDevice | None:
+        devices = self._of_type(model_class)
+        if not devices:
+            return None
+        if len(devices) > 1:
+            msg = f"Multiple {what} found"
+            raise ValueError(msg)
+        return devices[0]
+
+    @property
+    def pvs(self) -> LazyDevice | None:
+        """Return the PVS device, or None if not found."""
+        return self._only(PVSDeviceDetail, "PVS devices")
+
+    @property
+    def inverters(self) -> list[LazyDevice]:
+        """Return a list of inverters (SolarBridge devices)"""
+        return self._of_type(SolarBridgeDeviceDetail)
+
+    @property
+    def production_meter(self) -> LazyDevice | None:
+        """Return the production power meter, or None if not found."""
+        return self._only(ProductionPowerMeterDeviceDetail, "production power meters")
+
+    @property
+    def consumption_meter(self) -> LazyDevice | None:
+        """Return the consumption power meter, or None if not found."""
+        return self._only(ConsumptionPowerMeterDeviceDetail, "consumption power meters")
@@ -0,0 +1,78 @@
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+#: UTC, which every PVS6 timestamp is in; looked up once
+UTC = ZoneInfo("UTC")
+
+
+@lru_cache(maxsize=2048)
+def parse_pvs_timestamp(value: str) -> datetime:
+    """
+    Parse a PVS6 comma-separated timestamp such as ``"2025,06,22,00,15,54"``.
+
+    Every device in a ``Command=DeviceList`` response carries one or two of
+    these, and most of them repeat across devices and polls, so results are
+    kept in a bounded LRU cache.  :py:class:`~datetime.datetime` objects are
+    immutable, so sharing them is safe.
+
+    Args:
+        value: The timestamp, in UTC
+
+    Raises:
+        ValueError: If ``value`` is not a valid PVS6 timestamp
+
+    Returns:
+        The timezone-aware timestamp
+
+    """
+    parts = value.split(",")
+    if len(parts) == 6:
+        try:
+            year, month, day, hour, minute, second = map(int, parts)
+            return datetime(year, month, day, hour, minute, second, tzinfo=UTC)
+        except (ValueError, TypeError):
+            pass
+    msg = f"Invalid datetime value: {value}"
+    raise ValueError(msg)
+
+
+@lru_cache(maxsize=256)
+def parse_epoch_timestamp(value: int) -> datetime:
+    """
+    Convert a Unix epoch timestamp to a UTC datetime, with a bounded LRU cache.
+
+    Args:
+        value: Seconds since the epoch
+
+    Raises:
+        ValueError: If ``value`` is out of range for a datetime
+
+    Returns:
+        The timezone-aware timestamp
+
+    """
+    try:
+        return datetime.fromtimestamp(value, tz=UTC)
+    except (ValueError, OSError, OverflowError) as e:
+        msg = f"Invalid Unix timestamp: {value}"
+        raise ValueError(msg) from e
+
+
+def epoch_seconds(value: datetime | float | None) -> int | None:
+    """
+    Convert a timestamp to whole seconds since the epoch.
+
+    Args:
+        value: A datetime, or a number of seconds since the epoch
+
+    Returns:
+        The seconds since the epoch, truncated to an integer, or ``None`` if
+        ``value`` is ``None``
+
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(value.timestamp())
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from .models import PVSDeviceDetail
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket for one PVS6 whose rate follows the load the unit reports.
+
+    Every request sent to the device first takes a token; tokens refill at
+    :py:attr:`rate` per second up to ``burst``.  Each ``Command=DeviceList``
+    response includes the supervisor's own health figures, and
+    :py:meth:`observe` uses them to adjust the rate:
+
+    * If ``dl_skipped_scans`` went up since the last sample, or
+      ``dl_cpu_load``, ``dl_scan_time`` or ``dl_mem_used`` is at or above its
+      high-water mark, the unit is struggling and the rate is multiplied by
+      ``decrease_factor``.
+    * If none of that is true and ``dl_cpu_load`` is at or below ``cpu_idle``,
+      the unit has headroom and the rate grows by ``increase_step``.
+    * Otherwise the rate is left alone.
+
+    The rate always stays between ``min_rate`` and ``max_rate``.  Samples
+    with the same ``CURTIME`` as the previous one (e.g. a shared or cached
+    response) are ignored, so a single reading is only acted on once.
+
+    This limiter is thread-safe, and may be shared by the sync and async
+    clients for the same device.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = 0.2,
+        min_rate: float = 0.01,
+        max_rate: float = 1.0,
+        burst: float = 1,
+        cpu_high: float = 1.0,
+        cpu_idle: float = 0.5,
+        scan_time_high: float | None = 60,
+        mem_high: float | None = None,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.05,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter.
+
+        Keyword Args:
+            rate: The starting rate, in requests per second
+            min_rate: The slowest the rate may fall to
+            max_rate: The fastest the rate may rise to
+            burst: How many requests may be sent back to back after an idle
+                spell
+            cpu_high: The ``dl_cpu_load`` at which to back off
+            cpu_idle: The ``dl_cpu_load`` at or below which to speed up
+            scan_time_high: The ``dl_scan_time`` at which to back off, or
+                ``None`` to ignore scan time
+            mem_high: The ``dl_mem_used`` at which to back off, or ``None`` to
+                ignore memory use
+            decrease_factor: What to multiply the rate by when backing off
+            increase_step: How much to add to the rate when speeding up
+            sleep: The function used to wait for a token in synchronous code
+            clock: The monotonic clock tokens refill against
+
+        Raises:
+            ValueError: If the rates are not ordered
+                ``0 < min_rate <= rate <= max_rate``, ``burst`` is less than
+                1, or ``decrease_factor`` is not between 0 and 1
+
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            msg = (
+                "rates must satisfy 0 < min_rate <= rate <= max_rate, got "
+                f"{min_rate}, {rate}, {max_rate}"
+            )
+            raise ValueError(msg)
+        if burst < 1:
+            msg = f"burst must be at least 1, got {burst}"
+            raise ValueError(msg)
+        if not 0 < decrease_factor < 1:
+            msg = f"decrease_factor must be between 0 and 1, got {decrease_factor}"
+            raise ValueError(msg)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.cpu_high = cpu_high
+        self.cpu_idle = cpu_idle
+        self.scan_time_high = scan_time_high
+        self.mem_high = mem_high
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.sleep = sleep
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._tokens = burst
+        self._updated = clock()
+        self._last_skipped: int | None = None
+        self._last_sample: datetime | None = None
+        #: How many times the rate was lowered
+        self.decreases: int = 0
+        #: How many times the rate was raised
+        self.increases: int = 0
+
+    @property
+    def rate(self) -> float:
+        """The current allowed rate, in requests per second."""
+        with self._lock:
+            return self._rate
+
+    def _reserve(self) -> float:
+        """
+        Take a token, returning how many seconds to wait before using it.
+
+        The bucket may go into debt, so that callers are served in the order
+        they asked even while they wait outside the lock.
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            self.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """
+        Wait until a request may be sent, without blocking the event loop.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _overloaded(self, pvs: PVSDeviceDetail) -> bool:
+        """
+        Return ``True`` if ``pvs`` reports that the unit is struggling.
+
+        The caller must hold :py:attr:`_lock`.
+        """
+        skipped = pvs.dl_skipped_scans
+        skipping = (
+            skipped is not None
+            and self._last_skipped is not None
+            and skipped > self._last_skipped
+        )
+        if skipped is not None:
+            self._last_skipped = skipped
+        return (
+            skipping
+            or (pvs.dl_cpu_load is not None and pvs.dl_cpu_load >= self.cpu_high)
+            or (
+                self.scan_time_high is not None
+                and pvs.dl_scan_time is not None
+                and pvs.dl_scan_time >= self.scan_time_high
+            )
+            or (
+                self.mem_high is not None
+                and pvs.dl_mem_used is not None
+                and pvs.dl_mem_used >= self.mem_high
+            )
+        )
+
+    def observe(self, pvs: PVSDeviceDetail) -> float:
+        """
+        Adjust the rate from the health figures the PVS6 reported.
+
+        Args:
+            pvs: The PVS record from a ``Command=DeviceList`` response
+
+        Returns:
+            The new rate, in requests per second
+
+        """
+        with self._lock:
+            if pvs.CURTIME is not None:
+                if self._last_sample == pvs.CURTIME:
+                    return self._rate
+                self._last_sample = pvs.CURTIME
+            if self._overloaded(pvs):
+                rate = max(self.min_rate, self._rate * self.decrease_factor)
+                if rate < self._rate:
+                    self.decreases += 1
+            elif pvs.dl_cpu_load is not None and pvs.dl_cpu_load <= self.cpu_idle:
+                rate = min(self.max_rate, self._rate + self.increase_step)
+                if rate > self._rate:
+                    self.increases += 1
+            else:
+                rate = self._rate
+            self._rate = rate
+            return rate
+
+
+class RateLimiterRegistry:
+    """
+    Hand out one :py:class:`AdaptiveRateLimiter` per device base URL.
+
+    Keep a single registry for a fleet so that the rate learned for each PVS6
+    survives from one sweep to the next.
+    """
+
+    def __init__(self, **limiter_kwargs):
+        """
+        Initialize the registry.
+
+        Keyword Args:
+            **limiter_kwargs: Passed to each new :py:class:`AdaptiveRateLimiter`
+
+        """
+        self.limiter_kwargs = limiter_kwargs
+        self._lock = threading.Lock()
+        self._limiters: dict[str, AdaptiveRateLimiter] = {}
+
+    def get(self, base_url: str) -> AdaptiveRateLimiter:
+        """
+        Return the limiter for ``base_url``, creating it if needed.
+
+        Args:
+            base_url: The base URL of the device's API
+
+        """
+        with self._lock:
+            limiter = self._limiters.get(base_url)
+            if limiter is None:
+                limiter = AdaptiveRateLimiter(**self.limiter_kwargs)
+                self._limiters[base_url] = limiter
+            return limiter
+
+    def rates(self) -> dict[str, float]:
+        """
+        Return the current rate for every device, for monitoring.
+
+        Returns:
+            A mapping of base URL to requests per second
+
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {base_url: limiter.rate for base_url, limiter in limiters.items()}
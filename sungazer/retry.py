@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+#: Commands that only read from the PVS6, and so are safe to send again.
+#: State-changing commands (``Start``, ``Stop``, ``GridProfileRefresh``) are
+#: only retried if you add them explicitly.
+IDEMPOTENT_COMMANDS: frozenset[str] = frozenset(
+    {"DeviceList", "Get_Comm", "CheckFW", "GridProfileGet"}
+)
+
+#: HTTP status codes the PVS6 returns transiently, e.g. during PLC scans
+RETRY_STATUS_CODES: frozenset[int] = frozenset({500, 502, 503, 504})
+
+#: Exceptions that indicate a transient transport failure: connection resets,
+#: refused connections, timeouts and the like
+RETRY_EXCEPTIONS: tuple[type[BaseException], ...] = (httpx.TransportError,)
+
+
+class RetryPolicy:
+    """
+    Decide whether, when and how often to resend a failed request.
+
+    An attempt is retried if it raised one of ``retry_on_exceptions`` or
+    returned a status code in ``retry_on_status``, and the request's
+    ``Command`` is in ``commands``.  Between attempts the policy sleeps for an
+    exponentially growing delay (``backoff``, ``2 * backoff``, ``4 *
+    backoff``, ... capped at ``max_backoff``), with up to ``jitter`` of each
+    delay randomised away so that many clients don't retry in lockstep.
+
+    No more than ``max_attempts`` attempts are made, and no retry is started
+    if it could not begin before ``budget`` seconds have passed since the
+    first attempt.  When retries run out, the last response is returned (so
+    that the caller's usual error handling sees it) or the last exception is
+    raised.
+
+    Example:
+        .. code-block:: python
+
+            from sungazer.client import SungazerClient
+            from sungazer.retry import IDEMPOTENT_COMMANDS, RetryPolicy
+
+            # Retry reads only
+            client = SungazerClient(retry=RetryPolicy(max_attempts=4))
+
+            # Also retry Start
+            policy = RetryPolicy(commands=IDEMPOTENT_COMMANDS | {"Start"})
+
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        jitter: float = 0.5,
+        budget: float | None = 60.0,
+        retry_on_status: Iterable[int] = RETRY_STATUS_CODES,
+        retry_on_exceptions: Iterable[type[BaseException]] = RETRY_EXCEPTIONS,
+        commands: Iterable[str] = IDEMPOTENT_COMMANDS,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize the policy.
+
+        Keyword Args:
+            max_attempts: The maximum number of attempts, including the first
+            backoff: The delay in seconds before the first retry
+            max_backoff: The longest delay in seconds between attempts
+            jitter: The fraction (0-1) of each delay that is randomised
+            budget: The maximum number of seconds to spend on one call,
+                or ``None`` for no limit
+            retry_on_status: Status codes that trigger a retry
+            retry_on_exceptions: Exception types that trigger a retry
+            commands: The ``Command`` names that may be retried
+            sleep: The function used to wait between synchronous attempts
+            clock: The monotonic clock the budget is measured against
+            rng: Returns a random float in ``[0, 1)`` for jitter
+
+        Raises:
+            ValueError: If ``max_attempts`` is less than 1 or ``jitter`` is
+                not between 0 and 1
+
+        """
+        if max_attempts < 1:
+            msg = f"max_attempts must be at least 1, got {max_attempts}"
+            raise ValueError(msg)
+        if not 0 <= jitter <= 1:
+            msg = f"jitter must be between 0 and 1, got {jitter}"
+            raise ValueError(msg)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_on_exceptions = tuple(retry_on_exceptions)
+        self.commands = frozenset(commands)
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng
+
+    def should_retry(self, command: str | None) -> bool:
+        """
+        Return ``True`` if requests for ``command`` may be retried.
+
+        Args:
+            command: The ``Command`` name of the request
+
+        """
+        return command in self.commands
+
+    def delay(self, attempt: int) -> float:
+        """
+        Return how long to wait after failed attempt number ``attempt``.
+
+        Args:
+            attempt: The 1-based number of the attempt that just failed
+
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * self.rng())
+
+    def _next_delay(self, attempt: int, started: float) -> float | None:
+        """
+        Return the delay before the next attempt, or ``None`` to give up.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.delay(attempt)
+        if self.budget is not None and (self.clock() - started + delay >= self.budget):
+            return None
+        return delay
+
+    def call(
+        self, send: Callable[[], httpx.Response], command: str | None = None
+    ) -> httpx.Response:
+        """
+        Call ``send`` until it succeeds or the policy gives up.
+
+        Args:
+            send: Sends the request and returns the response
+            command: The ``Command`` name of the request
+
+        Raises:
+            Exception: The last exception raised by ``send``, if retries ran
+                out or the exception isn't retryable
+
+        Returns:
+            The first response that doesn't call for a retry, or the last
+            response if retries ran out
+
+        """
+        if not self.should_retry(command):
+            return send()
+        started = self.clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = send()
+            except self.retry_on_exceptions:
+                delay = self._next_delay(attempt, started)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.retry_on_status:
+                    return response
+                delay = self._next_delay(attempt, started)
+                if delay is None:
+                    return response
+            self.sleep(delay)
+
+    async def acall(
+        self,
+        send: Callable[[], Awaitable[httpx.Response]],
+        command: str | None = None,
+    ) -> httpx.Response:
+        """
+        Await ``send()`` until it succeeds or the policy gives up.
+
+        This is the asyncio counterpart of :py:meth:`call`; it waits between
+        attempts with :py:func:`asyncio.sleep`.
+
+        Args:
+            send: Returns an awaitable that sends the request
+            command: The ``Command`` name of the request
+
+        Raises:
+            Exception: The last exception raised by ``send``, if retries ran
+                out or the exception isn't retryable
+
+        Returns:
+            The first response that doesn't call for a retry, or the last
+            response if retries ran out
+
+        """
+        if not self.should_retry(command):
+            return await send()
+        started = self.clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await send()
+            except self.retry_on_exceptions:
+                delay = self._next_delay(attempt, started)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.retry_on_status:
+                    return response
+                delay = self._next_delay(attempt, started)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
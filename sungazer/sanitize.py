@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+
+#: The opening brace of the JSON document: either the first non-blank byte of
+#: the body, or the first ``{`` that begins a line
+_DOCUMENT_START = re.compile(rb"\A[ \t\r\n]*(\{)|\n(\{)")
+
+
+def json_bounds(content: bytes) -> tuple[int, int] | None:
+    """
+    Find the JSON document in a response body.
+
+    The PVS6 sometimes sends HTTP headers inside the body, before the JSON.
+    The document is taken to start at the first ``{`` that is either the first
+    non-blank byte of the body or the first byte of a line, and to end at the
+    last ``}`` in the body.  Only those two searches touch the bytes; nothing
+    is decoded or copied.
+
+    Args:
+        content: The raw response body
+
+    Returns:
+        The ``(start, end)`` slice indexes of the document, or ``None`` if
+        there is no JSON object in ``content``
+
+    """
+    match = _DOCUMENT_START.search(content)
+    if match is None:
+        return None
+    start = match.start(1) if match.start(1) >= 0 else match.start(2)
+    end = content.rfind(b"}") + 1
+    if end <= start:
+        return None
+    return start, end
+
+
+def sanitize(content: bytes) -> bytes:
+    """
+    Strip anything that isn't part of the JSON document from a response body.
+
+    A clean body (a JSON object with at most surrounding whitespace) is
+    returned as is, without copying.  Otherwise the document is sliced out
+    with :py:func:`json_bounds`.  Unlike the line filter this replaces, JSON
+    that isn't tab-indented is kept intact.
+
+    Args:
+        content: The raw response body
+
+    Returns:
+        The JSON document, or ``content`` unchanged if it holds no JSON
+        object (so that the JSON parser reports the error)
+
+    """
+    bounds = json_bounds(content)
+    if bounds is None:
+        return content
+    start, end = bounds
+    if (start == 0 or content[:start].isspace()) and (
+        end == len(content) or content[end:].isspace()
+    ):
+        return content
+    return content[start:end]
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from .models import DeviceDetailResponse
+
+
+class _Site:
+    """
+    What a :py:class:`PollScheduler` has learned about one site.
+    """
+
+    def __init__(self, history: int):
+        #: The last ``DATATIME`` seen for each device serial, as epoch seconds
+        self.datatimes: dict[str, float] = {}
+        #: Recent gaps between successive ``DATATIME`` values of a device
+        self.intervals: deque[float] = deque(maxlen=history)
+        #: The newest ``DATATIME`` seen, as epoch seconds
+        self.newest: float | None = None
+        #: Local clock minus device clock, in seconds
+        self.offset: float = 0.0
+        #: When this site was last polled, on the local clock
+        self.last_poll: float | None = None
+        #: When this site was first polled, on the local clock
+        self.first_poll: float | None = None
+        #: How many responses were recorded for this site
+        self.polls: int = 0
+        #: The latest time this site was polled or asked about
+        self.seen_until: float | None = None
+
+    def seen(self, now: float) -> None:
+        """
+        Extend :py:attr:`seen_until` to ``now``.
+        """
+        if self.seen_until is None or now > self.seen_until:
+            self.seen_until = now
+
+
+class PollScheduler:
+    """
+    Decide when each site's ``DeviceList`` is worth polling again.
+
+    Each device record carries ``DATATIME``, the time its data was sampled,
+    and ``CURTIME``, the device's clock when it answered.  From successive
+    ``DeviceList`` responses the scheduler learns how often each device's
+    data changes (the median gap between successive ``DATATIME`` values), how
+    far the device's clock is from ours, and when the newest sample was taken.
+    It then schedules the next poll for ``lag`` seconds after the next sample
+    is expected, so each poll picks up fresh data and none is skipped.
+
+    Until ``min_samples`` gaps have been seen, and whenever an expected
+    update is late, sites are polled every ``min_interval`` seconds.  Polls
+    are never scheduled more than ``max_interval`` seconds apart.
+
+    Sites are identified by any hashable key, usually the base URL.  This
+    scheduler is thread-safe.
+
+    Example:
+        .. code-block:: python
+
+            scheduler = PollScheduler(min_interval=10)
+            while True:
+                if scheduler.should_poll(url):
+                    scheduler.record(url, client.devices.list())
+                time.sleep(10)
+            print(scheduler.polls_saved)
+
+    """
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 10.0,
+        max_interval: float = 900.0,
+        lag: float = 2.0,
+        min_samples: int = 3,
+        history: int = 16,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the scheduler.
+
+        Keyword Args:
+            min_interval: The shortest gap between polls of a site, in
+                seconds; also the gap used while learning or when data is late
+            max_interval: The longest gap between polls of a site, in seconds
+            lag: Seconds to wait after an expected update before polling, to
+                give the device time to publish it
+            min_samples: How many ``DATATIME`` gaps to see before trusting
+                the learned cadence
+            history: How many recent gaps to learn the cadence from
+            clock: The wall clock, in epoch seconds
+
+        Raises:
+            ValueError: If the intervals are not ordered
+                ``0 < min_interval <= max_interval``, or ``min_samples`` or
+                ``history`` is less than 1
+
+        """
+        if not 0 < min_interval <= max_interval:
+            msg = (
+                "intervals must satisfy 0 < min_interval <= max_interval, got "
+                f"{min_interval}, {max_interval}"
+            )
+            raise ValueError(msg)
+        if min_samples < 1 or history < 1:
+            msg = (
+                "min_samples and history must be at least 1, got "
+                f"{min_samples}, {history}"
+            )
+            raise ValueError(msg)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.lag = lag
+        self.min_samples = min_samples
+        self.history = history
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sites: dict[Hashable, _Site] = {}
+        #: How many responses were recorded
+        self.polls_made: int = 0
+        #: How many recorded responses had no new data for any device
+        self.polls_unchanged: int = 0
+
+    @property
+    def polls_saved(self) -> int:
+        """
+        How many polls were skipped, compared to polling every site every
+        ``min_interval`` seconds.
+
+        For each site the baseline is one poll at its first recorded poll
+        and one per ``min_interval`` after it, up to the latest time the site
+        was polled or passed to :py:meth:`should_poll`.  This does not depend
+        on how often :py:meth:`should_poll` is called.
+        """
+        with self._lock:
+            saved = 0
+            for state in self._sites.values():
+                if state.first_poll is None or state.seen_until is None:
+                    continue
+                elapsed = state.seen_until - state.first_poll
+                baseline = int(elapsed // self.min_interval) + 1
+                saved += max(0, baseline - state.polls)
+            return saved
+
+    def _site(self, site: Hashable) -> _Site:
+        """
+        Return the state for ``site``, creating it if needed.
+
+        The caller must hold :py:attr:`_lock`.
+        """
+        state = self._sites.get(site)
+        if state is None:
+            state = _Site(self.history)
+            self._sites[site] = state
+        return state
+
+    def _cadence(self, state: _Site) -> float | None:
+        """
+        Return the learned cadence for ``state``, if there is enough history.
+        """
+        if len(state.intervals) < self.min_samples:
+            return None
+        return statistics.median(state.intervals)
+
+    def cadence(self, site: Hashable) -> float | None:
+        """
+        Return how often ``site``'s data changes, in seconds.
+
+        Args:
+            site: The site key
+
+        Returns:
+            The learned cadence, or ``None`` if it isn't known yet
+
+        """
+        with self._lock:
+            state = self._sites.get(site)
+            return None if state is None else self._cadence(state)
+
+    def record(
+        self,
+        site: Hashable,
+        response: DeviceDetailResponse,
+        now: float | None = None,
+    ) -> bool:
+        """
+        Learn from a ``DeviceList`` response polled from ``site``.
+
+        Args:
+            site: The site key
+            response: The response that was polled
+
+        Keyword Args:
+            now: When the response was received, in epoch seconds; defaults
+                to :py:attr:`clock`
+
+        Returns:
+            ``True`` if any device had new data since the previous poll
+
+        """
+        if now is None:
+            now = self.clock()
+        with self._lock:
+            state = self._site(site)
+            state.last_poll = now
+            if state.first_poll is None:
+                state.first_poll = now
+            state.polls += 1
+            state.seen(now)
+            self.polls_made += 1
+            changed = False
+            curtime: float | None = None
+            for device in response.devices or []:
+                if device.CURTIME is not None:
+                    curtime = max(curtime or 0.0, device.CURTIME.timestamp())
+                if device.SERIAL is None or device.DATATIME is None:
+                    continue
+                datatime = device.DATATIME.timestamp()
+                previous = state.datatimes.get(device.SERIAL)
+                if previous is None or datatime > previous:
+                    changed = True
+                    if previous is not None:
+                        state.intervals.append(datatime - previous)
+                state.datatimes[device.SERIAL] = datatime
+                if state.newest is None or datatime > state.newest:
+                    state.newest = datatime
+            if curtime is not None:
+                state.offset = now - curtime
+            if not changed:
+                self.polls_unchanged += 1
+            return changed
+
+    def next_poll_at(self, site: Hashable) -> float:
+        """
+        Return when ``site`` should next be polled.
+
+        Args:
+            site: The site key
+
+        Returns:
+            The time of the next poll, in epoch seconds; sites that have never
+            been polled are due immediately
+
+        """
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None or state.last_poll is None:
+                return float("-inf")
+            earliest = state.last_poll + self.min_interval
+            latest = state.last_poll + self.max_interval
+            cadence = self._cadence(state)
+            if cadence is None or state.newest is None:
+                return earliest
+            expected = state.newest + cadence + state.offset + self.lag
+            if expected <= state.last_poll:
+                # The update we were waiting for is late; check back soon
+                return earliest
+            return min(latest, max(earliest, expected))
+
+    def should_poll(self, site: Hashable, now: float | None = None) -> bool:
+        """
+        Return ``True`` if ``site`` is due for a poll.
+
+        Asking extends the time :py:attr:`polls_saved` is counted over.
+
+        Args:
+            site: The site key
+
+        Keyword Args:
+            now: The current time, in epoch seconds; defaults to
+                :py:attr:`clock`
+
+        """
+        if now is None:
+            now = self.clock()
+        with self._lock:
+            state = self._sites.get(site)
+            if state is not None:
+                state.seen(now)
+        return now >= self.next_poll_at(site)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight call that other threads can wait on."""
+
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls made from multiple threads.
+
+    The first caller for a given key (the leader) runs the function; every
+    other caller that arrives with the same key while the leader is still
+    running blocks until it finishes and then receives the very same result
+    (or exception).  Once the call completes the key is forgotten, so the next
+    call starts a fresh round trip -- this is coalescing, not caching.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        #: How many calls actually ran the function
+        self.executed: int = 0
+        #: How many calls were served by another caller's in-flight result
+        self.shared: int = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` unless an identical call is already in flight.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: The function to run if no call with ``key`` is in flight
+
+        Raises:
+            BaseException: Whatever ``fn`` raised, for the leader and every
+                caller that shared its result
+
+        Returns:
+            The result of ``fn``, possibly computed by another thread
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent identical coroutine calls on one event loop.
+
+    This is the asyncio counterpart of :py:class:`SingleFlight`.  The shared
+    call runs in its own task, so cancelling one of the waiting callers does
+    not cancel the round trip for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        #: How many calls actually ran the function
+        self.executed: int = 0
+        #: How many calls were served by another caller's in-flight result
+        self.shared: int = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved so that a failure nobody is
+            # waiting on any more isn't logged as "never retrieved".
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn()`` unless an identical call is already in flight.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: A callable returning the awaitable to run if no call with
+                ``key`` is in flight
+
+        Raises:
+            BaseException: Whatever ``fn()`` raised
+
+        Returns:
+            The result of ``fn()``, possibly awaited on behalf of another caller
+
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.executed += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
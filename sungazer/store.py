@@ -0,0 +1,604 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Literal, get_args, get_origin
+
+from .models.devices import _MODEL_TAGS, BaseDeviceDetail, DeviceDetailResponse
+from .models.timestamps import epoch_seconds, parse_epoch_timestamp
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable
+    from datetime import datetime
+
+#: Text fields that change from poll to poll, so they are stored with the
+#: metrics instead of in the ``devices`` table
+VOLATILE_TEXT_FIELDS = ("STATE",)
+
+#: Fields with a fixed set of values that describe the device rather than
+#: measure it, so they are kept in the ``devices`` table
+METADATA_FIELDS = ("DEVICE_TYPE",)
+
+#: Fields that are neither metadata nor metrics
+_SKIPPED_FIELDS = frozenset({"SERIAL", "DATATIME", "CURTIME", "ISDETAIL"})
+
+
+#: The SQLite type each Python type is stored as
+_SQL_TYPES: dict[Any, str] = {
+    str: "TEXT",
+    float: "REAL",
+    int: "INTEGER",
+    bool: "INTEGER",
+}
+
+
+def _kind(tag: str) -> str:
+    """Turn a device tag such as ``"ESS BMS"`` into a table name prefix."""
+    return re.sub(r"[^a-z0-9]+", "_", tag.lower()).strip("_")
+
+
+def _column_type(annotation: Any) -> str | None:
+    """
+    Return the SQLite type to store a field in.
+
+    Args:
+        annotation: The annotation of the model field
+
+    Returns:
+        ``"REAL"``, ``"INTEGER"`` or ``"TEXT"``, or ``None`` for types that
+        aren't stored (such as timestamps)
+
+    """
+    args = [a for a in get_args(annotation) or (annotation,) if a is not type(None)]
+    if len(args) != 1:
+        return None
+    (kind,) = args
+    if get_origin(kind) is Annotated:
+        kind = get_args(kind)[0]
+    if get_origin(kind) is Literal:
+        # Stored like the type of its values, if they all have the same one
+        types = {type(value) for value in get_args(kind)}
+        kind = types.pop() if len(types) == 1 else None
+    return _SQL_TYPES.get(kind)
+
+
+class MetricTable:
+    """
+    The fact table holding the metrics of one device model.
+
+    Its columns are derived from the model: every numeric field, every field
+    restricted to a fixed set of strings, and :py:data:`VOLATILE_TEXT_FIELDS`.
+    Other text fields are metadata, kept in the ``devices`` table.
+
+    Args:
+        model: The device model
+        kind: The name of the device kind, such as ``"inverter"``; the table
+            is called ``<kind>_metrics``
+
+    """
+
+    def __init__(self, model: type[BaseDeviceDetail], kind: str):
+        #: The device model
+        self.model = model
+        #: The name of the device kind
+        self.kind = kind
+        #: The name of the table
+        self.name = f"{kind}_metrics"
+        #: The metric fields, and the SQLite type of each
+        self.columns: list[tuple[str, str]] = []
+        #: The metadata fields, kept in the ``devices`` table
+        self.metadata: list[str] = []
+        seen = set()
+        for name, field in model.model_fields.items():
+            column_type = _column_type(field.annotation)
+            if name in _SKIPPED_FIELDS or column_type is None:
+                continue
+            # SQLite column names are case-insensitive
+            if name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            is_metadata = name in METADATA_FIELDS or (
+                column_type == "TEXT"
+                and get_origin(field.annotation) is not Literal
+                and not any(
+                    get_origin(a) is Literal for a in get_args(field.annotation)
+                )
+                and name not in VOLATILE_TEXT_FIELDS
+            )
+            if is_metadata:
+                self.metadata.append(name)
+            else:
+                self.columns.append((name, column_type))
+        names = ", ".join(f'"{name}"' for name, _ in self.columns)
+        marks = ", ".join("?" for _ in self.columns)
+        #: The statement that inserts one row
+        self.insert = (
+            f'INSERT OR IGNORE INTO "{self.name}" ("device", "DATATIME", {names}) '  # noqa: S608
+            f"VALUES (?, ?, {marks})"
+        )
+
+    def schema(self) -> list[str]:
+        """
+        Return the statements that create the table and its indexes.
+
+        Each row refers to its device by the ``id`` of its row in the
+        ``devices`` table.  Rows are clustered on ``(device, DATATIME)``,
+        which is also the primary key, so reading one device's time range is a
+        single index range scan, and writing the same poll twice stores it
+        once.  A second index on ``DATATIME`` serves queries across every
+        device.
+        """
+        columns = "".join(f',\n    "{name}" {kind}' for name, kind in self.columns)
+        return [
+            (
+                f'CREATE TABLE IF NOT EXISTS "{self.name}" (\n'
+                '    "device" INTEGER NOT NULL REFERENCES devices ("id"),\n'
+                f'    "DATATIME" INTEGER NOT NULL{columns},\n'
+                '    PRIMARY KEY ("device", "DATATIME")\n'
+                ") WITHOUT ROWID"
+            ),
+            (
+                f'CREATE INDEX IF NOT EXISTS "{self.name}_datatime" '
+                f'ON "{self.name}" ("DATATIME")'
+            ),
+        ]
+
+    def row(self, device: BaseDeviceDetail, device_id: int, timestamp: int) -> tuple:
+        """
+        Return the values to insert for one device.
+
+        Args:
+            device: The device
+            device_id: The ``id`` of the device in the ``devices`` table
+            timestamp: Its ``DATATIME``, in seconds since the epoch
+
+        """
+        values = device.__dict__
+        return (
+            device_id,
+            timestamp,
+            *[values[name] for name, _ in self.columns],
+        )
+
+
+#: The fact table of each device model
+TABLES: dict[type[BaseDeviceDetail], MetricTable] = {
+    model: MetricTable(model, _kind(tag)) for model, tag in _MODEL_TAGS.items()
+}
+
+#: The columns of the ``devices`` table: the metadata fields of every model
+DEVICE_COLUMNS: list[str] = list(
+    dict.fromkeys(name for table in TABLES.values() for name in table.metadata)
+)
+
+
+#: The statement that adds a device, or updates its metadata
+_UPSERT_DEVICE = (  # noqa: S608
+    "INSERT INTO devices ({names}) VALUES ({marks}) "
+    'ON CONFLICT ("SERIAL") DO UPDATE SET {updates}'
+).format(
+    names=", ".join(f'"{name}"' for name in ("SERIAL", "kind", *DEVICE_COLUMNS)),
+    marks=", ".join("?" for _ in range(len(DEVICE_COLUMNS) + 2)),
+    updates=", ".join(
+        f'"{name}" = excluded."{name}"' for name in ("kind", *DEVICE_COLUMNS)
+    ),
+)
+
+
+def _table_for(kind: type[BaseDeviceDetail] | str) -> MetricTable:
+    """
+    Return the fact table for a device model or kind.
+
+    Raises:
+        ValueError: If there is no such table
+
+    """
+    for model, table in TABLES.items():
+        if kind is model or kind == table.kind:
+            return table
+    if isinstance(kind, type):
+        for model in kind.__mro__:
+            if model in TABLES:
+                return TABLES[model]
+    msg = f"Unknown device kind: {kind}"
+    raise ValueError(msg)
+
+
+class DeviceStore:
+    """
+    A time-series store for ``Command=DeviceList`` snapshots, in an SQLite
+    database.
+
+    Devices are kept once each in the ``devices`` table, with an integer
+    ``id`` and their metadata (model, firmware version, panel, ...).  Each
+    device model has its own metric table, such as ``inverter_metrics``, with
+    a row per device ``id`` and ``DATATIME``.  Timestamps are stored as
+    seconds since the epoch.
+
+    The database runs in WAL mode, so readers never block the writer, and
+    each batch of rows is written in one transaction with
+    :py:meth:`sqlite3.Cursor.executemany`.  With ``batch_size`` set, rows are
+    buffered across snapshots and written once that many are pending;
+    :py:meth:`flush` (or :py:meth:`close`) writes the rest.
+
+    Example:
+        .. code-block:: python
+
+            with DeviceStore("~/sungazer.db") as store:
+                store.write(client.devices.list())
+                rows = store.metrics(
+                    "inverter",
+                    serial="E00122142080335",
+                    start=datetime(2025, 6, 1, tzinfo=ZoneInfo("UTC")),
+                )
+
+    Args:
+        path: The database file; it is created if needed.  ``":memory:"``
+            keeps everything in memory.
+
+    Keyword Args:
+        batch_size: How many metric rows to buffer before writing them; ``0``
+            writes every snapshot as soon as it is given
+
+    """
+
+    def __init__(self, path: str | os.PathLike = ":memory:", *, batch_size: int = 0):
+        if batch_size < 0:
+            msg = "batch_size can't be negative"
+            raise ValueError(msg)
+        #: The database file
+        self.path = (
+            str(path) if str(path) == ":memory:" else str(Path(path).expanduser())
+        )
+        #: How many metric rows to buffer before writing them
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL: a crash can lose the last transactions, never corrupt
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        #: Metric rows waiting to be written, by table
+        self._pending: dict[MetricTable, list[tuple]] = {}
+        self._pending_count = 0
+        #: Device rows waiting to be written, by serial number
+        self._pending_devices: dict[str, tuple] = {}
+        #: The last stored metadata of each device, by serial number
+        self._known: dict[str, tuple] = {}
+        #: The ``id`` of each device, by serial number
+        self._ids: dict[str, int] = {}
+        self._create()
+
+    def _create(self) -> None:
+        """Create the tables and indexes that don't exist yet."""
+        columns = "".join(f',\n    "{name}" TEXT' for name in DEVICE_COLUMNS)
+        statements = [
+            (
+                "CREATE TABLE IF NOT EXISTS devices (\n"
+                '    "id" INTEGER PRIMARY KEY,\n'
+                '    "SERIAL" TEXT NOT NULL UNIQUE,\n'
+                f'    "kind" TEXT NOT NULL{columns}\n)'
+            )
+        ]
+        for table in TABLES.values():
+            statements.extend(table.schema())
+        with self._lock:
+            for statement in statements:
+                self._connection.execute(statement)
+            self._add_missing_columns(
+                "devices", [(name, "TEXT") for name in DEVICE_COLUMNS]
+            )
+            for table in TABLES.values():
+                self._add_missing_columns(table.name, table.columns)
+            names = ", ".join(f'"{name}"' for name in DEVICE_COLUMNS)
+            for device_id, serial, kind, *metadata in self._connection.execute(
+                f'SELECT "id", "SERIAL", "kind", {names} FROM devices'  # noqa: S608
+            ):
+                self._ids[serial] = device_id
+                self._known[serial] = (serial, kind, *metadata)
+
+    def _add_missing_columns(self, table: str, columns: list[tuple[str, str]]) -> None:
+        """
+        Add the columns that a database written by an older version lacks.
+
+        ``CREATE TABLE IF NOT EXISTS`` leaves an existing table alone, so a
+        field added to a model since the database was created has no column
+        yet.  Rows stored before the column was added read back ``None`` for
+        it.  Columns of fields since removed from a model are left in place.
+
+        The caller must hold :py:attr:`_lock`.
+
+        Args:
+            table: The name of the table
+            columns: The name and SQLite type of each column it should have
+
+        """
+        existing = {
+            row[1].lower()
+            for row in self._connection.execute(f'PRAGMA table_info("{table}")')
+        }
+        for name, column_type in columns:
+            if name.lower() not in existing:
+                self._connection.execute(
+                    f'ALTER TABLE "{table}" ADD COLUMN "{name}" {column_type}'
+                )
+
+    def __enter__(self):
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Write every buffered row and close the database."""
+        self.close()
+
+    def write(self, snapshot: DeviceDetailResponse | Iterable[Any]) -> int:
+        """
+        Store one snapshot.
+
+        Devices without a ``SERIAL`` or a ``DATATIME`` are skipped, and so is
+        a device whose row for that ``DATATIME`` is already stored.
+
+        Args:
+            snapshot: A response, or an iterable of device models
+
+        Returns:
+            How many metric rows were queued
+
+        """
+        with self._lock:
+            count = self._queue(snapshot)
+            if self._pending_count >= self.batch_size:
+                self._flush()
+        return count
+
+    def write_many(self, snapshots: Iterable[DeviceDetailResponse]) -> int:
+        """
+        Store many snapshots in one transaction, whatever ``batch_size`` is.
+
+        Args:
+            snapshots: The responses
+
+        Returns:
+            How many metric rows were written
+
+        """
+        with self._lock:
+            count = sum(self._queue(snapshot) for snapshot in snapshots)
+            self._flush()
+        return count
+
+    def _queue(self, snapshot: DeviceDetailResponse | Iterable[Any]) -> int:
+        """Buffer the rows of one snapshot.  Hold the lock."""
+        devices = (
+            snapshot.devices or []
+            if isinstance(snapshot, DeviceDetailResponse)
+            else snapshot
+        )
+        count = 0
+        for device in devices:
+            serial = device.SERIAL
+            if serial is None or device.DATATIME is None:
+                continue
+            table = TABLES.get(type(device)) or _table_for(type(device))
+            device_id = self._ids.get(serial)
+            if device_id is None:
+                device_id = self._add_device(serial, table.kind)
+            timestamp = int(device.DATATIME.timestamp())
+            self._pending.setdefault(table, []).append(
+                table.row(device, device_id, timestamp)
+            )
+            values = device.__dict__
+            metadata = (
+                serial,
+                table.kind,
+                *[values.get(name) for name in DEVICE_COLUMNS],
+            )
+            if self._known.get(serial) != metadata:
+                self._pending_devices[serial] = metadata
+            count += 1
+        self._pending_count += count
+        return count
+
+    def _add_device(self, serial: str, kind: str) -> int:
+        """
+        Give a device a row in the ``devices`` table, if it has none yet.  Its
+        metadata is filled in by the next flush.  Hold the lock.
+
+        Returns:
+            The ``id`` of the device
+
+        """
+        self._connection.execute(
+            'INSERT INTO devices ("SERIAL", "kind") VALUES (?, ?) '
+            'ON CONFLICT ("SERIAL") DO NOTHING',
+            (serial, kind),
+        )
+        (device_id,) = self._connection.execute(
+            'SELECT "id" FROM devices WHERE "SERIAL" = ?', (serial,)
+        ).fetchone()
+        self._ids[serial] = device_id
+        return device_id
+
+    def flush(self) -> None:
+        """Write every buffered row."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write every buffered row, in one transaction.  Hold the lock."""
+        if not (self._pending or self._pending_devices):
+            return
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            if self._pending_devices:
+                connection.executemany(_UPSERT_DEVICE, self._pending_devices.values())
+            for table, rows in self._pending.items():
+                connection.executemany(table.insert, rows)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self._known.update(self._pending_devices)
+        self._pending = {}
+        self._pending_devices = {}
+        self._pending_count = 0
+
+    def close(self) -> None:
+        """Write every buffered row and close the database."""
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> list[dict[str, Any]]:
+        """Run a query and return its rows as dicts."""
+        with self._lock:
+            cursor = self._connection.execute(sql, tuple(params))
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row, strict=True)) for row in cursor]
+
+    def devices(
+        self, kind: type[BaseDeviceDetail] | str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Return the stored devices and their metadata.
+
+        Keyword Args:
+            kind: Only return devices of this model or kind, such as
+                ``"inverter"``
+
+        Raises:
+            ValueError: If ``kind`` is not a known device kind
+
+        Returns:
+            A dict per device, ordered by serial number
+
+        """
+        if kind is None:
+            return self._query('SELECT * FROM devices ORDER BY "SERIAL"')
+        return self._query(
+            'SELECT * FROM devices WHERE "kind" = ? ORDER BY "SERIAL"',
+            (_table_for(kind).kind,),
+        )
+
+    def metrics(
+        self,
+        kind: type[BaseDeviceDetail] | str,
+        *,
+        serial: str | None = None,
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+        columns: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return stored metrics, ordered by device and time.
+
+        Args:
+            kind: The device model, or its kind, such as ``"inverter"``
+
+        Keyword Args:
+            serial: Only return this device's metrics
+            start: Only return rows with a ``DATATIME`` at or after this
+            end: Only return rows with a ``DATATIME`` before this
+            columns: Only return these metric columns, besides ``SERIAL`` and
+                ``DATATIME``
+
+        Raises:
+            ValueError: If ``kind`` is not a known device kind, or a column
+                doesn't exist
+
+        Returns:
+            A dict per row, with ``DATATIME`` as a timezone-aware datetime
+
+        """
+        names, rows = self._select(kind, serial, start, end, columns)
+        result = [dict(zip(names, row, strict=True)) for row in rows]
+        for row in result:
+            row["DATATIME"] = parse_epoch_timestamp(row["DATATIME"])
+        return result
+
+    def series(
+        self,
+        kind: type[BaseDeviceDetail] | str,
+        *,
+        serial: str | None = None,
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+        columns: Iterable[str] | None = None,
+    ) -> dict[str, list[Any]]:
+        """
+        Return stored metrics as columns, ordered by device and time.
+
+        This takes the same arguments as :py:meth:`metrics`, but skips
+        building a dict and a datetime per row, so it is much faster on long
+        ranges.
+
+        Args:
+            kind: The device model, or its kind, such as ``"inverter"``
+
+        Keyword Args:
+            serial: Only return this device's metrics
+            start: Only return rows with a ``DATATIME`` at or after this
+            end: Only return rows with a ``DATATIME`` before this
+            columns: Only return these metric columns, besides ``SERIAL`` and
+                ``DATATIME``
+
+        Raises:
+            ValueError: If ``kind`` is not a known device kind, or a column
+                doesn't exist
+
+        Returns:
+            A list of values per column, with ``DATATIME`` in seconds since
+            the epoch
+
+        """
+        names, rows = self._select(kind, serial, start, end, columns)
+        values = list(zip(*rows, strict=True)) if rows else [() for _ in names]
+        return {name: list(column) for name, column in zip(names, values, strict=True)}
+
+    def _select(
+        self,
+        kind: type[BaseDeviceDetail] | str,
+        serial: str | None,
+        start: datetime | float | None,
+        end: datetime | float | None,
+        columns: Iterable[str] | None,
+    ) -> tuple[list[str], list[tuple]]:
+        """Run a metrics query, returning its column names and rows."""
+        table = _table_for(kind)
+        if columns is None:
+            selected = [name for name, _ in table.columns]
+        else:
+            selected = list(columns)
+            known = {name for name, _ in table.columns}
+            unknown = [name for name in selected if name not in known]
+            if unknown:
+                msg = f"Unknown {table.kind} columns: {', '.join(unknown)}"
+                raise ValueError(msg)
+        names = ", ".join(
+            ['devices."SERIAL"', 'm."DATATIME"', *[f'm."{name}"' for name in selected]]
+        )
+        conditions = []
+        params: list[Any] = []
+        if serial is not None:
+            conditions.append('devices."SERIAL" = ?')
+            params.append(serial)
+        if start is not None:
+            conditions.append('m."DATATIME" >= ?')
+            params.append(epoch_seconds(start))
+        if end is not None:
+            conditions.append('m."DATATIME" < ?')
+            params.append(epoch_seconds(end))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            cursor = self._connection.execute(
+                f'SELECT {names} FROM "{table.name}" AS m '  # noqa: S608
+                f'JOIN devices ON devices."id" = m."device"{where} '
+                'ORDER BY m."device", m."DATATIME"',
+                params,
+            )
+            return [column[0] for column in cursor.description], cursor.fetchall()
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from . import jsonlib
+
+#: Bytes that change the parser's nesting or string state
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+#: Bytes that end or escape within a JSON string
+_STRING_SPECIAL = re.compile(rb'["\\]')
+#: Blanks then the opening brace, at the start of the body
+_BODY_START = re.compile(rb"[ \t\r\n]*\{")
+#: An opening brace that begins a line
+_LINE_START = re.compile(rb"\n\{")
+#: Nothing but blanks
+_BLANK = re.compile(rb"[ \t\r\n]*\Z")
+
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_OPEN_BRACE = ord("{")
+_OPEN_BRACKET = ord("[")
+_CLOSE_BRACE = ord("}")
+
+
+class DeviceListParser:
+    """
+    Incrementally pull device records out of a ``Command=DeviceList`` body.
+
+    Feed the body in chunks as it arrives with :py:meth:`feed`, which returns
+    each record of the top-level ``devices`` array as a ``dict`` as soon as
+    its closing brace has been read.  Only the record being read is kept in
+    memory, not the whole body or the whole array.
+
+    The parser only tracks nesting depth and whether it is inside a string
+    (minding backslash escapes), so it is cheap; each record is then decoded
+    with :py:func:`sungazer.jsonlib.loads`.  Everything outside the
+    ``devices`` array is kept and decoded by :py:meth:`close`, so that
+    ``result`` is available at the end.
+
+    Like :py:func:`sungazer.sanitize.json_bounds`, the document starts at
+    the first ``{`` that is either the first non-blank byte of the body or
+    the first byte of a line.  Anything before it (such as stray HTTP headers
+    the PVS6 sometimes sends in the body, even ones holding a ``{``) and
+    anything after the closing ``}`` is ignored.
+
+    Example:
+        .. code-block:: python
+
+            parser = DeviceListParser()
+            for chunk in response.iter_bytes():
+                for record in parser.feed(chunk):
+                    print(record["SERIAL"])
+            print(parser.close()["result"])
+
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        #: Where scanning resumes in :py:attr:`_buf`
+        self._pos = 0
+        #: Current nesting depth of objects and arrays
+        self._depth = 0
+        self._in_string = False
+        #: Where the string being read starts in :py:attr:`_buf`
+        self._string_start = 0
+        #: The last string read directly inside the top-level object
+        self._last_key: bytes | None = None
+        self._started = False
+        #: Whether only blanks have been read so far
+        self._blank = True
+        #: Whether the last byte read before the document was a newline
+        self._after_newline = False
+        self._finished = False
+        self._in_devices = False
+        self._seen_devices = False
+        #: Where the device record being read starts in :py:attr:`_buf`
+        self._item_start: int | None = None
+        #: The body with the ``devices`` array emptied out
+        self._rest = bytearray()
+        #: Where the unsaved part of :py:attr:`_rest` starts in :py:attr:`_buf`
+        self._rest_from = 0
+        #: The number of device records returned so far
+        self.count: int = 0
+
+    def feed(self, chunk: bytes) -> list[dict[str, Any]]:
+        """
+        Parse the next chunk of the body.
+
+        Args:
+            chunk: The next bytes of the body
+
+        Raises:
+            ValueError: If a device record is not valid JSON
+
+        Returns:
+            The device records completed by this chunk, in order
+
+        """
+        if self._finished:
+            return []
+        self._buf += chunk
+        records = self._scan()
+        self._compact()
+        self.count += len(records)
+        return records
+
+    def _scan(self) -> list[dict[str, Any]]:  # noqa: PLR0912, PLR0915
+        """
+        Scan :py:attr:`_buf` from :py:attr:`_pos` as far as possible.
+        """
+        buf = self._buf
+        pos = self._pos
+        records: list[dict[str, Any]] = []
+        if not self._started:
+            start = self._find_start(buf, pos)
+            if start < 0:
+                self._pos = len(buf)
+                return records
+            self._started = True
+            self._rest_from = start
+            pos = start
+        end = len(buf)
+        while pos < end:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = end
+                    break
+                i = match.start()
+                if buf[i] == _BACKSLASH:
+                    if i + 1 >= end:
+                        # The escaped byte is in the next chunk
+                        pos = i
+                        break
+                    pos = i + 2
+                    continue
+                self._in_string = False
+                if self._depth == 1:
+                    self._last_key = bytes(buf[self._string_start : i])
+                pos = i + 1
+                continue
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = end
+                break
+            i = match.start()
+            char = buf[i]
+            pos = i + 1
+            if char == _QUOTE:
+                self._in_string = True
+                self._string_start = pos
+            elif char in (_OPEN_BRACE, _OPEN_BRACKET):
+                self._depth += 1
+                if (
+                    char == _OPEN_BRACKET
+                    and self._depth == 2
+                    and not self._seen_devices
+                    and self._last_key == b"devices"
+                ):
+                    self._in_devices = True
+                    self._seen_devices = True
+                    self._rest += buf[self._rest_from : pos]
+                elif self._in_devices and char == _OPEN_BRACE and self._depth == 3:
+                    self._item_start = i
+            else:
+                self._depth -= 1
+                if self._in_devices:
+                    if self._depth == 2 and char == _CLOSE_BRACE:
+                        records.append(jsonlib.loads(buf[self._item_start : pos]))
+                        self._item_start = None
+                    elif self._depth == 1:
+                        self._in_devices = False
+                        self._rest_from = i
+                if self._depth == 0:
+                    self._rest += buf[self._rest_from : pos]
+                    self._rest_from = pos
+                    self._finished = True
+                    break
+        self._pos = pos
+        return records
+
+    def _find_start(self, buf: bytearray, pos: int) -> int:
+        """
+        Return where the document starts in ``buf`` after ``pos``, or -1.
+
+        Remembers enough about the bytes read so far to find a start that
+        straddles two chunks.
+        """
+        if self._blank:
+            match = _BODY_START.match(buf, pos)
+            if match is not None:
+                return match.end() - 1
+        elif self._after_newline and buf[pos : pos + 1] == b"{":
+            return pos
+        match = _LINE_START.search(buf, pos)
+        if match is not None:
+            return match.start() + 1
+        if pos < len(buf):
+            self._blank = self._blank and _BLANK.match(buf, pos) is not None
+            self._after_newline = buf[-1] == ord("\n")
+        return -1
+
+    def _compact(self) -> None:
+        """
+        Drop the bytes of :py:attr:`_buf` that are no longer needed.
+        """
+        if not self._started:
+            self._buf.clear()
+            self._pos = 0
+            return
+        if not self._in_devices and not self._finished:
+            self._rest += self._buf[self._rest_from : self._pos]
+            self._rest_from = self._pos
+        keep = self._pos
+        if self._in_string:
+            keep = min(keep, self._string_start)
+        if self._item_start is not None:
+            keep = min(keep, self._item_start)
+        if not self._in_devices:
+            keep = min(keep, self._rest_from)
+        if keep <= 0:
+            return
+        del self._buf[:keep]
+        self._pos -= keep
+        self._string_start -= keep
+        self._rest_from -= keep
+        if self._item_start is not None:
+            self._item_start -= keep
+
+    def close(self) -> dict[str, Any]:
+        """
+        Finish parsing and return everything but the device records.
+
+        Returns:
+            The decoded top-level object with an empty ``devices`` array, or
+            an empty ``dict`` if the body was empty
+
+        Raises:
+            ValueError: If the body ended before the top-level object closed
+
+        """
+        if not self._started:
+            return {}
+        if not self._finished:
+            msg = "DeviceList response ended before the JSON object was complete"
+            raise ValueError(msg)
+        return jsonlib.loads(self._rest)
@@ -0,0 +1,98 @@
+"""
+Benchmarks for :py:mod:`sungazer.binlog`.
+
+Measures appending one poll of a site with 300 inverters to a binary log, and
+reading an hour of 1-minute polls of that site back through the memory map,
+one column at a time and as dicts.  ``extra_info`` records the size of one
+poll in the log and as JSON.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import itertools
+import json
+from datetime import timedelta
+
+import pytest
+
+from sungazer.binlog import BinlogReader, BinlogWriter
+from sungazer.models import DeviceDetailResponse
+
+from .test_device_dispatch_benchmark import site
+
+INVERTERS = 300
+
+
+@pytest.fixture(scope="module")
+def payload() -> dict:
+    """Build one poll of the site."""
+    return site(INVERTERS)
+
+
+@pytest.fixture(scope="module")
+def inverters(payload) -> list:
+    """Parse one poll of the site and return its inverters."""
+    return DeviceDetailResponse.new(payload).inverters
+
+
+def poll(inverters: list, minute: int) -> list:
+    """Return ``inverters`` as polled ``minute`` minutes later."""
+    return [
+        inverter.model_copy(
+            update={"DATATIME": inverter.DATATIME + timedelta(minutes=minute)}
+        )
+        for inverter in inverters
+    ]
+
+
+@pytest.fixture(scope="module")
+def hour(tmp_path_factory, inverters):
+    """Write a log holding an hour of 1-minute polls."""
+    path = tmp_path_factory.mktemp("binlog") / "hour.sgzlog"
+    with BinlogWriter(path, fsync_interval=None) as log:
+        for minute in range(60):
+            log.write(poll(inverters, minute))
+    return path
+
+
+def test_write_poll(benchmark, tmp_path, payload, inverters):
+    """Benchmark appending one poll."""
+    path = tmp_path / "site.sgzlog"
+    log = BinlogWriter(path, fsync_interval=None)
+    log.write(poll(inverters, 0))
+    log.sync()
+    first = path.stat().st_size
+    minutes = itertools.count(1)
+    benchmark.group = "binlog-write"
+    benchmark.pedantic(
+        log.write, setup=lambda: ((poll(inverters, next(minutes)),), {}), rounds=50
+    )
+    log.close()
+    polls = next(minutes) - 1
+    inverter_json = [d for d in payload["devices"] if d["DEVICE_TYPE"] == "Inverter"]
+    benchmark.extra_info["bytes_per_poll"] = (path.stat().st_size - first) // polls
+    benchmark.extra_info["json_bytes_per_poll"] = len(json.dumps(inverter_json))
+
+
+class TestBinlogReadBenchmark:
+    """Benchmark reading an hour of polls."""
+
+    def test_one_column(self, benchmark, hour):
+        """Benchmark summing one column over every record."""
+
+        def total():
+            with BinlogReader(hour) as log:
+                return sum(record["p_3phsum_kw"] for record in log)
+
+        benchmark.group = "binlog-read"
+        assert benchmark(total) > 0
+
+    def test_to_dict(self, benchmark, hour):
+        """Benchmark reading every record as a dict."""
+
+        def rows():
+            with BinlogReader(hour) as log:
+                return [record.to_dict() for record in log]
+
+        benchmark.group = "binlog-read"
+        assert len(benchmark(rows)) == 60 * INVERTERS
@@ -0,0 +1,108 @@
+"""
+Benchmarks for building device models from a ``DeviceList`` payload.
+
+Compares :py:meth:`sungazer.models.DeviceDetailResponse.new`, which validates
+the whole ``devices`` array with one tagged-union validator, against the
+``if``/``elif`` chain on ``DEVICE_TYPE`` it replaced, on sites with 1, 50 and
+500 inverters.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from sungazer.models import (
+    Battery,
+    ConsumptionPowerMeterDeviceDetail,
+    DeviceDetailResponse,
+    EquinioxBMS,
+    EquinoxESS,
+    Gateway,
+    ProductionPowerMeterDeviceDetail,
+    PVDisconnectDetail,
+    PVSDeviceDetail,
+    SchneiderXwPro,
+    SolarBridgeDeviceDetail,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+def legacy_parse_device(device: dict):  # noqa: PLR0911
+    """The old dispatch: one branch per ``DEVICE_TYPE``."""
+    device_type = device.get("DEVICE_TYPE")
+    if device_type == "PVS":
+        return PVSDeviceDetail(**device)
+    if device_type == "Power Meter":
+        if "production_subtype_enum" in device:
+            return ProductionPowerMeterDeviceDetail(**device)
+        if "consumption_subtype_enum" in device:
+            return ConsumptionPowerMeterDeviceDetail(**device)
+        return None
+    if device_type == "Inverter":
+        return SolarBridgeDeviceDetail(**device)
+    if device_type == "PV Disconnect":
+        return PVDisconnectDetail(**device)
+    if device_type == "Gateway":
+        return Gateway(**device)
+    if device_type == "Storage Inverter":
+        return SchneiderXwPro(**device)
+    if device_type == "ESS BMS":
+        return EquinioxBMS(**device)
+    if device_type == "Battery":
+        return Battery(**device)
+    if device_type == "Energy Storage System":
+        return EquinoxESS(**device)
+    msg = f"Unknown device type: {device_type}"
+    raise ValueError(msg)
+
+
+def legacy_new(obj: dict) -> DeviceDetailResponse:
+    """The old ``DeviceDetailResponse.new``."""
+    devices = []
+    for device in obj.get("devices", []):
+        parsed = legacy_parse_device(device)
+        if parsed is not None:
+            devices.append(parsed)
+    return DeviceDetailResponse(devices=devices, result=obj.get("result", "unknown"))
+
+
+def site(inverters: int) -> dict:
+    """
+    Build a ``DeviceList`` payload with the fixture's other devices and
+    ``inverters`` inverters.
+    """
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        payload = json.load(f)
+    others = [d for d in payload["devices"] if d["DEVICE_TYPE"] != "Inverter"]
+    template = next(d for d in payload["devices"] if d["DEVICE_TYPE"] == "Inverter")
+    devices = []
+    for i in range(inverters):
+        inverter = copy.deepcopy(template)
+        inverter["SERIAL"] = f"E00122{i:010d}"
+        devices.append(inverter)
+    payload["devices"] = others + devices
+    return payload
+
+
+@pytest.mark.parametrize("inverters", [1, 50, 500])
+class TestDeviceDispatchBenchmark:
+    """Benchmark the if/elif chain against the tagged-union validator."""
+
+    def test_legacy(self, benchmark, inverters):
+        """Benchmark one model constructor call per device."""
+        payload = site(inverters)
+        benchmark.group = f"dispatch-{inverters}"
+        result = benchmark(legacy_new, payload)
+        assert len(result.inverters) == inverters
+
+    def test_tagged_union(self, benchmark, inverters):
+        """Benchmark DeviceDetailResponse.new."""
+        payload = site(inverters)
+        benchmark.group = f"dispatch-{inverters}"
+        result = benchmark(DeviceDetailResponse.new, payload)
+        assert result == legacy_new(payload)
@@ -0,0 +1,57 @@
+"""
+Benchmarks for :py:mod:`sungazer.diff`.
+
+Diffs two consecutive polls of a site where every inverter reports a new
+power reading and timestamp, as happens on every daytime poll, and everything
+else is unchanged.  Compares diffing raw decoded bodies against diffing
+validated responses, on sites with 50 and 500 inverters.  Each benchmark
+records the size of the diff as JSON, and of the full ``model_dump()`` JSON it
+replaces, in ``extra_info``.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import copy
+
+import pytest
+
+from sungazer.diff import diff_snapshots
+from sungazer.models import DeviceDetailResponse
+
+from .test_device_dispatch_benchmark import site
+
+
+def polls(inverters: int) -> tuple[dict, dict]:
+    """Build two consecutive polls of a site."""
+    before = site(inverters)
+    after = copy.deepcopy(before)
+    for i, device in enumerate(after["devices"]):
+        if device["DEVICE_TYPE"] == "Inverter":
+            device["p_3phsum_kw"] = f"{i / 1000:.4f}"
+            device["DATATIME"] = "2025,06,22,00,20,54"
+    return before, after
+
+
+@pytest.mark.parametrize("inverters", [50, 500])
+class TestDiffBenchmark:
+    """Benchmark diffing raw bodies against diffing responses."""
+
+    def test_raw(self, benchmark, inverters):
+        """Benchmark diffing decoded bodies."""
+        before, after = polls(inverters)
+        benchmark.group = f"diff-{inverters}"
+        diff = benchmark(diff_snapshots, before, after)
+        assert len(diff.changed) == inverters
+        benchmark.extra_info["diff_bytes"] = len(diff.model_dump_json())
+        benchmark.extra_info["full_bytes"] = len(
+            DeviceDetailResponse.new(after).model_dump_json()
+        )
+
+    def test_responses(self, benchmark, inverters):
+        """Benchmark diffing validated responses."""
+        before, after = polls(inverters)
+        old = DeviceDetailResponse.new(before)
+        new = DeviceDetailResponse.new(after)
+        benchmark.group = f"diff-{inverters}"
+        diff = benchmark(diff_snapshots, old, new)
+        assert len(diff.changed) == inverters
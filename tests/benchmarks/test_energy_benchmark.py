@@ -0,0 +1,108 @@
+"""
+Benchmarks for :py:class:`sungazer.energy.EnergyAccount`.
+
+Measures accounting for a site with 300 inverters polled every minute, over a
+day and over a week, with a counter reset and a missing reading on every
+inverter each day.  A plain Python loop over the day's samples, applying the
+same reset and gap rules, is the baseline.  Also measures summing a week of
+intervals into 15-minute buckets.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sungazer.energy import EnergyAccount
+
+INVERTERS = 300
+DAY = 24 * 60
+
+#: 2025-06-22 00:00:00 UTC
+MIDNIGHT = 1750550400
+
+
+def fleet(days: int) -> tuple:
+    """
+    Build 1-minute samples of every inverter, as (serials, times, counters,
+    powers).
+    """
+    minutes = np.arange(days * DAY)
+    times = np.tile(MIDNIGHT + minutes * 60, INVERTERS)
+    serials = np.repeat([f"E00122{n:09d}" for n in range(INVERTERS)], minutes.size)
+    # A day's sine of production, scaled a little differently per inverter
+    scale = np.repeat(0.2 + np.arange(INVERTERS) / INVERTERS / 10, minutes.size)
+    powers = np.tile(np.sin(np.pi * (minutes % DAY) / DAY), INVERTERS) * scale
+    counters = np.cumsum(powers.reshape(INVERTERS, -1) / 60, axis=1) + 1000
+    # Each day, each inverter resets at noon and misses a reading at 18:00
+    for noon in range(DAY // 2, minutes.size, DAY):
+        counters[:, noon:] -= counters[:, noon : noon + 1]
+    counters[:, 18 * 60 :: DAY] = np.nan
+    return serials, times, counters.ravel(), powers
+
+
+def baseline(serials, times, counters, powers) -> dict:
+    """Account for samples one at a time in Python."""
+    totals = {}
+    last = {}
+    for serial, time, counter, power in zip(
+        serials.tolist(),
+        times.tolist(),
+        counters.tolist(),
+        powers.tolist(),
+        strict=True,
+    ):
+        previous = last.get(serial)
+        last[serial] = (time, counter, power)
+        if previous is None:
+            continue
+        time0, counter0, power0 = previous
+        increase = counter - counter0
+        if math.isnan(increase) or increase < 0:  # a gap, or a reset
+            increase = (power0 + power) / 2 * (time - time0) / 3600
+        totals[serial] = totals.get(serial, 0.0) + increase
+    return totals
+
+
+@pytest.fixture(scope="module")
+def day() -> tuple:
+    """Build a day of samples."""
+    return fleet(1)
+
+
+@pytest.fixture(scope="module")
+def week() -> tuple:
+    """Build a week of samples."""
+    return fleet(7)
+
+
+def test_baseline_day(benchmark, day):
+    """Benchmark accounting for a day in a Python loop."""
+    benchmark.group = "energy-account"
+    totals = benchmark.pedantic(baseline, args=day, rounds=3)
+    assert len(totals) == INVERTERS
+
+
+def test_account_day(benchmark, day):
+    """Benchmark accounting for a day."""
+    benchmark.group = "energy-account"
+    result = benchmark(EnergyAccount, *day)
+    assert result.totals() == pytest.approx(baseline(*day))
+
+
+def test_account_week(benchmark, week):
+    """Benchmark accounting for a week."""
+    benchmark.group = "energy-account"
+    result = benchmark.pedantic(EnergyAccount, args=week, rounds=5)
+    assert len(result) == INVERTERS * (7 * DAY - 1)
+
+
+def test_week_of_quarters(benchmark, week):
+    """Benchmark summing a week into 15-minute intervals."""
+    result = EnergyAccount(*week)
+    benchmark.group = "energy-intervals"
+    starts, energy = benchmark(result.intervals, 900)
+    assert energy.shape == (INVERTERS, starts.size)
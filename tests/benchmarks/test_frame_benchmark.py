@@ -0,0 +1,76 @@
+"""
+Benchmarks for :py:class:`sungazer.frame.InverterFrame`.
+
+Compares computing the site's total AC power, mean heatsink temperature and
+95th percentile AC power with Python loops over
+:py:attr:`~sungazer.models.DeviceDetailResponse.inverters` against the same
+aggregates on an :py:class:`~sungazer.frame.InverterFrame`, and building a
+frame from the raw payload against building the models.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import statistics
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from sungazer.frame import InverterFrame
+from sungazer.models import DeviceDetailResponse
+
+from .test_device_dispatch_benchmark import site
+
+
+def loop_stats(response: DeviceDetailResponse) -> tuple[float, float, float]:
+    """Compute the aggregates with Python loops over the models."""
+    power = [d.p_3phsum_kw for d in response.inverters if d.p_3phsum_kw is not None]
+    temps = [d.t_htsink_degc for d in response.inverters]
+    return (
+        sum(power),
+        statistics.fmean(t for t in temps if t is not None),
+        statistics.quantiles(power, n=20, method="inclusive")[-1],
+    )
+
+
+def frame_stats(frame: InverterFrame) -> tuple[float, float, float]:
+    """Compute the aggregates on the frame."""
+    return (
+        frame.total("p_3phsum_kw"),
+        frame.mean("t_htsink_degc"),
+        frame.percentile("p_3phsum_kw", 95),
+    )
+
+
+@pytest.mark.parametrize("inverters", [50, 500])
+class TestFrameBenchmark:
+    """Benchmark aggregates over models against an InverterFrame."""
+
+    def test_loop_aggregates(self, benchmark, inverters):
+        """Benchmark the aggregates as Python loops over models."""
+        response = DeviceDetailResponse.new(site(inverters))
+        benchmark.group = f"frame-aggregates-{inverters}"
+        total, _, _ = benchmark(loop_stats, response)
+        assert total == pytest.approx(0.0471 * inverters)
+
+    def test_frame_aggregates(self, benchmark, inverters):
+        """Benchmark the aggregates on an InverterFrame."""
+        payload = site(inverters)
+        frame = InverterFrame.from_payload(payload)
+        benchmark.group = f"frame-aggregates-{inverters}"
+        result = benchmark(frame_stats, frame)
+        assert result[1] == pytest.approx(33.0)
+        assert result == pytest.approx(loop_stats(DeviceDetailResponse.new(payload)))
+
+    def test_models_build(self, benchmark, inverters):
+        """Benchmark building the models."""
+        payload = site(inverters)
+        benchmark.group = f"frame-build-{inverters}"
+        benchmark(DeviceDetailResponse.new, payload)
+
+    def test_frame_build(self, benchmark, inverters):
+        """Benchmark building a frame straight from the payload."""
+        payload = site(inverters)
+        benchmark.group = f"frame-build-{inverters}"
+        frame = benchmark(InverterFrame.from_payload, payload)
+        assert len(frame) == inverters
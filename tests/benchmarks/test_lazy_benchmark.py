@@ -0,0 +1,43 @@
+"""
+Benchmarks for lazy device views.
+
+Compares reading the fields most consumers use (``SERIAL``, ``p_3phsum_kw``,
+``ltea_3phsum_kwh`` and ``DATATIME``) from every inverter of a fully
+validated :py:class:`~sungazer.models.DeviceDetailResponse` and of a
+:py:class:`~sungazer.models.LazyDeviceDetailResponse`.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import pytest
+
+from sungazer.models import DeviceDetailResponse, LazyDeviceDetailResponse
+
+from .test_device_dispatch_benchmark import site
+
+
+def read_fields(response) -> list[tuple]:
+    """Read the commonly used fields of each inverter."""
+    return [
+        (d.SERIAL, d.p_3phsum_kw, d.ltea_3phsum_kwh, d.DATATIME)
+        for d in response.inverters
+    ]
+
+
+@pytest.mark.parametrize("inverters", [1, 50, 500])
+class TestLazyBenchmark:
+    """Benchmark full validation against lazy views."""
+
+    def test_full(self, benchmark, inverters):
+        """Benchmark DeviceDetailResponse.new, then reading four fields."""
+        payload = site(inverters)
+        benchmark.group = f"lazy-{inverters}"
+        rows = benchmark(lambda: read_fields(DeviceDetailResponse.new(payload)))
+        assert len(rows) == inverters
+
+    def test_lazy(self, benchmark, inverters):
+        """Benchmark LazyDeviceDetailResponse.new, then reading four fields."""
+        payload = site(inverters)
+        benchmark.group = f"lazy-{inverters}"
+        rows = benchmark(lambda: read_fields(LazyDeviceDetailResponse.new(payload)))
+        assert rows == read_fields(DeviceDetailResponse.new(payload))
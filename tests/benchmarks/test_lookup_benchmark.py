@@ -0,0 +1,79 @@
+"""
+Benchmarks for device lookups on a
+:py:class:`~sungazer.models.DeviceDetailResponse`.
+
+Compares the role properties and finding a device by serial number, answered
+from the indexes built when the response is created, against the linear
+``isinstance`` and ``SERIAL`` scans they replaced, on sites with 50 and 500
+inverters.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import pytest
+
+from sungazer.models import (
+    ConsumptionPowerMeterDeviceDetail,
+    DeviceDetailResponse,
+    ProductionPowerMeterDeviceDetail,
+    PVSDeviceDetail,
+    SolarBridgeDeviceDetail,
+)
+
+from .test_device_dispatch_benchmark import site
+
+
+def scan_roles(response: DeviceDetailResponse) -> tuple:
+    """Look up every role by scanning the devices, as the properties used to."""
+    devices = response.devices
+    return (
+        next(d for d in devices if isinstance(d, PVSDeviceDetail)),
+        [d for d in devices if isinstance(d, SolarBridgeDeviceDetail)],
+        next(d for d in devices if isinstance(d, ProductionPowerMeterDeviceDetail)),
+        next(d for d in devices if isinstance(d, ConsumptionPowerMeterDeviceDetail)),
+    )
+
+
+def indexed_roles(response: DeviceDetailResponse) -> tuple:
+    """Look up every role with the properties."""
+    return (
+        response.pvs,
+        response.inverters,
+        response.production_meter,
+        response.consumption_meter,
+    )
+
+
+@pytest.mark.parametrize("inverters", [50, 500])
+class TestLookupBenchmark:
+    """Benchmark scanning the devices against the indexes."""
+
+    def test_scan_roles(self, benchmark, inverters):
+        """Benchmark finding every role by scanning."""
+        response = DeviceDetailResponse.new(site(inverters))
+        benchmark.group = f"roles-{inverters}"
+        result = benchmark(scan_roles, response)
+        assert result == indexed_roles(response)
+
+    def test_indexed_roles(self, benchmark, inverters):
+        """Benchmark finding every role with the properties."""
+        response = DeviceDetailResponse.new(site(inverters))
+        benchmark.group = f"roles-{inverters}"
+        benchmark(indexed_roles, response)
+
+    def test_scan_serial(self, benchmark, inverters):
+        """Benchmark finding the last inverter by scanning for its serial."""
+        response = DeviceDetailResponse.new(site(inverters))
+        serial = response.inverters[-1].SERIAL
+        benchmark.group = f"serial-{inverters}"
+        device = benchmark(
+            lambda: next(d for d in response.devices if d.SERIAL == serial)
+        )
+        assert device is response.by_serial(serial)
+
+    def test_by_serial(self, benchmark, inverters):
+        """Benchmark finding the last inverter with by_serial()."""
+        response = DeviceDetailResponse.new(site(inverters))
+        serial = response.inverters[-1].SERIAL
+        benchmark.group = f"serial-{inverters}"
+        assert benchmark(response.by_serial, serial).SERIAL == serial
@@ -0,0 +1,72 @@
+"""
+Benchmarks for turning response bodies into models.
+
+Compares ``BaseClient._parse``, which validates straight from the JSON bytes,
+with the path it replaced: decode with :py:func:`json.loads`, then build the
+model from the resulting ``dict``.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from sungazer.client import BaseClient
+from sungazer.models import (
+    CheckFWResponse,
+    DeviceDetailResponse,
+    GetCommResponse,
+    GridProfileGetResponse,
+    GridProfileRefreshResponse,
+    StartResponse,
+    StopResponse,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+MODELS = {
+    "Start": StartResponse,
+    "Stop": StopResponse,
+    "Get_Comm": GetCommResponse,
+    "DeviceList": DeviceDetailResponse,
+    "CheckFW": CheckFWResponse,
+    "GridProfileGet": GridProfileGetResponse,
+    "GridProfileRefresh": GridProfileRefreshResponse,
+}
+
+
+def legacy_parse(content: bytes, model_class: type):
+    """The old path: decode to Python objects, then validate those."""
+    data = json.loads(content)
+    if model_class is DeviceDetailResponse:
+        return model_class.new(data)
+    return model_class(**data)
+
+
+@pytest.fixture(scope="module")
+def client():
+    """A client to call ``_parse`` on; nothing is ever sent."""
+    with httpx.Client() as http:
+        yield BaseClient(http)
+
+
+@pytest.mark.parametrize("command", list(MODELS))
+class TestParseBenchmark:
+    """Benchmark decoding then validating against validating from JSON."""
+
+    def test_legacy(self, benchmark, command):
+        """Benchmark json.loads followed by model construction."""
+        body = (FIXTURES / command / f"{command}.json").read_bytes()
+        benchmark.group = f"parse-{command}"
+        result = benchmark(legacy_parse, body, MODELS[command])
+        assert isinstance(result, MODELS[command])
+
+    def test_parse(self, benchmark, client, command):
+        """Benchmark BaseClient._parse."""
+        body = (FIXTURES / command / f"{command}.json").read_bytes()
+        benchmark.group = f"parse-{command}"
+        result = benchmark(client._parse, body, MODELS[command])  # noqa: SLF001
+        assert result == legacy_parse(body, MODELS[command])
@@ -0,0 +1,78 @@
+"""
+Benchmarks for :py:class:`sungazer.rollup.RollupEngine`.
+
+Measures folding one poll of a site with 300 inverters into the default
+1m/15m/1h/1d intervals, on an empty engine and on one already holding a day
+of 1-minute samples, to show the cost per sample doesn't grow with history.
+Also measures folding in a sample 12 hours late, and reading a day of
+15-minute rollups for the whole site.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import itertools
+
+import pytest
+
+from sungazer.models import DeviceDetailResponse
+from sungazer.rollup import RollupEngine
+
+from .test_device_dispatch_benchmark import site
+from .test_store_benchmark import poll
+
+INVERTERS = 300
+DAY = 24 * 60
+
+
+@pytest.fixture(scope="module")
+def inverters() -> list:
+    """Parse one poll of the site and return its inverters."""
+    return DeviceDetailResponse.new(site(INVERTERS)).inverters
+
+
+def history(inverters: list, minutes: int) -> RollupEngine:
+    """Build an engine holding ``minutes`` 1-minute samples of each inverter."""
+    engine = RollupEngine()
+    for inverter in inverters:
+        start = int(inverter.DATATIME.timestamp()) - minutes * 60
+        for minute in range(minutes):
+            engine.add(
+                inverter.SERIAL,
+                start + minute * 60,
+                0.2,
+                {"ltea_3phsum_kwh": 1000 + minute / 100},
+            )
+    return engine
+
+
+@pytest.mark.parametrize("minutes", [0, DAY])
+def test_update_poll(benchmark, inverters, minutes):
+    """Benchmark folding in one poll."""
+    engine = history(inverters, minutes)
+    offsets = itertools.count()
+    benchmark.group = "rollup-update"
+    benchmark.pedantic(
+        engine.update, setup=lambda: ((poll(inverters, next(offsets)),), {}), rounds=50
+    )
+
+
+def test_late_sample(benchmark, inverters):
+    """Benchmark folding in one sample 12 hours late."""
+    engine = history(inverters, DAY)
+    serial = inverters[150].SERIAL
+    late = int(inverters[150].DATATIME.timestamp()) - DAY * 30 - 30
+    seconds = itertools.count()
+    benchmark.group = "rollup-update"
+    benchmark(
+        lambda: engine.add(
+            serial, late + next(seconds) % 30, 0.2, {"ltea_3phsum_kwh": 1}
+        )
+    )
+
+
+def test_day_of_quarters(benchmark, inverters):
+    """Benchmark reading a day of 15-minute rollups for every inverter."""
+    engine = history(inverters, DAY)
+    benchmark.group = "rollup-query"
+    rollups = benchmark(engine.rollups, "15m")
+    assert len(rollups) >= INVERTERS * DAY // 15
@@ -0,0 +1,69 @@
+"""
+Benchmarks for response sanitizing.
+
+Compares :py:func:`sungazer.sanitize.sanitize` with the line filter that
+``BaseClient._handle_response`` used before it, on every fixture payload,
+both clean and with HTTP headers leaked into the body.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from sungazer.sanitize import sanitize
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+COMMANDS = [
+    "Start",
+    "Stop",
+    "Get_Comm",
+    "DeviceList",
+    "CheckFW",
+    "GridProfileGet",
+    "GridProfileRefresh",
+]
+
+HEADERS = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nConnection: close\r\n\r\n"
+)
+
+
+def legacy_filter(content: bytes) -> str:
+    """The old filter: decode, split into lines and keep the JSON-looking ones."""
+    text = content.decode()
+    lines = [line for line in text.splitlines() if line.startswith(("{", "\t", "}"))]
+    return "\n".join(lines)
+
+
+def payload(command: str, *, contaminated: bool) -> bytes:
+    """Load the fixture body for ``command``, optionally with leaked headers."""
+    body = (FIXTURES / command / f"{command}.json").read_bytes()
+    return HEADERS + body if contaminated else body
+
+
+@pytest.mark.parametrize("contaminated", [False, True], ids=["clean", "headers"])
+@pytest.mark.parametrize("command", COMMANDS)
+class TestSanitizeBenchmark:
+    """Benchmark the legacy line filter against the byte-level sanitizer."""
+
+    def test_legacy(self, benchmark, command, contaminated):
+        """
+        Benchmark the old splitlines filter.
+
+        Its output isn't checked: the fixtures indented with spaces lose every
+        line but the outer braces.
+        """
+        body = payload(command, contaminated=contaminated)
+        benchmark.group = f"sanitize-{command}"
+        benchmark(legacy_filter, body)
+
+    def test_sanitize(self, benchmark, command, contaminated):
+        """Benchmark the byte-level sanitizer."""
+        body = payload(command, contaminated=contaminated)
+        benchmark.group = f"sanitize-{command}"
+        result = benchmark(sanitize, body)
+        assert json.loads(result) == json.loads(payload(command, contaminated=False))
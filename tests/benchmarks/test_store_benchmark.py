@@ -0,0 +1,95 @@
+"""
+Benchmarks for :py:class:`sungazer.store.DeviceStore`.
+
+Measures writing one poll of a site with 300 inverters, and reading back one
+inverter's day, one inverter's hour and the whole site's hour from a store
+holding a day of 1-minute polls of that site (432,000 inverter rows).
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import itertools
+from datetime import timedelta
+
+import pytest
+
+from sungazer.models import DeviceDetailResponse
+from sungazer.store import DeviceStore
+
+from .test_device_dispatch_benchmark import site
+
+INVERTERS = 300
+
+
+@pytest.fixture(scope="module")
+def inverters() -> list:
+    """Parse one poll of the site and return its inverters."""
+    return DeviceDetailResponse.new(site(INVERTERS)).inverters
+
+
+def poll(inverters: list, minute: int) -> list:
+    """Return ``inverters`` as polled ``minute`` minutes later."""
+    return [
+        inverter.model_copy(
+            update={"DATATIME": inverter.DATATIME + timedelta(minutes=minute)}
+        )
+        for inverter in inverters
+    ]
+
+
+@pytest.fixture(scope="module")
+def day(inverters) -> DeviceStore:
+    """Build a store holding a day of 1-minute polls."""
+    store = DeviceStore()
+    store.write_many(poll(inverters, minute) for minute in range(24 * 60))
+    return store
+
+
+def test_write_poll(benchmark, tmp_path, inverters):
+    """Benchmark writing one poll to a WAL database file."""
+    store = DeviceStore(tmp_path / "sungazer.db")
+    minutes = itertools.count()
+    benchmark.group = "store-write"
+    benchmark.pedantic(
+        store.write,
+        setup=lambda: ((poll(inverters, next(minutes)),), {}),
+        rounds=50,
+    )
+    assert len(store.devices()) == INVERTERS
+    store.close()
+
+
+class TestStoreQueryBenchmark:
+    """Benchmark range queries on a day of data."""
+
+    def test_one_inverter_day(self, benchmark, day, inverters):
+        """Benchmark reading one inverter's day."""
+        benchmark.group = "store-query"
+        rows = benchmark(day.metrics, "inverter", serial=inverters[150].SERIAL)
+        assert len(rows) == 24 * 60
+
+    def test_one_inverter_hour(self, benchmark, day, inverters):
+        """Benchmark reading one inverter's hour."""
+        start = inverters[0].DATATIME + timedelta(hours=12)
+        benchmark.group = "store-query"
+        rows = benchmark(
+            day.metrics,
+            "inverter",
+            serial=inverters[150].SERIAL,
+            start=start,
+            end=start + timedelta(hours=1),
+        )
+        assert len(rows) == 60
+
+    def test_site_hour_one_column(self, benchmark, day, inverters):
+        """Benchmark reading every inverter's power over an hour."""
+        start = inverters[0].DATATIME + timedelta(hours=12)
+        benchmark.group = "store-query"
+        rows = benchmark(
+            day.metrics,
+            "inverter",
+            start=start,
+            end=start + timedelta(hours=1),
+            columns=["p_3phsum_kw"],
+        )
+        assert len(rows) == 60 * INVERTERS
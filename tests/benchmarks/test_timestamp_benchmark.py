@@ -0,0 +1,77 @@
+"""
+Micro-benchmarks for PVS6 timestamp parsing.
+
+Compares :py:func:`sungazer.models.timestamps.parse_pvs_timestamp` with the
+parsing ``BaseDeviceDetail.parse_timestamp`` used to do inline, on the
+``DATATIME`` and ``CURTIME`` values of a 300-inverter ``DeviceList``: the
+inverters report in a handful of batches, so most values repeat.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from sungazer.models.timestamps import parse_pvs_timestamp
+
+
+def legacy_parse(v: str) -> datetime:
+    """The old parsing: split twice and look up the UTC zone every time."""
+    if "," in v and len(v.split(",")) == 6:
+        try:
+            year, month, day, hour, minute, second = v.split(",")
+            return datetime(
+                int(year),
+                int(month),
+                int(day),
+                int(hour),
+                int(minute),
+                int(second),
+                tzinfo=ZoneInfo("UTC"),
+            )
+        except (ValueError, TypeError):
+            pass
+    msg = f"Invalid datetime value: {v}"
+    raise ValueError(msg)
+
+
+#: DATATIME in five batches plus one shared CURTIME, for 300 inverters
+TIMESTAMPS = [
+    value
+    for i in range(300)
+    for value in (f"2025,06,22,00,{10 + i % 5:02d},54", "2025,06,22,00,16,18")
+]
+
+
+def parse_all(parse) -> list[datetime]:
+    """Parse every timestamp of the simulated response."""
+    return [parse(value) for value in TIMESTAMPS]
+
+
+class TestTimestampBenchmark:
+    """Benchmark timestamp parsing for one DeviceList response."""
+
+    def test_legacy(self, benchmark):
+        """Benchmark the old inline parsing."""
+        benchmark.group = "timestamps"
+        result = benchmark(parse_all, legacy_parse)
+        assert result == parse_all(parse_pvs_timestamp)
+
+    def test_memoized(self, benchmark):
+        """Benchmark parse_pvs_timestamp with a warm cache, as in steady polling."""
+        benchmark.group = "timestamps"
+        benchmark(parse_all, parse_pvs_timestamp)
+
+    @pytest.mark.parametrize("value", ["2025,06,22,00,15,54"])
+    def test_miss(self, benchmark, value):
+        """Benchmark parsing a timestamp that isn't cached yet."""
+        benchmark.group = "timestamps-single"
+        benchmark(parse_pvs_timestamp.__wrapped__, value)
+
+    @pytest.mark.parametrize("value", ["2025,06,22,00,15,54"])
+    def test_legacy_single(self, benchmark, value):
+        """Benchmark the old parsing of one timestamp."""
+        benchmark.group = "timestamps-single"
+        benchmark(legacy_parse, value)
@@ -0,0 +1,43 @@
+"""
+Benchmarks for tolerant ``DeviceList`` parsing.
+
+Compares :py:meth:`sungazer.models.DeviceDetailResponse.new` on a clean
+payload with ``new(obj, tolerant=True)`` on the same payload and on one with a
+single bad inverter record, on sites with 50 and 500 inverters.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import pytest
+
+from sungazer.models import DeviceDetailResponse
+
+from .test_device_dispatch_benchmark import site
+
+
+@pytest.mark.parametrize("inverters", [50, 500])
+class TestTolerantBenchmark:
+    """Benchmark strict parsing against tolerant parsing."""
+
+    def test_strict(self, benchmark, inverters):
+        """Benchmark new() on a clean payload."""
+        payload = site(inverters)
+        benchmark.group = f"tolerant-{inverters}"
+        result = benchmark(DeviceDetailResponse.new, payload)
+        assert len(result.inverters) == inverters
+
+    def test_tolerant_clean(self, benchmark, inverters):
+        """Benchmark new(tolerant=True) on a clean payload."""
+        payload = site(inverters)
+        benchmark.group = f"tolerant-{inverters}"
+        result = benchmark(lambda: DeviceDetailResponse.new(payload, tolerant=True))
+        assert result.rejected_count == 0
+
+    def test_tolerant_one_bad(self, benchmark, inverters):
+        """Benchmark new(tolerant=True) with one invalid inverter record."""
+        payload = site(inverters)
+        payload["devices"][-1]["p_3phsum_kw"] = "n/a"
+        benchmark.group = f"tolerant-{inverters}"
+        result = benchmark(lambda: DeviceDetailResponse.new(payload, tolerant=True))
+        assert len(result.inverters) == inverters - 1
+        assert result.rejected_count == 1
@@ -7,17 +7,21 @@ from zoneinfo import ZoneInfo
 import pytest
 
 from sungazer.models import (
+    BaseDeviceDetail,
     Battery,
     ConsumptionPowerMeterDeviceDetail,
     DeviceDetailResponse,
+    DeviceParseError,
     EquinioxBMS,
     EquinoxESS,
     Gateway,
+    PowerMeterDeviceDetail,
     ProductionPowerMeterDeviceDetail,
     PVDisconnectDetail,
     PVSDeviceDetail,
     SchneiderXwPro,
     SolarBridgeDeviceDetail,
+    UnknownDevice,
 )
 
 
@@ -139,6 +143,75 @@ def test_device_detail_response_new_unknown_device_type():
         DeviceDetailResponse.new(test_data)
 
 
+def test_device_detail_response_new_tolerant():
+    """Test that new(tolerant=True) keeps the valid devices and sets aside the rest."""
+    test_data = {
+        "devices": [
+            {"DEVICE_TYPE": "PVS", "SERIAL": "PVS1"},
+            {"DEVICE_TYPE": "UNKNOWN_TYPE", "SERIAL": "123456"},
+            {"DEVICE_TYPE": "Power Meter", "SERIAL": "ignored"},
+            {"DEVICE_TYPE": "Inverter", "SERIAL": "INV1", "p_3phsum_kw": "n/a"},
+            {"DEVICE_TYPE": "Inverter", "SERIAL": "INV2", "p_3phsum_kw": "0.1"},
+            "garbage",
+        ],
+        "result": "succeed",
+    }
+
+    response = DeviceDetailResponse.new(test_data, tolerant=True)
+
+    assert [d.SERIAL for d in response.devices] == ["PVS1", "INV2"]
+    assert response.result == "succeed"
+    assert response.rejected_count == 3
+    assert response.unknown_devices == [
+        UnknownDevice(
+            index=1,
+            DEVICE_TYPE="UNKNOWN_TYPE",
+            SERIAL="123456",
+            raw=test_data["devices"][1],
+        ),
+        UnknownDevice(index=5, raw="garbage"),
+    ]
+    (invalid,) = response.invalid_devices
+    assert isinstance(invalid, DeviceParseError)
+    assert invalid.index == 3
+    assert invalid.DEVICE_TYPE == "Inverter"
+    assert invalid.SERIAL == "INV1"
+    assert invalid.errors == [
+        (
+            "p_3phsum_kw: Input should be a valid number, "
+            "unable to parse string as a number"
+        )
+    ]
+
+
+def test_device_detail_response_new_tolerant_clean():
+    """Test that new(tolerant=True) on a clean response matches new()."""
+    data_path = Path(__file__).parent / "fixtures" / "DeviceList" / "DeviceList.json"
+    with data_path.open() as f:
+        test_data = json.load(f)
+
+    response = DeviceDetailResponse.new(test_data, tolerant=True)
+
+    assert response == DeviceDetailResponse.new(test_data)
+    assert response.rejected_count == 0
+
+
+def test_device_detail_response_interns_metadata():
+    """Test that repeated metadata strings are shared between responses."""
+    data_path = Path(__file__).parent / "fixtures" / "DeviceList" / "DeviceList.json"
+    body = data_path.read_text()
+
+    first = DeviceDetailResponse.new(json.loads(body))
+    second = DeviceDetailResponse.new(json.loads(body))
+
+    for a, b in zip(first.inverters, second.inverters, strict=True):
+        assert a.STATE is b.STATE
+        assert a.MODEL is b.MODEL
+        assert a.SWVER is b.SWVER
+        assert a.PANEL is b.PANEL
+        assert a.SERIAL is b.SERIAL
+
+
 def test_device_detail_response_new_no_devices():
     """Test DeviceDetailResponse.new() method with no devices."""
     # Create test data with no devices
@@ -167,6 +240,60 @@ def test_device_detail_response_properties_empty():
     assert response.consumption_meter is None
 
 
+def test_device_detail_response_lookups():
+    """Test the serial, type and parent lookups."""
+    data_path = Path(__file__).parent / "fixtures" / "DeviceList" / "DeviceList.json"
+    with data_path.open() as f:
+        response = DeviceDetailResponse.new(json.load(f))
+
+    for device in response.devices:
+        assert response.by_serial(device.SERIAL) is device
+    assert response.by_serial("nope") is None
+
+    assert response.by_type(SolarBridgeDeviceDetail) == response.inverters
+    assert response.by_type(PVSDeviceDetail) == [response.pvs]
+    # Base classes match their subclasses, in the order they are listed
+    meters = [d for d in response.devices if isinstance(d, PowerMeterDeviceDetail)]
+    assert len(meters) == 2
+    assert response.by_type(PowerMeterDeviceDetail) == meters
+    assert response.by_type(BaseDeviceDetail) == response.devices
+
+    (ess,) = response.by_type(EquinoxESS)
+    children = response.children(ess.SERIAL)
+    assert [type(d) for d in children] == [SchneiderXwPro, EquinioxBMS, Battery]
+    assert response.children("nope") == []
+
+
+def test_device_detail_response_lookups_follow_devices():
+    """Test that the lookups see devices added or replaced after creation."""
+    response = DeviceDetailResponse(result="success")
+    assert response.by_serial("123") is None
+
+    pvs = PVSDeviceDetail(DEVICE_TYPE="PVS", SERIAL="123")
+    response.devices = [pvs]
+    assert response.pvs is pvs
+    assert response.by_serial("123") is pvs
+
+    inverter = SolarBridgeDeviceDetail(DEVICE_TYPE="Inverter", SERIAL="456")
+    response.devices.append(inverter)
+    assert response.inverters == [inverter]
+    assert response.by_serial("456") is inverter
+
+    # Returned lists are copies
+    response.inverters.clear()
+    assert response.inverters == [inverter]
+
+
+def test_device_detail_response_equality_ignores_indexes():
+    """Test that indexed and not yet indexed responses still compare equal."""
+    pvs = PVSDeviceDetail(DEVICE_TYPE="PVS", SERIAL="123")
+    first = DeviceDetailResponse(devices=[pvs], result="success")
+    second = DeviceDetailResponse(devices=[pvs], result="success")
+    assert first.by_serial("123") is pvs
+    assert first == second
+    assert first != DeviceDetailResponse(devices=[], result="success")
+
+
 def test_device_detail_response_pvs_multiple():
     """Test DeviceDetailResponse.pvs raises error with multiple PVS devices."""
     # Create a response with multiple PVS devices
@@ -0,0 +1,225 @@
+"""Tests for the asynchronous clients in the sungazer.client module."""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+
+from sungazer.client import (
+    AsyncBaseClient,
+    AsyncDeviceClient,
+    AsyncFirmwareClient,
+    AsyncGridProfileClient,
+    AsyncNetworkClient,
+    AsyncSessionClient,
+    AsyncSungazerClient,
+)
+from sungazer.models import (
+    CheckFWResponse,
+    DeviceDetailResponse,
+    GetCommResponse,
+    GridProfileGetResponse,
+    GridProfileRefreshResponse,
+    StartResponse,
+    StopResponse,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(command: str, name: str | None = None) -> dict:
+    """Load a fixture payload for ``command``."""
+    fixture_path = FIXTURES / command / f"{name or command}.json"
+    with fixture_path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ok_response(data: dict) -> Mock:
+    """Build a mock 200 response carrying ``data``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.content = json.dumps(data).encode()
+    mock_response.text = json.dumps(data)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+def error_response(status_code: int) -> Mock:
+    """Build a mock response that raises for ``status_code``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.status_code = status_code
+    mock_response.json.return_value = {"error": "Internal server error"}
+    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        f"{status_code} Error", request=Mock(), response=mock_response
+    )
+    return mock_response
+
+
+@pytest.fixture
+def mock_async_client():
+    """Create a mock httpx async client."""
+    return Mock(spec=httpx.AsyncClient)
+
+
+class TestAsyncBaseClient:
+    """Test cases for the AsyncBaseClient class."""
+
+    def test_get_request_success(self, mock_async_client):
+        """Test successful GET request."""
+        data = load_fixture("Start")
+        mock_async_client.get.return_value = ok_response(data)
+        client = AsyncBaseClient(mock_async_client, serial="TEST123")
+
+        result = asyncio.run(client._get("/test", StartResponse, {"param": "value"}))  # noqa: SLF001
+        assert isinstance(result, StartResponse)
+        mock_async_client.get.assert_awaited_once_with(
+            "/test", params={"param": "value"}
+        )
+
+    def test_get_request_without_model(self, mock_async_client):
+        """Test GET request without model class."""
+        mock_response = Mock(spec=httpx.Response)
+        mock_response.text = '{"result": "success"}'
+        mock_async_client.get.return_value = mock_response
+        client = AsyncBaseClient(mock_async_client)
+
+        result = asyncio.run(client._get("/test"))  # noqa: SLF001
+        assert result == {"result": "success"}
+
+    def test_handle_response_is_shared(self, mock_async_client):
+        """Test that header contamination is handled like the sync client."""
+        data = load_fixture("Stop")
+        mock_response = ok_response(data)
+        mock_response.content = b"HTTP/1.1 200 OK\n" + json.dumps(data).encode()
+        mock_response.text = "HTTP/1.1 200 OK\n" + json.dumps(data)
+        mock_async_client.get.return_value = mock_response
+        client = AsyncBaseClient(mock_async_client)
+
+        result = asyncio.run(client._get("/dl_cgi", StopResponse))  # noqa: SLF001
+        assert isinstance(result, StopResponse)
+
+
+class TestAsyncSubClients:
+    """Test cases for the asynchronous specialized clients."""
+
+    def test_session_start_and_stop(self, mock_async_client):
+        """Test session start and stop."""
+        client = AsyncSessionClient(mock_async_client)
+        mock_async_client.get.return_value = ok_response(load_fixture("Start"))
+        assert isinstance(asyncio.run(client.start()), StartResponse)
+        mock_async_client.get.return_value = ok_response(load_fixture("Stop"))
+        assert isinstance(asyncio.run(client.stop()), StopResponse)
+
+    def test_session_start_http_500_error(self, mock_async_client):
+        """Test session start with HTTP 500 error."""
+        mock_async_client.get.return_value = error_response(500)
+        client = AsyncSessionClient(mock_async_client)
+        with pytest.raises(ValueError, match="Start failed"):
+            asyncio.run(client.start())
+
+    def test_network_list(self, mock_async_client):
+        """Test network interface listing."""
+        mock_async_client.get.return_value = ok_response(load_fixture("Get_Comm"))
+        client = AsyncNetworkClient(mock_async_client, serial="TEST123")
+        assert isinstance(asyncio.run(client.list()), GetCommResponse)
+        mock_async_client.get.assert_awaited_once_with(
+            "/dl_cgi", params={"Command": "Get_Comm", "SerialNumber": "TEST123"}
+        )
+
+    def test_network_list_http_500_error(self, mock_async_client):
+        """Test network interface listing with HTTP 500 error."""
+        mock_async_client.get.return_value = error_response(500)
+        client = AsyncNetworkClient(mock_async_client)
+        with pytest.raises(ValueError, match="Failed to list interfaces"):
+            asyncio.run(client.list())
+
+    def test_device_list(self, mock_async_client):
+        """Test device listing."""
+        data = load_fixture("DeviceList")
+        mock_async_client.get.return_value = ok_response(data)
+        client = AsyncDeviceClient(mock_async_client)
+        result = asyncio.run(client.list())
+        assert isinstance(result, DeviceDetailResponse)
+        assert result.devices is not None
+        assert len(result.devices) == len(data["devices"])
+
+    def test_firmware_check(self, mock_async_client):
+        """Test firmware check."""
+        mock_async_client.get.return_value = ok_response(load_fixture("CheckFW"))
+        client = AsyncFirmwareClient(mock_async_client)
+        assert isinstance(asyncio.run(client.check()), CheckFWResponse)
+
+    def test_grid_profile_get_and_refresh(self, mock_async_client):
+        """Test grid profile get and refresh."""
+        client = AsyncGridProfileClient(mock_async_client)
+        mock_async_client.get.return_value = ok_response(load_fixture("GridProfileGet"))
+        assert isinstance(asyncio.run(client.get()), GridProfileGetResponse)
+        mock_async_client.get.return_value = ok_response(
+            load_fixture("GridProfileRefresh")
+        )
+        assert isinstance(asyncio.run(client.refresh()), GridProfileRefreshResponse)
+
+    def test_grid_profile_get_http_500_error(self, mock_async_client):
+        """Test grid profile get with HTTP 500 error."""
+        mock_async_client.get.return_value = error_response(500)
+        client = AsyncGridProfileClient(mock_async_client)
+        with pytest.raises(ValueError, match="Failed to get grid profiles"):
+            asyncio.run(client.get())
+
+
+class TestAsyncSungazerClient:
+    """Test cases for the AsyncSungazerClient class."""
+
+    def test_initialization_defaults(self):
+        """Test AsyncSungazerClient initialization with default parameters."""
+        with patch("sungazer.client.httpx.AsyncClient") as mock_client_class:
+            mock_client = Mock()
+            mock_client_class.return_value = mock_client
+
+            client = AsyncSungazerClient(serial="TEST123")
+            assert client.client == mock_client
+            mock_client_class.assert_called_once_with(
+                base_url="http://sunpowerconsole.com/cgi-bin",
+                timeout=30,
+                verify=False,
+            )
+            assert isinstance(client.session, AsyncSessionClient)
+            assert isinstance(client.network, AsyncNetworkClient)
+            assert isinstance(client.devices, AsyncDeviceClient)
+            assert isinstance(client.firmware, AsyncFirmwareClient)
+            assert isinstance(client.grid_profiles, AsyncGridProfileClient)
+            assert client.devices.serial == "TEST123"
+            assert client.devices.client is client.client
+
+    def test_async_context_manager_closes_client(self):
+        """Test AsyncSungazerClient as an async context manager."""
+        mock_client = Mock(spec=httpx.AsyncClient)
+        mock_client.aclose = AsyncMock()
+
+        async def run():
+            async with AsyncSungazerClient(client=mock_client) as client:
+                assert isinstance(client, AsyncSungazerClient)
+
+        asyncio.run(run())
+        mock_client.aclose.assert_awaited_once()
+
+    def test_concurrent_calls_share_event_loop(self):
+        """Test that many devices can be polled concurrently on one loop."""
+        data = load_fixture("Get_Comm")
+        mock_client = Mock(spec=httpx.AsyncClient)
+
+        async def slow_get(*args, **kwargs):  # noqa: ARG001
+            await asyncio.sleep(0.01)
+            return ok_response(data)
+
+        mock_client.get.side_effect = slow_get
+        client = AsyncSungazerClient(client=mock_client)
+
+        async def run():
+            return await asyncio.gather(*(client.network.list() for _ in range(20)))
+
+        results = asyncio.run(run())
+        assert len(results) == 20
+        assert all(isinstance(r, GetCommResponse) for r in results)
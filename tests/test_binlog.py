@@ -0,0 +1,188 @@
+"""Tests for the sungazer.binlog module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from sungazer import binlog
+from sungazer.binlog import (
+    LAYOUTS,
+    BinlogError,
+    BinlogReader,
+    BinlogWriter,
+    convert_json,
+)
+from sungazer.models import DeviceDetailResponse, SolarBridgeDeviceDetail
+
+FIXTURES = Path(__file__).parent / "fixtures"
+DEVICE_LIST = FIXTURES / "DeviceList" / "DeviceList.json"
+
+
+@pytest.fixture
+def response() -> DeviceDetailResponse:
+    """Parse the DeviceList fixture."""
+    with DEVICE_LIST.open() as f:
+        return DeviceDetailResponse.new(json.load(f))
+
+
+@pytest.fixture
+def path(tmp_path) -> Path:
+    """Return the path of a new log."""
+    return tmp_path / "site.sgzlog"
+
+
+def logged(response: DeviceDetailResponse) -> list:
+    """Return the devices of ``response`` that can be logged."""
+    return [d for d in response.devices if d.SERIAL and d.DATATIME]
+
+
+def test_layouts_follow_models():
+    """Layouts are derived from the model fields, with fixed-width columns."""
+    layout = LAYOUTS[SolarBridgeDeviceDetail]
+    assert layout.kind == "inverter"
+    codes = dict(layout.columns)
+    assert codes["p_3phsum_kw"] == "d"
+    assert codes["stat_ind"] == "q"
+    assert codes["slave"] == "?"
+    assert codes["STATE"] == "I"
+    assert "MODEL" not in codes
+
+
+def test_round_trip(path, response):
+    """Every sample reads back with the values it was written with."""
+    with BinlogWriter(path) as log:
+        assert log.write(response) == len(logged(response))
+    with BinlogReader(path) as log:
+        records = list(log)
+        assert len(records) == len(logged(response))
+        for device, record in zip(logged(response), records, strict=True):
+            assert record.serial == device.SERIAL
+            assert record.DATATIME == device.DATATIME
+            row = record.to_dict()
+            for name in record.layout.names:
+                assert record[name] == getattr(device, name)
+                assert row[name] == getattr(device, name)
+
+
+def test_missing_values_round_trip(path, response):
+    """None values come back as None, not as zeros."""
+    pvs = response.pvs
+    assert pvs.dl_error_count is None
+    with BinlogWriter(path) as log:
+        log.write([pvs])
+    with BinlogReader(path) as log:
+        (record,) = list(log)
+        assert record["dl_error_count"] is None
+        assert record["dl_comm_err"] == pvs.dl_comm_err
+
+
+def test_strings_are_written_once(path, response):
+    """Serial numbers and text values go in the string table once."""
+    with BinlogWriter(path) as log:
+        log.write(response)
+        log.sync()
+        first = path.stat().st_size
+        log.write(response)
+        log.sync()
+        second = path.stat().st_size - first
+    assert second < first
+    with BinlogReader(path) as log:
+        assert len(list(log)) == 2 * len(logged(response))
+        assert len(log.strings) == len(set(log.strings))
+
+
+def test_append_to_existing_log(path, response):
+    """Reopening a log appends to it, reusing its string table."""
+    with BinlogWriter(path) as log:
+        log.write(response)
+    with BinlogWriter(path) as log:
+        log.write(response)
+    with BinlogReader(path) as log:
+        records = list(log)
+        assert len(records) == 2 * len(logged(response))
+        assert len(log.strings) == len(set(log.strings))
+        assert records[-1].DATATIME == logged(response)[-1].DATATIME
+
+
+def test_append_with_a_changed_layout(path, response, monkeypatch):
+    """Appending after a model's fields changed writes a new layout."""
+    current = LAYOUTS[SolarBridgeDeviceDetail]
+    older = binlog.RecordLayout(current.kind, current.columns[:-3])
+    monkeypatch.setitem(LAYOUTS, SolarBridgeDeviceDetail, older)
+    with BinlogWriter(path) as log:
+        log.write(response)
+    monkeypatch.setitem(LAYOUTS, SolarBridgeDeviceDetail, current)
+    with BinlogWriter(path) as log:
+        log.write(response)
+    with BinlogReader(path) as log:
+        records = [r for r in log if r.kind == "inverter"]
+        assert [layout.kind for layout in log.layouts].count("inverter") == 2
+        half = len(records) // 2
+        name = current.names[-1]
+        assert all(name not in record.layout.fields for record in records[:half])
+        for device, record in zip(response.inverters, records[half:], strict=True):
+            assert record.to_dict() == {
+                "SERIAL": device.SERIAL,
+                "DATATIME": device.DATATIME,
+                **{name: getattr(device, name) for name in current.names},
+            }
+
+
+def test_torn_tail_is_dropped(path, response):
+    """A frame cut short by a crash is ignored, then overwritten."""
+    with BinlogWriter(path) as log:
+        log.write(response)
+    with path.open("r+b") as f:
+        f.truncate(path.stat().st_size - 5)
+    with BinlogReader(path) as log:
+        assert len(list(log)) == len(logged(response)) - 1
+    with BinlogWriter(path) as log:
+        log.write(response)
+    with BinlogReader(path) as log:
+        assert len(list(log)) == 2 * len(logged(response)) - 1
+
+
+def test_not_a_log(tmp_path):
+    """Other files are rejected."""
+    path = tmp_path / "not.sgzlog"
+    path.write_bytes(b"{}")
+    with pytest.raises(BinlogError, match="not a sungazer binary log"):
+        BinlogReader(path)
+    with pytest.raises(BinlogError):
+        BinlogWriter(path)
+
+
+def test_records_need_an_open_reader(path, response):
+    """Records read values from the memory map, so not after it's closed."""
+    with BinlogWriter(path) as log:
+        log.write(response)
+    with BinlogReader(path) as log:
+        record = next(iter(log))
+    with pytest.raises(ValueError, match="released"):
+        record.to_dict()
+
+
+def test_fsync_interval(path, response, monkeypatch):
+    """fsync_interval=0 fsyncs every write; None only on close."""
+    calls = []
+    monkeypatch.setattr(binlog.os, "fsync", calls.append)
+    with BinlogWriter(path, fsync_interval=0) as log:
+        log.write(response)
+        log.write(response)
+        assert len(calls) == 2
+    calls.clear()
+    with BinlogWriter(path, fsync_interval=None) as log:
+        log.write(response)
+        log.write(response)
+        assert calls == []
+    assert len(calls) == 1
+
+
+def test_convert_json(path):
+    """Saved DeviceList bodies convert to a much smaller log."""
+    count = convert_json([DEVICE_LIST, DEVICE_LIST], path)
+    assert count > 0
+    assert path.stat().st_size < DEVICE_LIST.stat().st_size
+    with BinlogReader(path) as log:
+        assert len(list(log)) == count
@@ -0,0 +1,285 @@
+"""Tests for the sungazer.breaker module."""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from sungazer.breaker import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from sungazer.client import AsyncSungazerClient, SungazerClient
+from sungazer.fleet import FleetPoller, FleetTarget
+from sungazer.retry import RetryPolicy
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(command: str) -> dict:
+    """Load a fixture payload for ``command``."""
+    with (FIXTURES / command / f"{command}.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ok_response(data: dict) -> Mock:
+    """Build a mock 200 response carrying ``data``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = json.dumps(data).encode()
+    mock_response.text = json.dumps(data)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def fail():
+    msg = "timed out"
+    raise httpx.ConnectTimeout(msg)
+
+
+class TestCircuitBreaker:
+    """Test cases for the CircuitBreaker class."""
+
+    def test_opens_after_threshold(self, clock):
+        """Test that consecutive failures open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=3, clock=clock)
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectTimeout):
+                breaker.call(fail)
+        assert breaker.state is BreakerState.CLOSED
+        with pytest.raises(httpx.ConnectTimeout):
+            breaker.call(fail)
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.times_opened == 1
+
+    def test_success_resets_failure_count(self, clock):
+        """Test that only consecutive failures count."""
+        breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+        with pytest.raises(httpx.ConnectTimeout):
+            breaker.call(fail)
+        breaker.call(lambda: ok_response({}))
+        with pytest.raises(httpx.ConnectTimeout):
+            breaker.call(fail)
+        assert breaker.state is BreakerState.CLOSED
+
+    def test_open_breaker_fails_fast(self, clock):
+        """Test that calls are rejected without being sent while open."""
+        breaker = CircuitBreaker(
+            name="http://pvs", failure_threshold=1, cooldown=30, clock=clock
+        )
+        with pytest.raises(httpx.ConnectTimeout):
+            breaker.call(fail)
+        clock.now += 10
+        send = Mock()
+        with pytest.raises(CircuitOpenError, match="http://pvs") as exc_info:
+            breaker.call(send)
+        assert exc_info.value.retry_after == 20
+        send.assert_not_called()
+        assert breaker.rejected == 1
+
+    def test_half_open_trial_success_closes(self, clock):
+        """Test that a successful trial after the cooldown closes the breaker."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=30, clock=clock)
+        with pytest.raises(httpx.ConnectTimeout):
+            breaker.call(fail)
+        clock.now += 30
+        assert breaker.state is BreakerState.HALF_OPEN
+        breaker.call(lambda: ok_response({}))
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.consecutive_failures == 0
+
+    def test_half_open_trial_failure_reopens(self, clock):
+        """Test that a failed trial re-opens the breaker for a new cooldown."""
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=30, clock=clock)
+        for _ in range(3):
+            with pytest.raises(httpx.ConnectTimeout):
+                breaker.call(fail)
+        clock.now += 30
+        with pytest.raises(httpx.ConnectTimeout):
+            breaker.call(fail)
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.times_opened == 2
+        assert breaker.status().retry_after == 30
+
+    def test_half_open_limits_trial_calls(self, clock):
+        """Test that only half_open_max_calls trials run at once."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0, clock=clock)
+        with pytest.raises(httpx.ConnectTimeout):
+            breaker.call(fail)
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.release()
+        breaker.before_call()
+
+    def test_failure_status_codes(self, clock):
+        """Test that 503 responses trip the breaker but 500s do not."""
+        breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+        response = ok_response({})
+        response.status_code = 500
+        assert breaker.call(lambda: response) is response
+        assert breaker.state is BreakerState.CLOSED
+        response.status_code = 503
+        breaker.call(lambda: response)
+        assert breaker.state is BreakerState.OPEN
+
+    def test_other_exceptions_do_not_count(self, clock):
+        """Test that non-transport errors pass through without tripping."""
+        breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+
+        def boom():
+            msg = "bug"
+            raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError):
+            breaker.call(boom)
+        assert breaker.state is BreakerState.CLOSED
+
+    def test_async_call(self, clock):
+        """Test that acall records failures and fails fast."""
+        breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+
+        async def afail():
+            fail()
+
+        async def run():
+            with pytest.raises(httpx.ConnectTimeout):
+                await breaker.acall(afail)
+            with pytest.raises(CircuitOpenError):
+                await breaker.acall(afail)
+
+        asyncio.run(run())
+        assert breaker.rejected == 1
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"failure_threshold": 0}, "failure_threshold"),
+            ({"half_open_max_calls": 0}, "half_open_max_calls"),
+            ({"cooldown": -1}, "cooldown"),
+        ],
+    )
+    def test_invalid_settings(self, kwargs, match):
+        """Test that nonsensical settings are rejected."""
+        with pytest.raises(ValueError, match=match):
+            CircuitBreaker(**kwargs)
+
+
+class TestCircuitBreakerRegistry:
+    """Test cases for the CircuitBreakerRegistry class."""
+
+    def test_one_breaker_per_base_url(self):
+        """Test that the same base URL always gets the same breaker."""
+        registry = CircuitBreakerRegistry(failure_threshold=2)
+        breaker = registry.get("http://a")
+        assert registry.get("http://a") is breaker
+        assert registry.get("http://b") is not breaker
+        assert breaker.failure_threshold == 2
+        assert breaker.name == "http://a"
+
+    def test_state_and_snapshot(self, clock):
+        """Test the monitoring views."""
+        registry = CircuitBreakerRegistry(failure_threshold=1, clock=clock)
+        assert registry.state("http://never") is BreakerState.CLOSED
+        with pytest.raises(httpx.ConnectTimeout):
+            registry.get("http://a").call(fail)
+        registry.get("http://b")
+        assert registry.state("http://a") is BreakerState.OPEN
+        snapshot = {status.name: status for status in registry.snapshot()}
+        assert snapshot["http://a"].state is BreakerState.OPEN
+        assert snapshot["http://a"].consecutive_failures == 1
+        assert snapshot["http://b"].state is BreakerState.CLOSED
+        assert snapshot["http://b"].retry_after is None
+
+
+class TestClientBreaker:
+    """Test circuit breaking through the clients."""
+
+    def test_client_fails_fast_when_open(self, clock):
+        """Test that an unreachable device is skipped once the breaker opens."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.side_effect = httpx.ConnectTimeout("timed out")
+        breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+        client = SungazerClient(client=mock_client, breaker=breaker)
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectTimeout):
+                client.devices.list()
+        with pytest.raises(CircuitOpenError):
+            client.devices.list()
+        assert mock_client.get.call_count == 2
+
+    def test_retries_count_as_one_call(self, clock):
+        """Test that an exhausted retry loop records a single failure."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.side_effect = httpx.ConnectTimeout("timed out")
+        breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+        retry = RetryPolicy(max_attempts=3, sleep=lambda _: None)
+        client = SungazerClient(client=mock_client, retry=retry, breaker=breaker)
+        with pytest.raises(httpx.ConnectTimeout):
+            client.devices.list()
+        assert mock_client.get.call_count == 3
+        assert breaker.consecutive_failures == 1
+        assert breaker.state is BreakerState.CLOSED
+
+    def test_fleet_shares_breakers_across_sweeps(self):
+        """Test that the fleet poller skips units whose breaker is open."""
+        registry = CircuitBreakerRegistry(failure_threshold=1, cooldown=600)
+        calls: dict[str, int] = {}
+        payloads = {
+            "DeviceList": load_fixture("DeviceList"),
+            "Get_Comm": load_fixture("Get_Comm"),
+        }
+
+        def factory(target: FleetTarget) -> AsyncSungazerClient:
+            mock_client = Mock(spec=httpx.AsyncClient)
+
+            async def get(path, params=None):  # noqa: ARG001
+                calls[target.base_url] = calls.get(target.base_url, 0) + 1
+                if target.base_url == "http://down":
+                    msg = "timed out"
+                    raise httpx.ConnectTimeout(msg)
+                return ok_response(payloads[params["Command"]])
+
+            mock_client.get.side_effect = get
+            return AsyncSungazerClient(
+                client=mock_client, breaker=registry.get(target.base_url)
+            )
+
+        targets = [("http://up", "A"), ("http://down", "B")]
+        FleetPoller(targets, client_factory=factory).run()
+        results = {
+            r.target.base_url: r
+            for r in FleetPoller(targets, client_factory=factory).run()
+        }
+        assert results["http://up"].ok
+        assert isinstance(results["http://down"].exception, CircuitOpenError)
+        assert calls == {"http://up": 4, "http://down": 1}
+
+    def test_fleet_default_factory_uses_registry(self):
+        """Test that FleetPoller hands each client its target's breaker."""
+        registry = CircuitBreakerRegistry()
+        poller = FleetPoller([("http://pvs", None)], breakers=registry)
+        client = poller.client_factory(poller.targets[0])
+        assert client.breaker is registry.get("http://pvs")
+        assert client.devices.breaker is client.breaker
+        asyncio.run(client.close())
@@ -0,0 +1,389 @@
+"""Tests for the sungazer.cache module."""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from sungazer.cache import DEFAULT_TTLS, DiskCache, ResponseCache, TTLCache
+from sungazer.cli.main import cli
+from sungazer.client import AsyncSungazerClient, SungazerClient
+from sungazer.models import GetCommResponse
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(command: str) -> dict:
+    """Load a fixture payload for ``command``."""
+    with (FIXTURES / command / f"{command}.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ok_response(data: dict) -> Mock:
+    """Build a mock 200 response carrying ``data``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.content = json.dumps(data).encode()
+    mock_response.text = json.dumps(data)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Test cases for the TTLCache class."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_default_ttls(self):
+        """Test the per-command defaults."""
+        cache = TTLCache()
+        assert cache.ttl_for("Get_Comm") == DEFAULT_TTLS["Get_Comm"] == 60
+        assert cache.ttl_for("CheckFW") == 3600
+        assert cache.ttl_for("GridProfileGet") == 86400
+        assert cache.ttl_for("DeviceList") == 0
+        assert cache.ttl_for(None) == 0
+
+    def test_set_and_get(self, clock):
+        """Test that a fresh entry is returned."""
+        cache = TTLCache(clock=clock)
+        value = object()
+        cache.set("k", value, command="Get_Comm")
+        assert cache.get("k") is value
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_entries_expire(self, clock):
+        """Test that entries expire after their command's TTL."""
+        cache = TTLCache(clock=clock)
+        cache.set("k", "v", command="Get_Comm")
+        clock.now += 59
+        assert cache.get("k") == "v"
+        clock.now += 1
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_uncached_commands_are_ignored(self, clock):
+        """Test that commands without a TTL are never stored."""
+        cache = TTLCache(clock=clock)
+        cache.set("k", "v", command="Start")
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_custom_ttls_and_default(self, clock):
+        """Test overriding the TTL table and default."""
+        cache = TTLCache({"DeviceList": 5}, default_ttl=1, clock=clock)
+        assert cache.ttl_for("DeviceList") == 5
+        assert cache.ttl_for("Get_Comm") == 1
+
+    def test_lru_eviction(self, clock):
+        """Test that the least recently used entry is evicted first."""
+        cache = TTLCache(maxsize=2, clock=clock)
+        cache.set("a", 1, command="CheckFW")
+        cache.set("b", 2, command="CheckFW")
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.set("c", 3, command="CheckFW")
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_invalidate_by_command(self, clock):
+        """Test dropping only one command's entries."""
+        cache = TTLCache(clock=clock)
+        cache.set("a", 1, command="CheckFW")
+        cache.set("b", 2, command="Get_Comm")
+        cache.invalidate("CheckFW")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_invalid_maxsize(self):
+        """Test that a non-positive maxsize is rejected."""
+        with pytest.raises(ValueError, match="maxsize"):
+            TTLCache(maxsize=0)
+
+    def test_base_class_is_abstract(self):
+        """Test that the ResponseCache interface must be implemented."""
+        with pytest.raises(TypeError, match="abstract"):
+            ResponseCache()
+
+        class Partial(ResponseCache):
+            def get(self, key):
+                pass
+
+            def set(self, key, value, command=None):
+                pass
+
+        with pytest.raises(TypeError, match="invalidate"):
+            Partial()
+
+        class Complete(Partial):
+            def invalidate(self, command=None):
+                pass
+
+        assert Complete().get("k") is None
+
+
+class TestClientCache:
+    """Test response caching through the clients."""
+
+    def test_cache_hit_skips_request_and_validation(self):
+        """Test that a cached response is returned without a GET."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.return_value = ok_response(load_fixture("Get_Comm"))
+        client = SungazerClient(client=mock_client, serial="SN", cache=TTLCache())
+
+        first = client.network.list()
+        second = client.network.list()
+        assert isinstance(first, GetCommResponse)
+        assert second is first
+        assert mock_client.get.call_count == 1
+
+    def test_device_list_is_not_cached_by_default(self):
+        """Test that DeviceList always goes to the device."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.return_value = ok_response(load_fixture("DeviceList"))
+        client = SungazerClient(client=mock_client, cache=TTLCache())
+
+        client.devices.list()
+        client.devices.list()
+        assert mock_client.get.call_count == 2
+
+    def test_session_stop_invalidates_cache(self):
+        """Test that stopping the session drops cached responses."""
+        mock_client = Mock(spec=httpx.Client)
+        client = SungazerClient(client=mock_client, cache=TTLCache())
+
+        mock_client.get.return_value = ok_response(load_fixture("CheckFW"))
+        client.firmware.check()
+        assert len(client.cache) == 1
+        mock_client.get.return_value = ok_response(load_fixture("Stop"))
+        client.session.stop()
+        assert len(client.cache) == 0
+
+    def test_shared_cache_is_keyed_by_site(self):
+        """Test that clients of different sites sharing a cache don't mix."""
+        hosts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            return httpx.Response(200, json=load_fixture("GridProfileGet"))
+
+        cache = TTLCache()
+        a, b, c = (
+            SungazerClient(
+                client=httpx.Client(
+                    base_url=f"http://{host}/cgi-bin",
+                    transport=httpx.MockTransport(handler),
+                ),
+                serial=serial,
+                cache=cache,
+            )
+            for host, serial in (
+                ("10.0.0.1", "SN1"),
+                ("10.0.0.2", "SN2"),
+                ("10.0.0.1", "SN3"),
+            )
+        )
+        first = a.grid_profiles.get()
+        assert b.grid_profiles.get() is not first
+        assert c.grid_profiles.get() is not first
+        assert a.grid_profiles.get() is first
+        assert hosts == ["10.0.0.1", "10.0.0.2", "10.0.0.1"]
+        assert len(cache) == 3
+
+    def test_async_client_uses_cache(self):
+        """Test that the async client honours the cache."""
+        mock_client = Mock(spec=httpx.AsyncClient)
+        mock_client.get.return_value = ok_response(load_fixture("GridProfileGet"))
+        cache = TTLCache()
+        client = AsyncSungazerClient(client=mock_client, cache=cache)
+
+        async def run():
+            return await client.grid_profiles.get(), await client.grid_profiles.get()
+
+        first, second = asyncio.run(run())
+        assert second is first
+        assert mock_client.get.await_count == 1
+        assert cache.hits == 1
+
+
+class TestDiskCache:
+    """Test cases for the DiskCache class."""
+
+    def test_miss_fetches_and_stores(self, tmp_path):
+        """Test that a miss calls fetch and persists the raw bytes."""
+        cache = DiskCache(tmp_path / "cache")
+        fetch = Mock(return_value=b'{"url": "none"}')
+
+        assert cache.get_or_fetch("http://pvs", "SN", "CheckFW", fetch) == (
+            b'{"url": "none"}'
+        )
+        assert cache.get_or_fetch("http://pvs", "SN", "CheckFW", fetch) == (
+            b'{"url": "none"}'
+        )
+        assert fetch.call_count == 1
+        assert cache.get("http://pvs", "SN", "CheckFW") == b'{"url": "none"}'
+
+    def test_entries_are_keyed_by_device_and_command(self, tmp_path):
+        """Test that base_url, serial and command all distinguish entries."""
+        cache = DiskCache(tmp_path)
+        paths = {
+            cache.path_for("http://a", "SN1", "CheckFW"),
+            cache.path_for("http://b", "SN1", "CheckFW"),
+            cache.path_for("http://a", "SN2", "CheckFW"),
+            cache.path_for("http://a", "SN1", "Get_Comm"),
+        }
+        assert len(paths) == 4
+
+    def test_stale_entries_are_refetched(self, tmp_path):
+        """Test that entries older than max_age are ignored."""
+        cache = DiskCache(tmp_path, max_age=60)
+        cache.get_or_fetch("http://pvs", None, "CheckFW", lambda: b"old")
+        path = cache.path_for("http://pvs", None, "CheckFW")
+        header, body = path.read_bytes().split(b"\n", 1)
+        stale = json.loads(header)
+        stale["stored_at"] -= 61
+        path.write_bytes(json.dumps(stale).encode() + b"\n" + body)
+
+        assert cache.get("http://pvs", None, "CheckFW") is None
+        assert (
+            cache.get_or_fetch("http://pvs", None, "CheckFW", lambda: b"new") == b"new"
+        )
+
+    def test_fetch_errors_are_not_cached(self, tmp_path):
+        """Test that nothing is written when the fetch raises."""
+        cache = DiskCache(tmp_path)
+
+        def fail():
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_fetch("http://pvs", None, "CheckFW", fail)
+        assert cache.get("http://pvs", None, "CheckFW") is None
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_concurrent_misses_fetch_once(self, tmp_path):
+        """Test that the entry lock lets only one caller refresh an entry."""
+        cache = DiskCache(tmp_path)
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return b"body"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(
+                pool.map(
+                    lambda _: cache.get_or_fetch(
+                        "http://pvs", "SN", "Get_Comm", slow_fetch
+                    ),
+                    range(4),
+                )
+            )
+        assert results == [b"body"] * 4
+        assert len(calls) == 1
+
+    def test_invalidate(self, tmp_path):
+        """Test deleting one entry or all of them."""
+        cache = DiskCache(tmp_path)
+        cache.get_or_fetch("http://pvs", None, "CheckFW", lambda: b"a")
+        cache.get_or_fetch("http://pvs", None, "Get_Comm", lambda: b"b")
+        cache.invalidate("http://pvs", None, "CheckFW")
+        assert cache.get("http://pvs", None, "CheckFW") is None
+        assert cache.get("http://pvs", None, "Get_Comm") == b"b"
+        cache.invalidate()
+        assert cache.get("http://pvs", None, "Get_Comm") is None
+
+    def test_partial_invalidate_keeps_other_entries(self, tmp_path):
+        """Test that invalidating by some of the key only drops matches."""
+        cache = DiskCache(tmp_path)
+        entries = [
+            ("http://a", "SN1", "CheckFW"),
+            ("http://a", "SN1", "Get_Comm"),
+            ("http://b", "SN2", "CheckFW"),
+            ("http://b", "SN2", "Get_Comm"),
+        ]
+        for entry in entries:
+            cache.get_or_fetch(*entry, lambda: b"body")
+
+        def remaining():
+            return [entry for entry in entries if cache.get(*entry) is not None]
+
+        cache.invalidate(command="CheckFW")
+        assert remaining() == [entries[1], entries[3]]
+        cache.invalidate(serial="SN2")
+        assert remaining() == [entries[1]]
+        cache.invalidate(base_url="http://b")
+        assert remaining() == [entries[1]]
+        cache.invalidate(base_url="http://a")
+        assert remaining() == []
+
+    def test_client_uses_disk_cache_for_covered_commands(self, tmp_path):
+        """Test that the client reads covered commands through the disk cache."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.base_url = httpx.URL("http://pvs/cgi-bin/")
+        disk_cache = DiskCache(tmp_path)
+
+        mock_client.get.return_value = ok_response(load_fixture("Get_Comm"))
+        first = SungazerClient(client=mock_client, serial="SN", disk_cache=disk_cache)
+        assert isinstance(first.network.list(), GetCommResponse)
+        # A second "process" with a fresh client is served from disk
+        second = SungazerClient(client=mock_client, serial="SN", disk_cache=disk_cache)
+        assert isinstance(second.network.list(), GetCommResponse)
+        assert mock_client.get.call_count == 1
+
+        # DeviceList is not covered, so it always goes to the device
+        mock_client.get.return_value = ok_response(load_fixture("DeviceList"))
+        second.devices.list()
+        second.devices.list()
+        assert mock_client.get.call_count == 3
+
+    def test_client_http_errors_are_not_cached(self, tmp_path):
+        """Test that a 500 from the device still surfaces as a ValueError."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.base_url = httpx.URL("http://pvs/cgi-bin/")
+        mock_response = Mock(spec=httpx.Response)
+        mock_response.status_code = 500
+        mock_response.json.return_value = {"error": "Internal server error"}
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "500 Internal Server Error", request=Mock(), response=mock_response
+        )
+        mock_client.get.return_value = mock_response
+        client = SungazerClient(client=mock_client, disk_cache=DiskCache(tmp_path))
+
+        with pytest.raises(ValueError, match="Failed to get firmware info"):
+            client.firmware.check()
+        assert not list(tmp_path.glob("*.cache"))
+
+    def test_cli_cache_options(self, tmp_path):
+        """Test that --cache-dir makes the CLI reuse responses between runs."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.base_url = httpx.URL("http://pvs/cgi-bin/")
+        mock_client.get.return_value = ok_response(load_fixture("GridProfileGet"))
+        runner = CliRunner()
+        args = ["--cache-dir", str(tmp_path), "--cache-max-age", "600"]
+        with patch("sungazer.client.httpx.Client", return_value=mock_client):
+            for _ in range(2):
+                result = runner.invoke(cli, [*args, "grid-profile", "get"])
+                assert result.exit_code == 0, result.output
+                assert json.loads(result.output)["result"] == "succeed"
+        assert mock_client.get.call_count == 1
@@ -1,5 +1,6 @@
 """Tests for the sungazer.client module."""
 
+import asyncio
 import json
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -8,6 +9,7 @@ import httpx
 import pytest
 
 from sungazer.client import (
+    AsyncSungazerClient,
     BaseClient,
     DeviceClient,
     FirmwareClient,
@@ -22,6 +24,7 @@ from sungazer.models import (
     GetCommResponse,
     GridProfileGetResponse,
     GridProfileRefreshResponse,
+    LazyDeviceDetailResponse,
     StartResponse,
     StopResponse,
 )
@@ -397,6 +400,71 @@ class TestDeviceClient:
         assert isinstance(result, DeviceDetailResponse)
 
 
+class TestDeviceClientTolerant:
+    """Test tolerant DeviceList requests through the clients."""
+
+    @pytest.fixture
+    def body(self) -> bytes:
+        """Build a DeviceList body with one invalid and one unknown device."""
+        fixture_path = (
+            Path(__file__).parent / "fixtures" / "DeviceList" / "DeviceList.json"
+        )
+        with Path(fixture_path).open(encoding="utf-8") as f:
+            payload = json.load(f)
+        inverter = next(d for d in payload["devices"] if d["DEVICE_TYPE"] == "Inverter")
+        inverter["p_3phsum_kw"] = "n/a"
+        payload["devices"].append({"DEVICE_TYPE": "Toaster", "SERIAL": "T1"})
+        return json.dumps(payload).encode()
+
+    @staticmethod
+    def client(body: bytes) -> SungazerClient:
+        """Build a client whose device answers every request with ``body``."""
+        transport = httpx.MockTransport(lambda _: httpx.Response(200, content=body))
+        return SungazerClient(
+            client=httpx.Client(base_url="http://pvs/cgi-bin", transport=transport)
+        )
+
+    def test_list_raises_by_default(self, body):
+        """Test that one bad record fails the whole response without tolerant."""
+        with pytest.raises(ValueError, match="Unknown device type: Toaster"):
+            self.client(body).devices.list()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_list_tolerant(self, body, stream):
+        """Test that list(tolerant=True) keeps every valid device."""
+        response = self.client(body).devices.list(stream=stream, tolerant=True)
+        assert isinstance(response, DeviceDetailResponse)
+        assert len(response.inverters) == 11
+        assert response.pvs is not None
+        assert response.rejected_count == 2
+        assert [d.DEVICE_TYPE for d in response.unknown_devices] == ["Toaster"]
+        assert response.invalid_devices[0].errors[0].startswith("p_3phsum_kw: ")
+
+    def test_list_lazy_tolerant(self, body):
+        """Test that lazy tolerant requests set aside unknown device types."""
+        response = self.client(body).devices.list(lazy=True, tolerant=True)
+        assert isinstance(response, LazyDeviceDetailResponse)
+        assert [d.SERIAL for d in response.unknown_devices] == ["T1"]
+        assert len(response.inverters) == 12
+
+    def test_async_list_tolerant(self, body):
+        """Test the async tolerant API."""
+
+        async def run():
+            transport = httpx.MockTransport(lambda _: httpx.Response(200, content=body))
+            http = httpx.AsyncClient(base_url="http://pvs/cgi-bin", transport=transport)
+            async with AsyncSungazerClient(client=http) as client:
+                return (
+                    await client.devices.list(tolerant=True),
+                    await client.devices.list(stream=True, tolerant=True),
+                )
+
+        response, streamed = asyncio.run(run())
+        assert response == streamed
+        assert response.rejected_count == 2
+        assert len(response.inverters) == 11
+
+
 class TestFirmwareClient:
     """Test cases for the FirmwareClient class."""
 
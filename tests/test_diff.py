@@ -0,0 +1,162 @@
+"""Tests for the sungazer.diff module."""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from sungazer.diff import (
+    DeviceDelta,
+    SnapshotDiff,
+    SnapshotDiffer,
+    apply_diff,
+    device_records,
+    diff_snapshots,
+)
+from sungazer.models import DeviceDetailResponse
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def payload() -> dict:
+    """Load the decoded DeviceList fixture."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        return json.load(f)
+
+
+def next_poll(payload: dict) -> dict:
+    """Return a copy of ``payload`` with the first inverter's power changed."""
+    later = copy.deepcopy(payload)
+    inverter = next(d for d in later["devices"] if d["DEVICE_TYPE"] == "Inverter")
+    inverter["p_3phsum_kw"] = "0.2315"
+    inverter["DATATIME"] = "2025,06,22,00,20,54"
+    return later
+
+
+def first_inverter(payload: dict) -> dict:
+    """Return the first inverter record of ``payload``."""
+    return next(d for d in payload["devices"] if d["DEVICE_TYPE"] == "Inverter")
+
+
+class TestDeviceRecords:
+    """Test cases for device_records()."""
+
+    def test_payload(self, payload):
+        """Test keying the records of a decoded body."""
+        records = device_records(payload)
+        assert len(records) == len(payload["devices"])
+        for record in payload["devices"]:
+            assert records[record["SERIAL"]] is record
+
+    def test_response(self, payload):
+        """Test that responses are dumped, one record per device."""
+        response = DeviceDetailResponse.new(payload)
+        records = device_records(response)
+        assert set(records) == {d.SERIAL for d in response.devices}
+        assert records[response.pvs.SERIAL] == response.pvs.model_dump()
+
+    def test_records_without_serial_are_skipped(self):
+        """Test that records that can't be keyed are left out."""
+        records = device_records([{"SERIAL": "A"}, {"MODEL": "x"}, "junk"])
+        assert list(records) == ["A"]
+
+
+class TestDiffSnapshots:
+    """Test cases for diff_snapshots()."""
+
+    def test_no_changes(self, payload):
+        """Test that identical snapshots give an empty diff."""
+        diff = diff_snapshots(payload, copy.deepcopy(payload))
+        assert diff.is_empty
+        assert diff == SnapshotDiff()
+
+    def test_changed_fields_only(self, payload):
+        """Test that only the fields that changed are reported."""
+        diff = diff_snapshots(payload, next_poll(payload))
+        assert diff.added == []
+        assert diff.removed == []
+        assert diff.changed == [
+            DeviceDelta(
+                SERIAL=first_inverter(payload)["SERIAL"],
+                changed={
+                    "p_3phsum_kw": "0.2315",
+                    "DATATIME": "2025,06,22,00,20,54",
+                },
+            )
+        ]
+
+    def test_ignore(self, payload):
+        """Test that ignored fields never count as changed."""
+        later = copy.deepcopy(payload)
+        first_inverter(later)["DATATIME"] = "2025,06,22,00,20,54"
+        assert diff_snapshots(payload, later, ignore=["DATATIME"]).is_empty
+        diff = diff_snapshots(payload, next_poll(payload), ignore=["DATATIME"])
+        assert diff.changed[0].changed == {"p_3phsum_kw": "0.2315"}
+
+    def test_removed_fields(self, payload):
+        """Test that fields a device stops reporting are listed."""
+        later = copy.deepcopy(payload)
+        del first_inverter(later)["t_htsnk_degc"]
+        (delta,) = diff_snapshots(payload, later).changed
+        assert delta.changed == {}
+        assert delta.removed == ["t_htsnk_degc"]
+
+    def test_added_and_removed_devices(self, payload):
+        """Test that devices appearing and disappearing are reported."""
+        later = copy.deepcopy(payload)
+        gone = later["devices"].pop()
+        new = dict(first_inverter(payload), SERIAL="E00199999999999")
+        later["devices"].append(new)
+        diff = diff_snapshots(payload, later)
+        assert diff.added == [new]
+        assert diff.removed == [gone["SERIAL"]]
+        assert diff.changed == []
+
+    def test_responses(self, payload):
+        """Test diffing validated responses."""
+        diff = diff_snapshots(
+            DeviceDetailResponse.new(payload),
+            DeviceDetailResponse.new(next_poll(payload)),
+        )
+        (delta,) = diff.changed
+        assert delta.changed["p_3phsum_kw"] == 0.2315
+        assert set(delta.changed) == {"p_3phsum_kw", "DATATIME"}
+
+    def test_apply_round_trip(self, payload):
+        """Test that applying the diff rebuilds the later snapshot."""
+        later = next_poll(payload)
+        later["devices"].pop(0)
+        del first_inverter(later)["freq_hz"]
+        later["devices"].append({"SERIAL": "NEW", "DEVICE_TYPE": "Inverter"})
+        diff = diff_snapshots(payload, later)
+        assert apply_diff(device_records(payload), diff) == device_records(later)
+
+    def test_json_is_smaller(self, payload):
+        """Test that a diff is much smaller than the full snapshot."""
+        later = next_poll(payload)
+        diff = diff_snapshots(payload, later)
+        full = DeviceDetailResponse.new(later).model_dump_json()
+        assert len(diff.model_dump_json()) * 10 < len(full)
+
+
+class TestSnapshotDiffer:
+    """Test cases for the SnapshotDiffer class."""
+
+    def test_stream(self, payload):
+        """Test diffing each snapshot against the one before it."""
+        differ = SnapshotDiffer(ignore=["CURTIME"])
+        first = differ.update(payload)
+        assert len(first.added) == len(payload["devices"])
+        assert differ.update(copy.deepcopy(payload)).is_empty
+        later = next_poll(payload)
+        assert len(differ.update(later).changed) == 1
+        assert differ.update(later).is_empty
+
+    def test_reset(self, payload):
+        """Test that reset() makes the next snapshot report in full."""
+        differ = SnapshotDiffer()
+        differ.update(payload)
+        differ.reset()
+        assert len(differ.update(payload).added) == len(payload["devices"])
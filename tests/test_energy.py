@@ -0,0 +1,176 @@
+"""Tests for the sungazer.energy module."""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sungazer.energy import EnergyAccount, EnergySource, pvs_restarts, restart_times
+from sungazer.models import DeviceDetailResponse
+from sungazer.store import DeviceStore
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+#: 2025-06-22 00:00:00 UTC
+MIDNIGHT = 1750550400
+
+
+def account(counters, powers=0.6, **kwargs) -> EnergyAccount:
+    """Account for 1-minute samples of one inverter, ``"A"``."""
+    counters = np.array(counters, dtype=np.float64)
+    powers = np.broadcast_to(np.asarray(powers, dtype=np.float64), counters.shape)
+    times = MIDNIGHT + np.arange(len(counters)) * 60
+    return EnergyAccount(["A"] * len(counters), times, counters, powers, **kwargs)
+
+
+def test_counter_increase():
+    """A steadily rising counter gives its increase per interval."""
+    result = account([100, 100.01, 100.03, 100.06])
+    assert result.energy == pytest.approx([0.01, 0.02, 0.03])
+    assert (result.source == EnergySource.COUNTER).all()
+    assert result.start[0] == MIDNIGHT
+    assert result.end[-1] == MIDNIGHT + 180
+    assert result.total("A") == pytest.approx(0.06)
+
+
+def test_reset_falls_back_to_power():
+    """A counter going back to zero integrates power instead."""
+    result = account([5000, 5000.01, 0.02, 0.03], powers=[0.6, 0.6, 1.2, 1.2])
+    assert result.source.tolist() == [
+        EnergySource.COUNTER,
+        EnergySource.RESET,
+        EnergySource.COUNTER,
+    ]
+    # The trapezoid of 0.6 kW and 1.2 kW over a minute
+    assert result.energy[1] == pytest.approx(0.9 / 60)
+    assert (result.energy >= 0).all()
+
+
+def test_rollover():
+    """A counter wrapping past a power of ten keeps counting."""
+    result = account([99999.98, 99999.99, 0.01, 0.02])
+    assert result.source[1] == EnergySource.ROLLOVER
+    assert result.energy == pytest.approx([0.01, 0.02, 0.01])
+
+
+def test_jump_falls_back_to_power():
+    """A counter rising faster than the device could produce is a jump."""
+    result = account([100, 100.01, 600.01, 600.02])
+    assert result.source[1] == EnergySource.JUMP
+    assert result.energy[1] == pytest.approx(0.01)
+    assert result.total() == pytest.approx(0.03)
+    # Up to jump_tolerance kWh over the limit is believed
+    assert account([100, 100.5]).source[0] == EnergySource.COUNTER
+
+
+def test_gaps():
+    """Missing counter readings integrate power, or give nothing."""
+    result = account([100, np.nan, 100.02], powers=[0.6, 0.6, np.nan])
+    assert result.source.tolist() == [EnergySource.GAP, EnergySource.GAP]
+    assert result.energy == pytest.approx([0.01, 0.01])
+    result = account([100, np.nan, 100.02], powers=np.nan)
+    assert (result.source == EnergySource.MISSING).all()
+    assert result.total() == 0.0
+    counts = result.counts()
+    assert counts[EnergySource.MISSING] == 2
+    assert counts[EnergySource.COUNTER] == 0
+
+
+def test_devices_are_accounted_separately():
+    """Samples may come in any order, mixing devices."""
+    times = MIDNIGHT + np.array([60, 0, 60, 0, 120])
+    result = EnergyAccount(
+        ["B", "A", "A", "B", "A"],
+        times,
+        [10.5, 100, 100.25, 10, 100.5],
+        [1, 1, 1, 1, 1],
+    )
+    assert result.serials == ["B", "A"]
+    assert len(result) == 3
+    assert result.totals() == pytest.approx({"A": 0.5, "B": 0.5})
+    assert result.device.tolist() == [0, 1, 1]
+    with pytest.raises(ValueError, match="as long"):
+        EnergyAccount(["A"], [0, 60], [1, 2])
+
+
+def test_restarts():
+    """Intervals spanning a PVS restart are flagged."""
+    result = account([1, 1.01, 1.02, 1.03], restarts=[MIDNIGHT + 90])
+    assert result.restarted.tolist() == [False, True, False]
+    jittery = [MIDNIGHT + 90, MIDNIGHT + 93, MIDNIGHT + 88, MIDNIGHT + 9000]
+    assert restart_times([*jittery, None]).tolist() == [MIDNIGHT + 88, MIDNIGHT + 9000]
+
+
+def test_intervals():
+    """Energy is summed into fixed intervals by the end of each sample pair."""
+    result = account(np.arange(31) * 0.01 + 100)
+    starts, energy = result.intervals(900)
+    assert starts.tolist() == [MIDNIGHT, MIDNIGHT + 900, MIDNIGHT + 1800]
+    assert energy.shape == (1, 3)
+    assert energy[0] == pytest.approx([0.14, 0.15, 0.01])
+    starts, energy = result.intervals(
+        3600, start=datetime(2025, 6, 21, 23, tzinfo=ZoneInfo("UTC")), end=MIDNIGHT
+    )
+    assert starts.tolist() == [MIDNIGHT - 3600]
+    assert energy.tolist() == [[0.0]]
+    with pytest.raises(ValueError, match="positive"):
+        result.intervals(0)
+
+
+def test_from_records_and_pvs():
+    """Accounts can be built from dicts, and restarts from PVS samples."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        response = DeviceDetailResponse.new(json.load(f))
+    (restart,) = pvs_restarts([response.pvs, response.pvs])
+    assert restart == response.pvs.last_restart_time.timestamp()
+    inverter = response.inverters[0]
+    later = inverter.model_copy(
+        update={
+            "DATATIME": inverter.DATATIME + timedelta(minutes=5),
+            "ltea_3phsum_kwh": inverter.ltea_3phsum_kwh + 0.02,
+        }
+    )
+    result = EnergyAccount.from_records([inverter.model_dump(), later.model_dump()])
+    assert result.serials == [inverter.SERIAL]
+    assert result.total() == pytest.approx(0.02)
+
+
+def test_from_store():
+    """Accounts can be built from a store, restarts and all."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        response = DeviceDetailResponse.new(json.load(f))
+    with DeviceStore() as store:
+        for minute in range(3):
+            later = timedelta(minutes=minute)
+            shifted = [
+                inverter.model_copy(
+                    update={
+                        "DATATIME": inverter.DATATIME + later,
+                        "ltea_3phsum_kwh": inverter.ltea_3phsum_kwh + minute,
+                    }
+                )
+                for inverter in response.inverters
+            ]
+            shifted.append(
+                response.pvs.model_copy(
+                    update={
+                        "DATATIME": response.inverters[0].DATATIME + later,
+                        # The PVS restarts 30 seconds before the last poll
+                        "dl_uptime": (
+                            response.pvs.dl_uptime + minute * 60 if minute < 2 else 30
+                        ),
+                    }
+                )
+            )
+            store.write(shifted)
+        series = store.series("inverter", columns=["ltea_3phsum_kwh"])
+        assert set(series) == {"SERIAL", "DATATIME", "ltea_3phsum_kwh"}
+        assert isinstance(series["DATATIME"][0], int)
+        result = EnergyAccount.from_store(store, jump_tolerance=2)
+    assert len(result.serials) == len(response.inverters)
+    assert result.total() == pytest.approx(2 * len(response.inverters))
+    assert result.restarted.tolist() == [False, True] * len(response.inverters)
@@ -0,0 +1,213 @@
+"""Tests for the sungazer.fleet module."""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from sungazer.client import AsyncSungazerClient
+from sungazer.fleet import FleetPoller, FleetResult, FleetTarget
+from sungazer.models import DeviceDetailResponse, GetCommResponse
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(command: str) -> dict:
+    """Load a fixture payload for ``command``."""
+    with (FIXTURES / command / f"{command}.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ok_response(data: dict) -> Mock:
+    """Build a mock 200 response carrying ``data``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.content = json.dumps(data).encode()
+    mock_response.text = json.dumps(data)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+class FakeFleet:
+    """Builds mock async clients whose latency depends on the target."""
+
+    def __init__(
+        self,
+        delays: dict[str, float],
+        failing: set[str] | None = None,
+        failing_commands: set[str] | None = None,
+    ):
+        self.delays = delays
+        self.failing = failing or set()
+        #: The commands that fail on failing targets; all of them if None
+        self.failing_commands = failing_commands
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.payloads = {
+            "DeviceList": load_fixture("DeviceList"),
+            "Get_Comm": load_fixture("Get_Comm"),
+        }
+
+    def factory(self, target: FleetTarget) -> AsyncSungazerClient:
+        mock_client = Mock(spec=httpx.AsyncClient)
+
+        async def get(path, params=None):  # noqa: ARG001
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.delays.get(target.base_url, 0))
+                if target.base_url in self.failing and (
+                    self.failing_commands is None
+                    or params["Command"] in self.failing_commands
+                ):
+                    msg = "connection reset"
+                    raise httpx.ConnectError(msg)
+                return ok_response(self.payloads[params["Command"]])
+            finally:
+                self.in_flight -= 1
+
+        mock_client.get.side_effect = get
+        return AsyncSungazerClient(client=mock_client, serial=target.serial)
+
+
+class TestFleetTarget:
+    """Test cases for FleetTarget and FleetResult."""
+
+    def test_tuple_targets_are_normalised(self):
+        """Test that (base_url, serial) tuples become FleetTarget objects."""
+        poller = FleetPoller([("http://a", "SN1"), FleetTarget(base_url="http://b")])
+        assert poller.targets == [
+            FleetTarget(base_url="http://a", serial="SN1"),
+            FleetTarget(base_url="http://b", serial=None),
+        ]
+
+    def test_result_ok(self):
+        """Test FleetResult.ok."""
+        target = FleetTarget(base_url="http://a")
+        assert FleetResult(target=target).ok
+        assert not FleetResult(target=target, error="boom").ok
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [({"concurrency": 0}, "concurrency"), ({"deadline": 0}, "deadline")],
+    )
+    def test_invalid_arguments(self, kwargs, match):
+        """Test that nonsensical limits are rejected."""
+        with pytest.raises(ValueError, match=match):
+            FleetPoller([], **kwargs)
+
+
+class TestFleetPoller:
+    """Test cases for the FleetPoller class."""
+
+    def test_poll_runs_both_commands(self):
+        """Test that every target gets a device list and network status."""
+        fleet = FakeFleet({})
+        poller = FleetPoller(
+            [(f"http://pvs{i}", f"SN{i}") for i in range(3)],
+            client_factory=fleet.factory,
+        )
+        results = poller.run()
+        assert len(results) == 3
+        for result in results:
+            assert result.ok
+            assert isinstance(result.devices, DeviceDetailResponse)
+            assert isinstance(result.network, GetCommResponse)
+
+    def test_commands_can_be_restricted(self):
+        """Test that only the requested commands are run."""
+        fleet = FakeFleet({})
+        poller = FleetPoller(
+            [("http://pvs0", "SN0")], commands=["network"], client_factory=fleet.factory
+        )
+        (result,) = poller.run()
+        assert result.devices is None
+        assert isinstance(result.network, GetCommResponse)
+
+    def test_concurrency_cap_is_respected(self):
+        """Test that no more than ``concurrency`` targets are polled at once."""
+        fleet = FakeFleet({f"http://pvs{i}": 0.01 for i in range(12)})
+        poller = FleetPoller(
+            [(f"http://pvs{i}", None) for i in range(12)],
+            concurrency=3,
+            commands=["devices"],
+            client_factory=fleet.factory,
+        )
+        results = poller.run()
+        assert len(results) == 12
+        assert fleet.max_in_flight == 3
+
+    def test_results_stream_in_completion_order(self):
+        """Test that fast units are reported before slow ones."""
+        fleet = FakeFleet({"http://slow": 0.2, "http://fast": 0.0})
+        poller = FleetPoller(
+            [("http://slow", None), ("http://fast", None)],
+            commands=["network"],
+            client_factory=fleet.factory,
+        )
+
+        async def run():
+            return [result.target.base_url async for result in poller.stream()]
+
+        assert asyncio.run(run()) == ["http://fast", "http://slow"]
+
+    def test_deadline_is_reported_as_error(self):
+        """Test that a unit exceeding its deadline fails without stalling others."""
+        fleet = FakeFleet({"http://hung": 5.0})
+        poller = FleetPoller(
+            [("http://hung", None), ("http://ok", None)],
+            deadline=0.05,
+            commands=["network"],
+            client_factory=fleet.factory,
+        )
+        results = {r.target.base_url: r for r in poller.run()}
+        assert results["http://ok"].ok
+        assert not results["http://hung"].ok
+        assert "Deadline" in results["http://hung"].error
+        assert isinstance(results["http://hung"].exception, asyncio.TimeoutError)
+
+    def test_failures_are_isolated(self):
+        """Test that one failing unit does not abort the sweep."""
+        fleet = FakeFleet({}, failing={"http://down"})
+        poller = FleetPoller(
+            [("http://down", None), ("http://up", None)],
+            commands=["network"],
+            client_factory=fleet.factory,
+        )
+        results = {r.target.base_url: r for r in poller.run()}
+        assert results["http://up"].ok
+        assert results["http://down"].error.startswith("ConnectError")
+
+    def test_partial_results_are_kept(self):
+        """Test that responses received before a failure are kept."""
+        fleet = FakeFleet({}, failing={"http://pvs"}, failing_commands={"Get_Comm"})
+        poller = FleetPoller(
+            [("http://pvs", None)],
+            commands=["devices", "network"],
+            client_factory=fleet.factory,
+        )
+        (result,) = poller.run()
+        assert not result.ok
+        assert result.error.startswith("ConnectError")
+        assert isinstance(result.devices, DeviceDetailResponse)
+        assert result.network is None
+
+    def test_early_exit_cancels_pending_polls(self):
+        """Test that breaking out of stream() cancels outstanding polls."""
+        fleet = FakeFleet({"http://fast": 0.0, "http://slow": 5.0})
+        poller = FleetPoller(
+            [("http://fast", None), ("http://slow", None)],
+            commands=["network"],
+            client_factory=fleet.factory,
+        )
+
+        async def run():
+            async for result in poller.stream():
+                return result
+            return None
+
+        result = asyncio.run(asyncio.wait_for(run(), timeout=2))
+        assert result.target.base_url == "http://fast"
+        assert fleet.in_flight == 0
@@ -0,0 +1,152 @@
+"""Tests for the sungazer.frame module."""
+
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sungazer.frame import COLUMNS, InverterFrame
+from sungazer.models import DeviceDetailResponse
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def payload() -> dict:
+    """Load the decoded DeviceList fixture."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        return json.load(f)
+
+
+def inverter_records(payload: dict) -> list[dict]:
+    """Return the inverter records of ``payload``."""
+    return [d for d in payload["devices"] if d["DEVICE_TYPE"] == "Inverter"]
+
+
+class TestInverterFrame:
+    """Test cases for the InverterFrame class."""
+
+    def test_from_payload(self, payload):
+        """Test that every inverter becomes a row of float64 columns."""
+        records = inverter_records(payload)
+        frame = InverterFrame.from_payload(payload)
+        assert len(frame) == len(records) == 12
+        assert frame.serials == [r["SERIAL"] for r in records]
+        assert set(frame.columns) == set(COLUMNS)
+        for column in frame.columns.values():
+            assert column.dtype == np.float64
+            assert column.shape == (12,)
+        assert frame["p_3phsum_kw"].tolist() == [
+            float(r["p_3phsum_kw"]) for r in records
+        ]
+
+    def test_alternate_keys(self, payload):
+        """Test that firmware spellings of column keys are read."""
+        records = inverter_records(payload)
+        frame = InverterFrame.from_payload(payload)
+        assert frame["vln_3phsum_v"].tolist() == [
+            float(r["vln_3phavg_v"]) for r in records
+        ]
+        assert frame["t_htsink_degc"].tolist() == [
+            float(r["t_htsnk_degc"]) for r in records
+        ]
+        assert frame["p_mppt1_kw"].tolist() == [float(r["p_mppt1_kw"]) for r in records]
+
+    def test_models_agree_with_payload(self, payload):
+        """Test that frames from models and from the payload are the same."""
+        response = DeviceDetailResponse.new(payload)
+        expected = InverterFrame.from_payload(payload)
+        for frame in (
+            InverterFrame.from_response(response),
+            InverterFrame.from_devices(response.inverters),
+        ):
+            assert frame.serials == expected.serials
+            for name, column in expected.columns.items():
+                assert not np.isnan(column).all(), name
+                np.testing.assert_array_equal(frame[name], column, err_msg=name)
+
+    def test_missing_values_are_nan(self):
+        """Test that missing, empty and non-numeric values become NaN."""
+        frame = InverterFrame.from_records(
+            [
+                {"SERIAL": "A", "p_3phsum_kw": "0.5", "freq_hz": ""},
+                {"SERIAL": "B", "p_3phsum_kw": None, "freq_hz": "garbage"},
+                {"SERIAL": "C", "p_3phsum_kw": 0.25},
+            ]
+        )
+        assert frame["p_3phsum_kw"][0] == 0.5
+        assert math.isnan(frame["p_3phsum_kw"][1])
+        assert frame["p_3phsum_kw"][2] == 0.25
+        assert np.isnan(frame["freq_hz"]).all()
+        assert np.isnan(frame["ltea_3phsum_kwh"]).all()
+
+    def test_statistics(self):
+        """Test the NaN-aware aggregates."""
+        frame = InverterFrame.from_records(
+            [
+                {"SERIAL": str(i), "p_3phsum_kw": v}
+                for i, v in enumerate([1.0, 2.0, None, 3.0, 4.0])
+            ]
+        )
+        assert frame.total("p_3phsum_kw") == 10.0
+        assert frame.count("p_3phsum_kw") == 4
+        assert frame.mean("p_3phsum_kw") == 2.5
+        assert frame.percentile("p_3phsum_kw", 50) == 2.5
+        assert frame.percentile("p_3phsum_kw", [0, 100]).tolist() == [1.0, 4.0]
+        assert frame.total("freq_hz") == 0.0
+        assert frame.count("freq_hz") == 0
+        assert math.isnan(frame.mean("freq_hz"))
+        assert math.isnan(frame.percentile("freq_hz", 95))
+        assert np.isnan(frame.percentile("freq_hz", [5, 95])).all()
+
+    def test_percentile_matches_numpy(self):
+        """Test that percentiles interpolate as numpy.percentile does."""
+        values = np.random.default_rng(0).random(101)
+        frame = InverterFrame.from_records(
+            {"SERIAL": str(i), "t_htsink_degc": v} for i, v in enumerate(values)
+        )
+        qs = [0, 2.5, 50, 95, 99.9, 100]
+        assert np.allclose(
+            frame.percentile("t_htsink_degc", qs), np.percentile(values, qs)
+        )
+        with pytest.raises(ValueError, match="between 0 and 100"):
+            frame.percentile("t_htsink_degc", 101)
+
+    def test_serial_index(self, payload):
+        """Test looking up rows by serial number."""
+        frame = InverterFrame.from_payload(payload)
+        serial = frame.serials[3]
+        assert frame.index(serial) == 3
+        assert frame.row(serial)["p_3phsum_kw"] == frame["p_3phsum_kw"][3]
+        with pytest.raises(KeyError):
+            frame.index("nope")
+
+    def test_from_response(self, payload):
+        """Test building a frame from validated inverter models."""
+        response = DeviceDetailResponse.new(payload)
+        frame = InverterFrame.from_response(response)
+        assert frame.serials == [d.SERIAL for d in response.inverters]
+        assert frame["p_3phsum_kw"].tolist() == [
+            d.p_3phsum_kw for d in response.inverters
+        ]
+        assert frame.total("ltea_3phsum_kwh") == pytest.approx(
+            sum(d.ltea_3phsum_kwh for d in response.inverters)
+        )
+
+    def test_empty(self):
+        """Test a frame with no inverters."""
+        frame = InverterFrame.from_payload({"devices": []})
+        assert len(frame) == 0
+        assert frame.total("p_3phsum_kw") == 0.0
+
+    def test_bad_columns(self):
+        """Test that missing or misshapen columns are rejected."""
+        columns = {name: np.zeros(2) for name in COLUMNS}
+        with pytest.raises(ValueError, match="shape"):
+            InverterFrame(["A"], columns)
+        del columns["freq_hz"]
+        with pytest.raises(ValueError, match="Missing columns: freq_hz"):
+            InverterFrame(["A", "B"], columns)
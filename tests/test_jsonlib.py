@@ -0,0 +1,116 @@
+"""Tests for the sungazer.jsonlib module."""
+
+import importlib.util
+import json
+from datetime import datetime, timezone
+from ipaddress import IPv4Address
+from pathlib import Path
+
+import pytest
+
+from sungazer import jsonlib
+from sungazer.models import CheckFWResponse, DeviceDetailResponse
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+BACKENDS = [
+    pytest.param(
+        name,
+        marks=pytest.mark.skipif(
+            name != "json" and importlib.util.find_spec(name) is None,
+            reason=f"{name} is not installed",
+        ),
+    )
+    for name in jsonlib.BACKENDS
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """Each JSON backend whose library is installed."""
+    return jsonlib.get_backend(request.param)
+
+
+class TestBackends:
+    """Test cases that every backend must pass."""
+
+    @pytest.mark.parametrize("kind", [bytes, bytearray, str])
+    def test_loads(self, backend, kind):
+        """Test decoding from bytes, bytearray and str."""
+        data = '{"a": [1, 2.5, "x"], "b": null}'
+        raw = data if kind is str else kind(data.encode())
+        assert backend.loads(raw) == json.loads(data)
+
+    def test_loads_invalid(self, backend):
+        """Test that invalid JSON raises ValueError."""
+        with pytest.raises(ValueError):  # noqa: PT011
+            backend.loads(b'{"a": ')
+
+    def test_dumps_odd_types(self, backend):
+        """Test the types OddTypeEncoder used to special-case."""
+        when = datetime(2025, 6, 22, 1, 2, 3, tzinfo=timezone.utc)
+        data = backend.loads(
+            backend.dumps({"when": when, "ip": IPv4Address("192.168.1.1")})
+        )
+        assert datetime.fromisoformat(data["when"].replace("Z", "+00:00")) == when
+        assert data["ip"] == "192.168.1.1"
+
+    def test_dumps_unknown_type(self, backend):
+        """Test that unsupported types raise TypeError."""
+        with pytest.raises(TypeError):
+            backend.dumps({"x": object()})
+
+    def test_indent_matches_stdlib(self, backend):
+        """Test that indented output looks like json.dumps(indent=2)."""
+        data = {"a": [1, {"b": "c"}], "d": "é"}
+        expected = json.dumps(data, indent=2, ensure_ascii=False)
+        assert backend.dumps(data, indent=True) == expected
+
+    def test_model_dumps_round_trip(self, backend):
+        """Test encoding the model_dump() of real responses."""
+        with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+            devices = DeviceDetailResponse.new(json.load(f))
+        dumped = backend.loads(backend.dumps(devices.model_dump(), indent=True))
+        assert len(dumped["devices"]) == len(devices.devices)
+        for record, device in zip(dumped["devices"], devices.devices, strict=True):
+            assert record["SERIAL"] == device.SERIAL
+            if device.DATATIME is None:
+                assert record["DATATIME"] is None
+            else:
+                when = record["DATATIME"].replace("Z", "+00:00")
+                assert datetime.fromisoformat(when) == device.DATATIME
+
+        with (FIXTURES / "CheckFW" / "CheckFW.json").open() as f:
+            firmware = CheckFWResponse(**json.load(f))
+        assert backend.loads(backend.dumps(firmware.model_dump())) == json.loads(
+            firmware.model_dump_json()
+        )
+
+
+class TestSelection:
+    """Test cases for choosing a backend."""
+
+    def test_default_prefers_fast_backends(self):
+        """Test that the default is the first installed backend."""
+        installed = [
+            name
+            for name in jsonlib.BACKENDS
+            if name == "json" or importlib.util.find_spec(name) is not None
+        ]
+        assert jsonlib.get_backend().name == installed[0]
+
+    def test_unknown_backend(self):
+        """Test that an unknown name is rejected."""
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            jsonlib.get_backend("yaml")
+
+    def test_use_switches_module_functions(self):
+        """Test that use() changes what loads and dumps go through."""
+        previous = jsonlib.backend.name
+        try:
+            assert jsonlib.use("json").name == "json"
+            assert jsonlib.dumps({"a": 1}) == '{"a":1}'
+            assert jsonlib.loads(b"[1]") == [1]
+        finally:
+            jsonlib.use(previous)
+        assert jsonlib.backend.name == previous
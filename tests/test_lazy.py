@@ -0,0 +1,191 @@
+"""Tests for the sungazer.models.lazy module."""
+
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from sungazer.client import AsyncSungazerClient, SungazerClient
+from sungazer.models import (
+    DeviceDetailResponse,
+    LazyDevice,
+    LazyDeviceDetailResponse,
+    PVSDeviceDetail,
+    SolarBridgeDeviceDetail,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def payload() -> dict:
+    """Load the decoded DeviceList fixture."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        return json.load(f)
+
+
+def inverter_record(payload: dict) -> dict:
+    """Return the first inverter record of ``payload``."""
+    return next(d for d in payload["devices"] if d["DEVICE_TYPE"] == "Inverter")
+
+
+class TestLazyDevice:
+    """Test cases for the LazyDevice class."""
+
+    def test_fields_match_full_model(self, payload):
+        """Test that every field reads the same as the validated model."""
+        full = DeviceDetailResponse.new(payload)
+        lazy = LazyDeviceDetailResponse.new(payload)
+        assert len(lazy.devices) == len(full.devices)
+        for view, model in zip(lazy.devices, full.devices, strict=True):
+            assert view.model_class is type(model)
+            for name in type(model).model_fields:
+                assert getattr(view, name) == getattr(model, name), name
+
+    def test_fields_are_validated_once(self, payload):
+        """Test that a field is only converted on first access, then cached."""
+        view = LazyDevice(inverter_record(payload), SolarBridgeDeviceDetail)
+        assert "DATATIME" not in vars(view)
+        first = view.DATATIME
+        assert vars(view)["DATATIME"] is first
+        assert view.DATATIME is first
+        assert "p_3phsum_kw" not in vars(view)
+
+    def test_missing_field_uses_default(self):
+        """Test that fields absent from the record get the model default."""
+        view = LazyDevice({"SERIAL": "X"}, SolarBridgeDeviceDetail)
+        assert view.ISDETAIL is True
+        assert view.p_3phsum_kw is None
+
+    def test_model_properties(self, payload):
+        """Test that properties defined on the model work on the view."""
+        record = next(d for d in payload["devices"] if d["DEVICE_TYPE"] == "PVS")
+        view = LazyDevice(record, PVSDeviceDetail)
+        assert view.last_restart_time == PVSDeviceDetail(**record).last_restart_time
+
+    def test_invalid_value_fails_on_access(self, payload):
+        """Test that a bad value only raises when its field is read."""
+        record = dict(inverter_record(payload), p_3phsum_kw="not a number")
+        view = LazyDevice(record, SolarBridgeDeviceDetail)
+        assert view.SERIAL == record["SERIAL"]
+        with pytest.raises(ValidationError):
+            _ = view.p_3phsum_kw
+        with pytest.raises(ValidationError):
+            view.to_model()
+
+    def test_unknown_attribute(self, payload):
+        """Test that names that aren't fields raise AttributeError."""
+        view = LazyDevice(inverter_record(payload), SolarBridgeDeviceDetail)
+        with pytest.raises(AttributeError, match="no field 'nope'"):
+            _ = view.nope
+
+    def test_read_only(self, payload):
+        """Test that views can't be modified."""
+        view = LazyDevice(inverter_record(payload), SolarBridgeDeviceDetail)
+        with pytest.raises(AttributeError, match="read-only"):
+            view.SERIAL = "other"
+
+    def test_to_model_and_copy(self, payload):
+        """Test building the full model, and copying a view."""
+        record = inverter_record(payload)
+        view = LazyDevice(record, SolarBridgeDeviceDetail)
+        assert view.to_model() == SolarBridgeDeviceDetail(**record)
+        assert copy.copy(view).SERIAL == record["SERIAL"]
+
+
+class TestLazyDeviceDetailResponse:
+    """Test cases for the LazyDeviceDetailResponse class."""
+
+    def test_properties(self, payload):
+        """Test the device type accessors."""
+        full = DeviceDetailResponse.new(payload)
+        lazy = LazyDeviceDetailResponse.new(payload)
+        assert lazy.result == full.result
+        assert lazy.pvs.SERIAL == full.pvs.SERIAL
+        assert [d.SERIAL for d in lazy.inverters] == [d.SERIAL for d in full.inverters]
+        assert lazy.production_meter.SERIAL == full.production_meter.SERIAL
+        assert lazy.consumption_meter.SERIAL == full.consumption_meter.SERIAL
+
+    def test_to_model(self, payload):
+        """Test that to_model() builds the same response as new()."""
+        assert LazyDeviceDetailResponse.new(payload).to_model() == (
+            DeviceDetailResponse.new(payload)
+        )
+
+    def test_unclassified_meters_are_skipped(self):
+        """Test that power meters with no subtype are dropped, as in new()."""
+        lazy = LazyDeviceDetailResponse.new(
+            {"devices": [{"DEVICE_TYPE": "Power Meter"}], "result": "succeed"}
+        )
+        assert lazy.devices == []
+
+    def test_unknown_device_type(self):
+        """Test that an unknown DEVICE_TYPE is rejected up front."""
+        with pytest.raises(ValueError, match="Unknown device type: Toaster"):
+            LazyDeviceDetailResponse.new({"devices": [{"DEVICE_TYPE": "Toaster"}]})
+
+    def test_unknown_device_type_tolerant(self, payload):
+        """Test that tolerant=True sets aside unknown device types."""
+        payload["devices"].insert(0, {"DEVICE_TYPE": "Toaster", "SERIAL": "T1"})
+        lazy = LazyDeviceDetailResponse.new(payload, tolerant=True)
+        assert lazy.rejected_count == 1
+        assert lazy.unknown_devices[0].index == 0
+        assert lazy.unknown_devices[0].SERIAL == "T1"
+        model = lazy.to_model()
+        assert model.unknown_devices == lazy.unknown_devices
+        assert len(model.devices) == len(lazy.devices)
+
+    def test_multiple_pvs(self):
+        """Test that more than one PVS is an error, as in DeviceDetailResponse."""
+        lazy = LazyDeviceDetailResponse.new(
+            {"devices": [{"DEVICE_TYPE": "PVS"}, {"DEVICE_TYPE": "PVS"}]}
+        )
+        with pytest.raises(ValueError, match="Multiple PVS devices found"):
+            _ = lazy.pvs
+
+
+def transport(body: bytes) -> httpx.MockTransport:
+    """Build a transport that answers every request with ``body``."""
+    return httpx.MockTransport(lambda _: httpx.Response(200, content=body))
+
+
+class TestClientLazy:
+    """Test lazy DeviceList requests through the clients."""
+
+    def test_list_lazy(self, payload):
+        """Test that list(lazy=True) returns views over the response."""
+        body = json.dumps(payload).encode()
+        client = SungazerClient(
+            client=httpx.Client(
+                base_url="http://pvs/cgi-bin", transport=transport(body)
+            )
+        )
+        response = client.devices.list(lazy=True)
+        assert isinstance(response, LazyDeviceDetailResponse)
+        assert response.to_model() == DeviceDetailResponse.new(payload)
+
+    def test_stream_and_lazy(self):
+        """Test that stream and lazy can't be combined."""
+        client = SungazerClient(client=httpx.Client(base_url="http://pvs/cgi-bin"))
+        with pytest.raises(ValueError, match="can't be combined"):
+            client.devices.list(stream=True, lazy=True)
+
+    def test_async_list_lazy(self, payload):
+        """Test the async lazy API."""
+        body = json.dumps(payload).encode()
+
+        async def run():
+            http = httpx.AsyncClient(
+                base_url="http://pvs/cgi-bin", transport=transport(body)
+            )
+            async with AsyncSungazerClient(client=http) as client:
+                return await client.devices.list(lazy=True)
+
+        response = asyncio.run(run())
+        assert [d.SERIAL for d in response.inverters] == [
+            d.SERIAL for d in DeviceDetailResponse.new(payload).inverters
+        ]
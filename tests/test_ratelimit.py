@@ -0,0 +1,250 @@
+"""Tests for the sungazer.ratelimit module."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from sungazer.client import AsyncSungazerClient, SungazerClient
+from sungazer.fleet import FleetPoller
+from sungazer.models import PVSDeviceDetail
+from sungazer.ratelimit import AdaptiveRateLimiter, RateLimiterRegistry
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(command: str) -> dict:
+    """Load a fixture payload for ``command``."""
+    with (FIXTURES / command / f"{command}.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ok_response(data: dict) -> Mock:
+    """Build a mock 200 response carrying ``data``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = json.dumps(data).encode()
+    mock_response.text = json.dumps(data)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+class FakeClock:
+    """A monotonic clock that advances only when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class PVSSamples:
+    """Builds PVS records with successive CURTIME values."""
+
+    def __init__(self):
+        self.curtime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self, **fields) -> PVSDeviceDetail:
+        self.curtime += timedelta(seconds=30)
+        return PVSDeviceDetail.model_construct(CURTIME=self.curtime, **fields)
+
+
+@pytest.fixture
+def sample():
+    return PVSSamples()
+
+
+def make_limiter(clock: FakeClock, **kwargs) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(sleep=clock.sleep, clock=clock, **kwargs)
+
+
+class TestTokenBucket:
+    """Test the token bucket behaviour of AdaptiveRateLimiter."""
+
+    def test_burst_is_immediate(self, clock):
+        """Test that up to ``burst`` requests go out without waiting."""
+        limiter = make_limiter(clock, rate=1, burst=3)
+        for _ in range(3):
+            limiter.acquire()
+        assert clock.sleeps == []
+        limiter.acquire()
+        assert clock.sleeps == [1.0]
+
+    def test_requests_are_paced_at_rate(self, clock):
+        """Test that sustained requests are spaced 1/rate seconds apart."""
+        limiter = make_limiter(clock, rate=0.5, max_rate=1)
+        for _ in range(4):
+            limiter.acquire()
+        assert clock.sleeps == [2.0, 2.0, 2.0]
+
+    def test_tokens_refill_while_idle(self, clock):
+        """Test that time passing earns tokens, up to the burst size."""
+        limiter = make_limiter(clock, rate=1, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+        clock.now += 100
+        limiter.acquire()
+        limiter.acquire()
+        assert clock.sleeps == []
+
+    def test_async_acquire(self, clock, monkeypatch):
+        """Test that aacquire waits with asyncio.sleep."""
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr("sungazer.ratelimit.asyncio.sleep", fake_sleep)
+        limiter = make_limiter(clock, rate=0.25, max_rate=1)
+
+        async def run():
+            await limiter.aacquire()
+            await limiter.aacquire()
+
+        asyncio.run(run())
+        assert sleeps == [4.0]
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"rate": 5, "max_rate": 1}, "rates"),
+            ({"min_rate": 0}, "rates"),
+            ({"burst": 0}, "burst"),
+            ({"decrease_factor": 1}, "decrease_factor"),
+        ],
+    )
+    def test_invalid_settings(self, kwargs, match):
+        """Test that nonsensical settings are rejected."""
+        with pytest.raises(ValueError, match=match):
+            AdaptiveRateLimiter(**kwargs)
+
+
+class TestObserve:
+    """Test how AdaptiveRateLimiter reacts to reported load."""
+
+    def test_idle_unit_speeds_up(self, clock, sample):
+        """Test additive increase while CPU load is low."""
+        limiter = make_limiter(clock, rate=0.2, increase_step=0.1, max_rate=0.4)
+        assert limiter.observe(sample(dl_cpu_load=0.1)) == pytest.approx(0.3)
+        assert limiter.observe(sample(dl_cpu_load=0.1)) == pytest.approx(0.4)
+        assert limiter.observe(sample(dl_cpu_load=0.1)) == pytest.approx(0.4)
+        assert limiter.increases == 2
+
+    def test_high_cpu_backs_off(self, clock, sample):
+        """Test multiplicative decrease under CPU load, down to min_rate."""
+        limiter = make_limiter(clock, rate=0.4, min_rate=0.15)
+        assert limiter.observe(sample(dl_cpu_load=1.5)) == pytest.approx(0.2)
+        assert limiter.observe(sample(dl_cpu_load=1.5)) == pytest.approx(0.15)
+        assert limiter.decreases == 2
+
+    def test_skipped_scans_back_off(self, clock, sample):
+        """Test that a rise in dl_skipped_scans counts as overload."""
+        limiter = make_limiter(clock, rate=0.4, increase_step=0.1)
+        # The first sample only sets the baseline
+        assert limiter.observe(
+            sample(dl_cpu_load=0.1, dl_skipped_scans=7)
+        ) == pytest.approx(0.5)
+        assert limiter.observe(
+            sample(dl_cpu_load=0.1, dl_skipped_scans=9)
+        ) == pytest.approx(0.25)
+
+    def test_scan_time_and_memory_back_off(self, clock, sample):
+        """Test the scan time and memory high-water marks."""
+        limiter = make_limiter(clock, rate=0.4, scan_time_high=30, mem_high=1000)
+        assert limiter.observe(sample(dl_scan_time=45)) == pytest.approx(0.2)
+        assert limiter.observe(sample(dl_mem_used=2000)) == pytest.approx(0.1)
+
+    def test_moderate_load_holds_rate(self, clock, sample):
+        """Test that load between the idle and high marks leaves the rate."""
+        limiter = make_limiter(clock, rate=0.4)
+        assert limiter.observe(sample(dl_cpu_load=0.75)) == 0.4
+
+    def test_repeated_sample_is_ignored(self, clock, sample):
+        """Test that the same reading is not acted on twice."""
+        limiter = make_limiter(clock, rate=0.4)
+        pvs = sample(dl_cpu_load=1.5)
+        limiter.observe(pvs)
+        limiter.observe(pvs)
+        assert limiter.rate == pytest.approx(0.2)
+
+    def test_new_rate_applies_to_pacing(self, clock, sample):
+        """Test that backing off lengthens the wait between requests."""
+        limiter = make_limiter(clock, rate=1)
+        limiter.acquire()
+        limiter.observe(sample(dl_cpu_load=2))
+        limiter.acquire()
+        assert clock.sleeps == [2.0]
+
+
+class TestClientRateLimit:
+    """Test rate limiting through the clients."""
+
+    def test_device_list_feeds_limiter(self, clock):
+        """Test that each DeviceList response adjusts the limiter."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.return_value = ok_response(load_fixture("DeviceList"))
+        limiter = make_limiter(clock, rate=0.2, increase_step=0.1)
+        client = SungazerClient(client=mock_client, rate_limiter=limiter)
+        assert client.devices.rate_limiter is limiter
+
+        # The fixture PVS reports a CPU load of 0.46, which is idle
+        client.devices.list()
+        assert limiter.rate == pytest.approx(0.3)
+        # The same CURTIME again is not a new sample
+        client.devices.list()
+        assert limiter.rate == pytest.approx(0.3)
+        assert clock.sleeps == [pytest.approx(1 / 0.3)]
+
+    def test_other_commands_are_paced(self, clock):
+        """Test that every request waits for a token."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.return_value = ok_response(load_fixture("CheckFW"))
+        limiter = make_limiter(clock, rate=0.5, max_rate=1)
+        client = SungazerClient(client=mock_client, rate_limiter=limiter)
+        client.firmware.check()
+        client.firmware.check()
+        assert clock.sleeps == [2.0]
+
+    def test_async_client_feeds_limiter(self, clock):
+        """Test that the async client acquires tokens and observes load."""
+        mock_client = Mock(spec=httpx.AsyncClient)
+        mock_client.get.return_value = ok_response(load_fixture("DeviceList"))
+        limiter = make_limiter(clock, rate=0.2, increase_step=0.1)
+        client = AsyncSungazerClient(client=mock_client, rate_limiter=limiter)
+        asyncio.run(client.devices.list())
+        assert limiter.rate == pytest.approx(0.3)
+
+
+class TestRateLimiterRegistry:
+    """Test cases for the RateLimiterRegistry class."""
+
+    def test_one_limiter_per_base_url(self):
+        """Test that the same base URL always gets the same limiter."""
+        registry = RateLimiterRegistry(rate=0.1)
+        limiter = registry.get("http://a")
+        assert registry.get("http://a") is limiter
+        assert registry.get("http://b") is not limiter
+        assert registry.rates() == {"http://a": 0.1, "http://b": 0.1}
+
+    def test_fleet_default_factory_uses_registry(self):
+        """Test that FleetPoller hands each client its target's limiter."""
+        registry = RateLimiterRegistry()
+        poller = FleetPoller([("http://pvs", None)], rate_limiters=registry)
+        client = poller.client_factory(poller.targets[0])
+        assert client.rate_limiter is registry.get("http://pvs")
+        asyncio.run(client.close())
@@ -0,0 +1,245 @@
+"""Tests for the sungazer.retry module."""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from sungazer.client import AsyncSungazerClient, SungazerClient
+from sungazer.models import CheckFWResponse, DeviceDetailResponse
+from sungazer.retry import IDEMPOTENT_COMMANDS, RetryPolicy
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(command: str) -> dict:
+    """Load a fixture payload for ``command``."""
+    with (FIXTURES / command / f"{command}.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ok_response(data: dict) -> Mock:
+    """Build a mock 200 response carrying ``data``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = json.dumps(data).encode()
+    mock_response.text = json.dumps(data)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+def error_response(status_code: int) -> Mock:
+    """Build a mock response that fails with ``status_code``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.status_code = status_code
+    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        f"{status_code} Error", request=Mock(), response=mock_response
+    )
+    return mock_response
+
+
+class FakeClock:
+    """A monotonic clock that advances only when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_policy(clock: FakeClock, **kwargs) -> RetryPolicy:
+    """Build a policy with no jitter on the fake clock."""
+    kwargs.setdefault("jitter", 0)
+    return RetryPolicy(sleep=clock.sleep, clock=clock, **kwargs)
+
+
+class TestRetryPolicy:
+    """Test cases for the RetryPolicy class."""
+
+    def test_success_is_not_retried(self, clock):
+        """Test that a good response is returned after one attempt."""
+        policy = make_policy(clock)
+        send = Mock(return_value=ok_response({}))
+        assert policy.call(send, "DeviceList") is send.return_value
+        assert send.call_count == 1
+        assert clock.sleeps == []
+
+    def test_retries_status_codes_with_backoff(self, clock):
+        """Test that 503s are retried with exponentially growing delays."""
+        policy = make_policy(clock, max_attempts=4, backoff=1)
+        good = ok_response({})
+        send = Mock(side_effect=[error_response(503)] * 3 + [good])
+        assert policy.call(send, "Get_Comm") is good
+        assert send.call_count == 4
+        assert clock.sleeps == [1, 2, 4]
+
+    def test_backoff_is_capped(self, clock):
+        """Test that delays never exceed max_backoff."""
+        policy = make_policy(clock, backoff=1, max_backoff=3)
+        assert [policy.delay(n) for n in range(1, 5)] == [1, 2, 3, 3]
+
+    def test_jitter_shortens_delays(self):
+        """Test that jitter removes up to that fraction of each delay."""
+        policy = RetryPolicy(backoff=2, jitter=0.5, rng=lambda: 1.0)
+        assert policy.delay(1) == 1.0
+        policy = RetryPolicy(backoff=2, jitter=0.5, rng=lambda: 0.0)
+        assert policy.delay(1) == 2.0
+
+    def test_last_response_returned_when_attempts_run_out(self, clock):
+        """Test that the final error response is handed back to the caller."""
+        policy = make_policy(clock, max_attempts=2)
+        last = error_response(500)
+        send = Mock(side_effect=[error_response(500), last])
+        assert policy.call(send, "CheckFW") is last
+        assert send.call_count == 2
+
+    def test_other_status_codes_are_not_retried(self, clock):
+        """Test that status codes outside retry_on_status are returned as-is."""
+        policy = make_policy(clock)
+        send = Mock(return_value=error_response(404))
+        policy.call(send, "DeviceList")
+        assert send.call_count == 1
+
+    def test_retries_transport_errors(self, clock):
+        """Test that transport errors are retried and re-raised at the end."""
+        policy = make_policy(clock, max_attempts=3)
+        send = Mock(side_effect=httpx.ConnectError("refused"))
+        with pytest.raises(httpx.ConnectError):
+            policy.call(send, "DeviceList")
+        assert send.call_count == 3
+
+    def test_other_exceptions_are_not_retried(self, clock):
+        """Test that exceptions outside retry_on_exceptions propagate at once."""
+        policy = make_policy(clock)
+        send = Mock(side_effect=RuntimeError("bug"))
+        with pytest.raises(RuntimeError):
+            policy.call(send, "DeviceList")
+        assert send.call_count == 1
+
+    def test_budget_stops_retries(self, clock):
+        """Test that no retry starts after the time budget would be exceeded."""
+        policy = make_policy(clock, max_attempts=10, backoff=1, budget=5)
+        send = Mock(return_value=error_response(503))
+        policy.call(send, "DeviceList")
+        # Sleeps of 1 and 2 fit in the budget; the next (4) would not
+        assert clock.sleeps == [1, 2]
+        assert send.call_count == 3
+
+    @pytest.mark.parametrize("command", ["Start", "Stop", "GridProfileRefresh"])
+    def test_state_changing_commands_are_not_retried(self, clock, command):
+        """Test that commands with side effects are attempted once by default."""
+        policy = make_policy(clock)
+        send = Mock(side_effect=httpx.ReadTimeout("timeout"))
+        with pytest.raises(httpx.ReadTimeout):
+            policy.call(send, command)
+        assert send.call_count == 1
+
+    def test_state_changing_commands_can_opt_in(self, clock):
+        """Test that adding a command to ``commands`` makes it retryable."""
+        policy = make_policy(clock, commands=IDEMPOTENT_COMMANDS | {"Start"})
+        good = ok_response({})
+        send = Mock(side_effect=[httpx.ReadTimeout("timeout"), good])
+        assert policy.call(send, "Start") is good
+
+    def test_async_call(self, clock, monkeypatch):
+        """Test that acall retries with asyncio.sleep."""
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr("sungazer.retry.asyncio.sleep", fake_sleep)
+        policy = make_policy(clock, backoff=0.5)
+        good = ok_response({})
+        responses = iter([error_response(502), good])
+
+        async def send():
+            return next(responses)
+
+        assert asyncio.run(policy.acall(send, "DeviceList")) is good
+        assert sleeps == [0.5]
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [({"max_attempts": 0}, "max_attempts"), ({"jitter": 1.5}, "jitter")],
+    )
+    def test_invalid_settings(self, kwargs, match):
+        """Test that nonsensical settings are rejected."""
+        with pytest.raises(ValueError, match=match):
+            RetryPolicy(**kwargs)
+
+
+class TestClientRetry:
+    """Test retries through the clients."""
+
+    def test_retry_is_disabled_by_default(self):
+        """Test that clients attempt each request once unless configured."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.return_value = error_response(500)
+        client = SungazerClient(client=mock_client)
+        assert client.retry is None
+        with pytest.raises(httpx.HTTPStatusError):
+            client.devices.list()
+        assert mock_client.get.call_count == 1
+
+    def test_device_list_is_retried(self, clock):
+        """Test that a transient 500 on DeviceList is retried."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.side_effect = [
+            error_response(500),
+            ok_response(load_fixture("DeviceList")),
+        ]
+        client = SungazerClient(client=mock_client, retry=make_policy(clock))
+        assert isinstance(client.devices.list(), DeviceDetailResponse)
+        assert mock_client.get.call_count == 2
+
+    def test_exhausted_retries_keep_error_handling(self, clock):
+        """Test that a persistent 500 still becomes the usual ValueError."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.return_value = error_response(500)
+        client = SungazerClient(
+            client=mock_client, retry=make_policy(clock, max_attempts=2)
+        )
+        with pytest.raises(ValueError, match="Failed to get firmware info"):
+            client.firmware.check()
+        assert mock_client.get.call_count == 2
+
+    def test_session_start_is_not_retried(self, clock):
+        """Test that Start is sent once even with a retry policy."""
+        mock_client = Mock(spec=httpx.Client)
+        mock_client.get.return_value = error_response(500)
+        client = SungazerClient(client=mock_client, retry=make_policy(clock))
+        with pytest.raises(ValueError, match="Start failed"):
+            client.session.start()
+        assert mock_client.get.call_count == 1
+
+    def test_async_client_retries(self, clock, monkeypatch):
+        """Test that the async client retries through acall."""
+
+        async def fake_sleep(seconds):  # noqa: ARG001
+            return None
+
+        monkeypatch.setattr("sungazer.retry.asyncio.sleep", fake_sleep)
+        mock_client = Mock(spec=httpx.AsyncClient)
+        mock_client.get.side_effect = [
+            httpx.ConnectError("refused"),
+            ok_response(load_fixture("CheckFW")),
+        ]
+        client = AsyncSungazerClient(client=mock_client, retry=make_policy(clock))
+        result = asyncio.run(client.firmware.check())
+        assert isinstance(result, CheckFWResponse)
+        assert mock_client.get.await_count == 2
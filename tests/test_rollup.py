@@ -0,0 +1,169 @@
+"""Tests for the sungazer.rollup module."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from sungazer.models import DeviceDetailResponse
+from sungazer.rollup import RollupEngine
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+#: 2025-06-22 00:00:00 UTC
+MIDNIGHT = 1750550400
+
+
+def samples(minutes: int = 30) -> list[tuple]:
+    """Return 1-minute samples of one inverter: (time, power, counter)."""
+    return [
+        (MIDNIGHT + m * 60, m / 10, {"ltea_3phsum_kwh": 100 + m * 0.25})
+        for m in range(minutes)
+    ]
+
+
+def engine_with(rows: list[tuple], **kwargs) -> RollupEngine:
+    """Build an engine and add ``rows`` for serial ``"A"``, in order."""
+    engine = RollupEngine(**kwargs)
+    for timestamp, power, energy in rows:
+        engine.add("A", timestamp, power, energy)
+    return engine
+
+
+def test_power_aggregates():
+    """Each interval has the count, min, max and mean of its samples."""
+    first, second = engine_with(samples()).rollups("15m")
+    assert first.samples == 15
+    assert first.power_min == 0.0
+    assert first.power_max == pytest.approx(1.4)
+    assert first.power_mean == pytest.approx(0.7)
+    assert first.start == datetime(2025, 6, 22, tzinfo=ZoneInfo("UTC"))
+    assert first.end == datetime(2025, 6, 22, 0, 15, tzinfo=ZoneInfo("UTC"))
+    assert second.power_min == pytest.approx(1.5)
+
+
+def test_energy_spans_interval_boundaries():
+    """
+    Energy includes the increase between the last poll of one interval and
+    the first of the next, so 1-minute intervals aren't all zero.
+    """
+    engine = engine_with(samples())
+    minutes = engine.rollups("1m")
+    assert minutes[0].energy == {"ltea_3phsum_kwh": 0.0}
+    assert all(r.energy["ltea_3phsum_kwh"] == pytest.approx(0.25) for r in minutes[1:])
+    quarters = engine.rollups("15m")
+    total = sum(r.energy["ltea_3phsum_kwh"] for r in quarters)
+    assert total == pytest.approx(29 * 0.25)
+    (hour,) = engine.rollups("1h")
+    assert hour.energy["ltea_3phsum_kwh"] == pytest.approx(total)
+
+
+def test_late_data_gives_the_same_result():
+    """Samples added out of order roll up exactly as in order."""
+    rows = samples(120)
+    expected = engine_with(rows)
+    # Newest first for the even minutes, then the odd ones oldest first
+    engine = engine_with(rows[::2][::-1] + rows[1::2])
+    for interval in engine.intervals:
+        got = [r.model_dump() for r in engine.rollups(interval)]
+        want = [r.model_dump() for r in expected.rollups(interval)]
+        for row in got:
+            row["power_mean"] = pytest.approx(row["power_mean"])
+        assert got == want
+
+
+def test_late_sample_fixes_neighbouring_energy():
+    """A late sample filling a gap moves energy into its own interval."""
+    rows = samples()
+    late = rows.pop(20)
+    engine = engine_with(rows)
+    before = {r.start.minute: r for r in engine.rollups("1m")}
+    assert 20 not in before
+    assert before[21].energy["ltea_3phsum_kwh"] == pytest.approx(0.5)
+    engine.add("A", *late)
+    after = {r.start.minute: r for r in engine.rollups("1m")}
+    assert after[20].energy["ltea_3phsum_kwh"] == pytest.approx(0.25)
+    assert after[21].energy["ltea_3phsum_kwh"] == pytest.approx(0.25)
+
+
+def test_repeats_are_ignored():
+    """A sample with the DATATIME of the last one is a repeat."""
+    engine = engine_with(samples(3))
+    timestamp, power, energy = samples(3)[-1]
+    assert engine.add("A", timestamp, power, energy) is False
+    assert [r.samples for r in engine.rollups("1m")] == [1, 1, 1]
+    (quarter,) = engine.rollups("15m")
+    assert quarter.samples == 3
+
+
+def test_repeats_inside_an_interval_are_ignored():
+    """A re-delivered sample from the middle of an interval is a repeat."""
+    rows = [(MIDNIGHT + s, 1.0, {"ltea_3phsum_kwh": 100 + s}) for s in (0, 15, 30, 45)]
+    engine = engine_with(rows, intervals=["1m"])
+    timestamp, _, energy = rows[1]
+    assert engine.add("A", timestamp, 5.0, energy) is False
+    (minute,) = engine.rollups("1m")
+    assert minute.samples == 4
+    assert minute.power_max == 1.0
+    assert minute.power_mean == 1.0
+
+
+def test_update_from_response():
+    """Inverters and meters are rolled up; other devices are ignored."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        response = DeviceDetailResponse.new(json.load(f))
+    engine = RollupEngine()
+    assert engine.update(response) == len(response.inverters) + 2
+    assert engine.update(response) == 0
+    assert response.pvs.SERIAL not in engine.serials
+    inverter = response.inverters[0]
+    (rollup,) = engine.rollups("1d", serial=inverter.SERIAL)
+    assert rollup.power_mean == inverter.p_3phsum_kw
+    assert set(rollup.energy) == {"ltea_3phsum_kwh"}
+    consumption = response.consumption_meter
+    (rollup,) = engine.rollups("1d", serial=consumption.SERIAL)
+    assert set(rollup.energy) == {
+        "net_ltea_3phsum_kwh",
+        "neg_ltea_3phsum_kwh",
+        "pos_ltea_3phsum_kwh",
+    }
+
+
+def test_query_filters():
+    """rollups() filters on serial number and start time."""
+    engine = engine_with(samples())
+    engine.add("B", MIDNIGHT, 1.0)
+    assert engine.serials == ["A", "B"]
+    assert len(engine.rollups("15m")) == 3
+    assert len(engine.rollups("15m", serial="B")) == 1
+    assert engine.rollups("15m", serial="C") == []
+    rows = engine.rollups(
+        "1m",
+        serial="A",
+        start=datetime(2025, 6, 22, 0, 10, tzinfo=ZoneInfo("UTC")),
+        end=MIDNIGHT + 12 * 60,
+    )
+    assert [r.start.minute for r in rows] == [10, 11]
+    assert rows[0].energy["ltea_3phsum_kwh"] == pytest.approx(0.25)
+
+
+def test_intervals():
+    """Only the chosen intervals are maintained."""
+    engine = engine_with(samples(), intervals=["1h", "1m"])
+    assert engine.intervals == ["1m", "1h"]
+    with pytest.raises(ValueError, match="not maintained"):
+        engine.rollups("15m")
+    with pytest.raises(ValueError, match="Unknown intervals: 2m"):
+        RollupEngine(intervals=["2m"])
+
+
+def test_prune():
+    """prune() forgets the intervals that ended before the cut-off."""
+    engine = engine_with(samples())
+    dropped = engine.prune(MIDNIGHT + 15 * 60)
+    assert dropped == 15 + 1
+    assert [r.start.minute for r in engine.rollups("15m")] == [15]
+    assert len(engine.rollups("1m")) == 15
+    assert len(engine.rollups("1h")) == 1
@@ -0,0 +1,67 @@
+"""Tests for the sungazer.sanitize module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from sungazer.sanitize import json_bounds, sanitize
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+COMMANDS = [
+    "Start",
+    "Stop",
+    "Get_Comm",
+    "DeviceList",
+    "CheckFW",
+    "GridProfileGet",
+    "GridProfileRefresh",
+]
+
+HEADERS = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nX-Odd: {not json}\r\n\r\n"
+)
+
+
+def fixture_bytes(command: str) -> bytes:
+    """Return the raw fixture body for ``command``."""
+    return (FIXTURES / command / f"{command}.json").read_bytes()
+
+
+class TestSanitize:
+    """Test cases for sanitize and json_bounds."""
+
+    @pytest.mark.parametrize("command", COMMANDS)
+    def test_clean_body_is_returned_as_is(self, command):
+        """Test that clean fixtures are not copied."""
+        body = fixture_bytes(command)
+        assert sanitize(body) is body
+
+    @pytest.mark.parametrize("command", COMMANDS)
+    def test_headers_are_stripped(self, command):
+        """Test that leaked headers before the JSON are removed."""
+        body = fixture_bytes(command)
+        cleaned = sanitize(HEADERS + body + b"\r\n0\r\n")
+        assert json.loads(cleaned) == json.loads(body)
+
+    def test_surrounding_whitespace_is_clean(self):
+        """Test that whitespace around the document needs no copy."""
+        body = b'\n  {"result": "succeed"}\n\n'
+        assert sanitize(body) is body
+
+    def test_untabbed_json_is_kept(self):
+        """Test that JSON not indented with tabs survives, unlike the old filter."""
+        payload = {"result": "succeed", "nested": {"a": [1, 2]}}
+        body = b"HTTP/1.1 200 OK\n" + json.dumps(payload, indent=2).encode()
+        assert json.loads(sanitize(body)) == payload
+
+    def test_brace_inside_header_is_ignored(self):
+        """Test that a ``{`` mid-line in a header is not taken as the start."""
+        body = b'X-Odd: {x}\n{"result": "succeed"}'
+        assert json_bounds(body) == (11, len(body))
+
+    def test_no_json(self):
+        """Test that a body with no object is passed through."""
+        assert json_bounds(b"HTTP/1.1 500\r\n") is None
+        assert sanitize(b"oops") == b"oops"
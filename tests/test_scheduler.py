@@ -0,0 +1,174 @@
+"""Tests for the sungazer.scheduler module."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from sungazer.models import (
+    DeviceDetailResponse,
+    PVSDeviceDetail,
+    SolarBridgeDeviceDetail,
+)
+from sungazer.scheduler import PollScheduler
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+SITE = "http://pvs/cgi-bin"
+
+
+def at(seconds: float) -> datetime:
+    """Return the UTC datetime ``seconds`` after the epoch."""
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+class FakeSite:
+    """
+    A site whose inverters sample every ``cadence`` seconds, staggered by
+    ``phases``, with a device clock running ``skew`` seconds behind ours.
+    """
+
+    def __init__(
+        self, cadence: float = 300, phases: tuple[float, ...] = (0, 7, 15), skew=5
+    ):
+        self.cadence = cadence
+        self.phases = phases
+        self.skew = skew
+
+    def datatime(self, now: float, phase: float) -> float:
+        device_now = now - self.skew
+        return (device_now - phase) // self.cadence * self.cadence + phase
+
+    def response(self, now: float) -> DeviceDetailResponse:
+        devices = [
+            PVSDeviceDetail.model_construct(
+                SERIAL="PVS", DATATIME=at(0), CURTIME=at(now - self.skew)
+            )
+        ]
+        devices.extend(
+            SolarBridgeDeviceDetail.model_construct(
+                SERIAL=f"INV{i}",
+                DATATIME=at(self.datatime(now, phase)),
+                CURTIME=at(now - self.skew),
+            )
+            for i, phase in enumerate(self.phases)
+        )
+        return DeviceDetailResponse.model_construct(devices=devices, result="succeed")
+
+
+def simulate(scheduler: PollScheduler, site: FakeSite, duration: float, tick=10):
+    """Ask the scheduler every ``tick`` seconds; return the samples seen."""
+    seen: set[tuple[str, float]] = set()
+    now = 1_000_000.0
+    end = now + duration
+    while now < end:
+        if scheduler.should_poll(SITE, now=now):
+            response = site.response(now)
+            scheduler.record(SITE, response, now=now)
+            seen.update((d.SERIAL, d.DATATIME.timestamp()) for d in response.devices)
+        now += tick
+    return seen
+
+
+class TestPollScheduler:
+    """Test cases for the PollScheduler class."""
+
+    def test_new_sites_are_due_immediately(self):
+        """Test that a site that was never polled should be polled."""
+        scheduler = PollScheduler()
+        assert scheduler.should_poll(SITE, now=0)
+        assert scheduler.polls_saved == 0
+
+    def test_learning_uses_min_interval(self):
+        """Test that sites are polled every min_interval until learned."""
+        scheduler = PollScheduler(min_interval=10)
+        site = FakeSite()
+        scheduler.record(SITE, site.response(1_000_000), now=1_000_000)
+        assert scheduler.cadence(SITE) is None
+        assert scheduler.next_poll_at(SITE) == 1_000_010
+        assert not scheduler.should_poll(SITE, now=1_000_005)
+        assert scheduler.polls_saved == 0
+
+    def test_polls_saved_ignores_how_often_we_ask(self):
+        """Test that polls_saved counts against one poll per min_interval."""
+        scheduler = PollScheduler(min_interval=10)
+        scheduler.record(SITE, FakeSite().response(1_000_000), now=1_000_000)
+        for now in range(1_000_001, 1_000_010):
+            assert not scheduler.should_poll(SITE, now=now)
+        assert scheduler.polls_saved == 0
+        scheduler.should_poll(SITE, now=1_000_035)
+        assert scheduler.polls_saved == 3
+
+    def test_learns_cadence(self):
+        """Test that the cadence is the typical gap between samples."""
+        scheduler = PollScheduler()
+        simulate(scheduler, FakeSite(cadence=300), duration=1200)
+        assert scheduler.cadence(SITE) == 300
+
+    def test_saves_polls_without_losing_samples(self):
+        """Test that polls line up with updates and every sample is seen."""
+        site = FakeSite(cadence=300)
+        baseline = PollScheduler(min_interval=10, max_interval=10)
+        expected = simulate(baseline, site, duration=3600)
+        assert baseline.polls_made == 360
+
+        scheduler = PollScheduler(min_interval=10)
+        seen = simulate(scheduler, site, duration=3600)
+        assert seen == expected
+        assert scheduler.polls_made < 60
+        assert scheduler.polls_saved == 360 - scheduler.polls_made
+
+    def test_next_poll_follows_expected_update(self):
+        """Test that the next poll is lag seconds after the next sample."""
+        scheduler = PollScheduler(lag=2, min_samples=1)
+        site = FakeSite(cadence=300, phases=(0,), skew=5)
+        for now in (1_000_000, 1_000_300):
+            scheduler.record(SITE, site.response(now), now=now)
+        newest = site.datatime(1_000_300, 0)
+        assert scheduler.next_poll_at(SITE) == newest + 300 + 5 + 2
+
+    def test_late_data_is_rechecked_soon(self):
+        """Test that a poll without the expected update retries at min_interval."""
+        scheduler = PollScheduler(min_interval=10, min_samples=1)
+        site = FakeSite(cadence=300, phases=(0,), skew=0)
+        scheduler.record(SITE, site.response(1_000_000), now=1_000_000)
+        scheduler.record(SITE, site.response(1_000_300), now=1_000_300)
+        # The device stalls: the next poll sees the same sample
+        late = scheduler.next_poll_at(SITE) + 60
+        stalled = site.response(1_000_300)
+        for device in stalled.devices:
+            device.CURTIME = at(late)
+        assert not scheduler.record(SITE, stalled, now=late)
+        assert scheduler.polls_unchanged == 1
+        assert scheduler.next_poll_at(SITE) == late + 10
+
+    def test_max_interval_caps_the_gap(self):
+        """Test that a long cadence never pushes polls past max_interval."""
+        scheduler = PollScheduler(max_interval=60, min_samples=1)
+        site = FakeSite(cadence=900, phases=(0,), skew=0)
+        for now in (1_000_000, 1_000_900):
+            scheduler.record(SITE, site.response(now), now=now)
+        assert scheduler.next_poll_at(SITE) == 1_000_960
+
+    def test_records_fixture_response(self):
+        """Test learning from a real DeviceList response."""
+        with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+            response = DeviceDetailResponse.new(json.load(f))
+        scheduler = PollScheduler()
+        assert scheduler.record(SITE, response, now=1_750_551_400)
+        assert not scheduler.record(SITE, response, now=1_750_551_410)
+        assert (scheduler.polls_made, scheduler.polls_unchanged) == (2, 1)
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"min_interval": 0}, "intervals"),
+            ({"min_interval": 20, "max_interval": 10}, "intervals"),
+            ({"min_samples": 0}, "min_samples"),
+        ],
+    )
+    def test_invalid_settings(self, kwargs, match):
+        """Test that nonsensical settings are rejected."""
+        with pytest.raises(ValueError, match=match):
+            PollScheduler(**kwargs)
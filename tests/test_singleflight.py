@@ -0,0 +1,230 @@
+"""Tests for the sungazer.singleflight module."""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from sungazer.client import AsyncSungazerClient, SungazerClient
+from sungazer.models import DeviceDetailResponse
+from sungazer.singleflight import AsyncSingleFlight, SingleFlight
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def ok_response(data: dict) -> Mock:
+    """Build a mock 200 response carrying ``data``."""
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.content = json.dumps(data).encode()
+    mock_response.text = json.dumps(data)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+@pytest.fixture
+def device_list_data():
+    """Load DeviceList response fixture data."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestSingleFlight:
+    """Test cases for the threaded SingleFlight."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that overlapping calls with the same key run the function once."""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def slow():
+            calls.append(1)
+            release.wait(timeout=5)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(flight.do, "key", slow) for _ in range(8)]
+            # Give every worker a chance to join the in-flight call
+            deadline = time.monotonic() + 5
+            while flight.shared < 7 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert flight.executed == 1
+        assert flight.shared == 7
+
+    def test_different_keys_are_not_coalesced(self):
+        """Test that calls with different keys run independently."""
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
+        assert flight.executed == 2
+
+    def test_sequential_calls_are_not_cached(self):
+        """Test that a completed call is forgotten."""
+        flight = SingleFlight()
+        counter = iter(range(10))
+        assert flight.do("key", lambda: next(counter)) == 0
+        assert flight.do("key", lambda: next(counter)) == 1
+
+    def test_exception_is_shared(self):
+        """Test that followers see the leader's exception."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def boom():
+            release.wait(timeout=5)
+            msg = "device busy"
+            raise RuntimeError(msg)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flight.do, "key", boom) for _ in range(3)]
+            deadline = time.monotonic() + 5
+            while flight.shared < 2 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            release.set()
+            for future in futures:
+                with pytest.raises(RuntimeError, match="device busy"):
+                    future.result()
+        # The key is released even though the call failed
+        assert flight.do("key", lambda: "ok") == "ok"
+
+
+class TestAsyncSingleFlight:
+    """Test cases for AsyncSingleFlight."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that overlapping awaits with the same key run once."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", slow) for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert (flight.executed, flight.shared) == (1, 4)
+
+    def test_cancelling_a_waiter_does_not_cancel_the_call(self):
+        """Test that the shared call survives one caller being cancelled."""
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def run():
+            first = asyncio.ensure_future(flight.do("key", slow))
+            second = asyncio.ensure_future(flight.do("key", slow))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run()) == "done"
+
+    def test_exception_is_shared(self):
+        """Test that every waiter sees the exception."""
+        flight = AsyncSingleFlight()
+
+        async def boom():
+            await asyncio.sleep(0.01)
+            msg = "device busy"
+            raise RuntimeError(msg)
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do("key", boom) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestClientSingleFlight:
+    """Test single-flight coalescing through the clients."""
+
+    def test_single_flight_is_disabled_by_default(self):
+        """Test that clients do not coalesce unless asked to."""
+        client = SungazerClient(client=Mock(spec=httpx.Client))
+        assert client.single_flight is None
+        assert client.devices.single_flight is None
+
+    def test_sync_device_list_is_coalesced(self, device_list_data):
+        """Test that concurrent DeviceList calls share one GET and one model."""
+        mock_client = Mock(spec=httpx.Client)
+        release = threading.Event()
+
+        def get(*args, **kwargs):  # noqa: ARG001
+            release.wait(timeout=5)
+            return ok_response(device_list_data)
+
+        mock_client.get.side_effect = get
+        client = SungazerClient(client=mock_client, single_flight=True)
+        assert client.devices.single_flight is client.single_flight
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(client.devices.list) for _ in range(4)]
+            deadline = time.monotonic() + 5
+            while client.single_flight.shared < 3 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert mock_client.get.call_count == 1
+        assert isinstance(results[0], DeviceDetailResponse)
+        assert all(r is results[0] for r in results)
+
+    def test_async_grid_profile_get_is_coalesced(self):
+        """Test that concurrent async GridProfileGet calls share one GET."""
+        with (FIXTURES / "GridProfileGet" / "GridProfileGet.json").open() as f:
+            data = json.load(f)
+        mock_client = Mock(spec=httpx.AsyncClient)
+
+        async def get(*args, **kwargs):  # noqa: ARG001
+            await asyncio.sleep(0.01)
+            return ok_response(data)
+
+        mock_client.get.side_effect = get
+        client = AsyncSungazerClient(client=mock_client, single_flight=True)
+
+        async def run():
+            return await asyncio.gather(*(client.grid_profiles.get() for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert mock_client.get.await_count == 1
+        assert all(r is results[0] for r in results)
+
+    def test_different_commands_are_not_coalesced(self, device_list_data):
+        """Test that requests with different params still go out separately."""
+        mock_client = Mock(spec=httpx.AsyncClient)
+
+        async def get(path, params=None):  # noqa: ARG001
+            await asyncio.sleep(0.01)
+            if params["Command"] == "DeviceList":
+                return ok_response(device_list_data)
+            with (FIXTURES / "CheckFW" / "CheckFW.json").open() as f:
+                return ok_response(json.load(f))
+
+        mock_client.get.side_effect = get
+        client = AsyncSungazerClient(client=mock_client, single_flight=True)
+
+        async def run():
+            return await asyncio.gather(client.devices.list(), client.firmware.check())
+
+        asyncio.run(run())
+        assert mock_client.get.await_count == 2
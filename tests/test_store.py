@@ -0,0 +1,239 @@
+"""Tests for the sungazer.store module."""
+
+import copy
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from sungazer.models import (
+    DeviceDetailResponse,
+    PVDisconnectDetail,
+    SolarBridgeDeviceDetail,
+)
+from sungazer.store import DEVICE_COLUMNS, TABLES, DeviceStore
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def payload() -> dict:
+    """Load the decoded DeviceList fixture."""
+    with (FIXTURES / "DeviceList" / "DeviceList.json").open() as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def response(payload) -> DeviceDetailResponse:
+    """Parse the DeviceList fixture."""
+    return DeviceDetailResponse.new(payload)
+
+
+def later_poll(payload: dict, minutes: int) -> DeviceDetailResponse:
+    """Return ``payload`` as polled ``minutes`` later, with new inverter power."""
+    later = copy.deepcopy(payload)
+    for device in later["devices"]:
+        if device["DEVICE_TYPE"] == "Inverter":
+            device["DATATIME"] = f"2025,06,22,01,{minutes:02d},00"
+            device["p_3phsum_kw"] = f"{minutes / 100:.4f}"
+    return DeviceDetailResponse.new(later)
+
+
+def test_tables_follow_models():
+    """Each device model gets a metric table with its numeric fields."""
+    table = TABLES[SolarBridgeDeviceDetail]
+    assert table.name == "inverter_metrics"
+    columns = dict(table.columns)
+    assert columns["p_3phsum_kw"] == "REAL"
+    assert columns["stat_ind"] == "INTEGER"
+    assert columns["STATE"] == "TEXT"
+    assert "MODEL" not in columns
+    assert "DATATIME" not in columns
+    assert {"MODEL", "SWVER", "PANEL", "DEVICE_TYPE"} <= set(DEVICE_COLUMNS)
+
+
+def test_integer_literals_are_integers(response):
+    """Fields restricted to a set of integers are stored as integers."""
+    assert dict(TABLES[PVDisconnectDetail].columns)["relay1_state"] == "INTEGER"
+    store = DeviceStore()
+    store.write(response)
+    (row,) = store.metrics(PVDisconnectDetail)
+    assert row["relay1_state"] == 1
+
+
+def test_write_and_read_back(response):
+    """Every device with a DATATIME is stored, and reads back as written."""
+    store = DeviceStore()
+    written = store.write(response)
+    assert written == sum(1 for d in response.devices if d.DATATIME is not None)
+    rows = store.metrics("inverter")
+    assert len(rows) == len(response.inverters)
+    inverter = response.inverters[0]
+    row = next(r for r in rows if r["SERIAL"] == inverter.SERIAL)
+    assert row["DATATIME"] == inverter.DATATIME
+    assert row["p_3phsum_kw"] == inverter.p_3phsum_kw
+    assert row["STATE"] == inverter.STATE
+
+
+def test_devices_table(response):
+    """Devices are stored once each, with their metadata."""
+    store = DeviceStore()
+    store.write(response)
+    store.write(response)
+    devices = store.devices()
+    assert len(devices) == len(
+        {d.SERIAL for d in response.devices if d.DATATIME is not None}
+    )
+    inverters = store.devices(SolarBridgeDeviceDetail)
+    assert len(inverters) == len(response.inverters)
+    inverter = response.inverters[0]
+    record = next(d for d in inverters if d["SERIAL"] == inverter.SERIAL)
+    assert record["kind"] == "inverter"
+    assert record["MODEL"] == inverter.MODEL
+    assert record["PANEL"] == inverter.PANEL
+
+
+def test_same_poll_is_stored_once(response):
+    """Writing the same snapshot twice doesn't duplicate metric rows."""
+    store = DeviceStore()
+    store.write(response)
+    store.write(response)
+    assert len(store.metrics("inverter")) == len(response.inverters)
+
+
+def test_metadata_changes_are_kept(payload, response):
+    """A firmware upgrade updates the devices table."""
+    store = DeviceStore()
+    store.write(response)
+    upgraded = copy.deepcopy(payload)
+    inverter = next(d for d in upgraded["devices"] if d["DEVICE_TYPE"] == "Inverter")
+    inverter["SWVER"] = "9.9.9"
+    store.write(DeviceDetailResponse.new(upgraded))
+    record = next(d for d in store.devices() if d["SERIAL"] == inverter["SERIAL"])
+    assert record["SWVER"] == "9.9.9"
+
+
+def test_query_filters(payload):
+    """metrics() filters on serial number and time range."""
+    store = DeviceStore()
+    store.write_many(later_poll(payload, minute) for minute in range(10))
+    serial = store.devices("inverter")[0]["SERIAL"]
+    rows = store.metrics(
+        "inverter",
+        serial=serial,
+        start=datetime(2025, 6, 22, 1, 3, tzinfo=ZoneInfo("UTC")),
+        end=datetime(2025, 6, 22, 1, 6, tzinfo=ZoneInfo("UTC")),
+        columns=["p_3phsum_kw"],
+    )
+    assert [row["DATATIME"].minute for row in rows] == [3, 4, 5]
+    assert [row["p_3phsum_kw"] for row in rows] == [0.03, 0.04, 0.05]
+    assert set(rows[0]) == {"SERIAL", "DATATIME", "p_3phsum_kw"}
+    start = datetime(2025, 6, 22, 1, 8, tzinfo=ZoneInfo("UTC")).timestamp()
+    assert len(store.metrics("inverter", start=start)) == 2 * 12
+
+
+def test_series_matches_metrics(payload):
+    """series() returns the rows of metrics() as columns, with epoch DATATIME."""
+    store = DeviceStore()
+    store.write_many(later_poll(payload, minute) for minute in range(3))
+    rows = store.metrics("inverter", columns=["p_3phsum_kw"])
+    series = store.series("inverter", columns=["p_3phsum_kw"])
+    assert list(series) == ["SERIAL", "DATATIME", "p_3phsum_kw"]
+    assert series["SERIAL"] == [row["SERIAL"] for row in rows]
+    assert series["DATATIME"] == [int(row["DATATIME"].timestamp()) for row in rows]
+    assert series["p_3phsum_kw"] == [row["p_3phsum_kw"] for row in rows]
+    empty = store.series("inverter", serial="nope", columns=["p_3phsum_kw"])
+    assert empty == {"SERIAL": [], "DATATIME": [], "p_3phsum_kw": []}
+
+
+def test_unknown_kind_and_column():
+    """Unknown device kinds and columns are rejected."""
+    store = DeviceStore()
+    with pytest.raises(ValueError, match="Unknown device kind"):
+        store.metrics("toaster")
+    with pytest.raises(ValueError, match="Unknown inverter columns"):
+        store.metrics("inverter", columns=["nope"])
+    with pytest.raises(ValueError, match="batch_size"):
+        DeviceStore(batch_size=-1)
+
+
+def test_batched_writes(payload):
+    """Rows are buffered until batch_size of them are pending."""
+    store = DeviceStore(batch_size=30)
+    store.write(later_poll(payload, 0))
+    assert store.metrics("inverter") == []
+    store.write(later_poll(payload, 1))
+    assert len(store.metrics("inverter")) == 2 * 12
+    store.write(later_poll(payload, 2))
+    assert len(store.metrics("inverter")) == 2 * 12
+    store.flush()
+    assert len(store.metrics("inverter")) == 3 * 12
+
+
+def test_file_store_is_wal_and_persists(tmp_path, response):
+    """A file database runs in WAL mode and keeps its rows after closing."""
+    path = tmp_path / "sungazer.db"
+    with DeviceStore(path, batch_size=1000) as store:
+        store.write(response)
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    connection.close()
+    with DeviceStore(path) as store:
+        assert len(store.metrics("inverter")) == len(response.inverters)
+        assert len(store.devices("inverter")) == len(response.inverters)
+
+
+def test_older_databases_gain_new_columns(tmp_path, payload, response):
+    """Opening a database made before a field was added adds its column."""
+    path = tmp_path / "sungazer.db"
+    with DeviceStore(path) as store:
+        store.write(response)
+    # Simulate a database written before these fields existed
+    connection = sqlite3.connect(path)
+    connection.execute('ALTER TABLE inverter_metrics DROP COLUMN "stat_ind"')
+    connection.execute('ALTER TABLE devices DROP COLUMN "PANEL"')
+    connection.close()
+    with DeviceStore(path) as store:
+        store.write(later_poll(payload, 5))
+        rows = store.metrics("inverter", serial=response.inverters[0].SERIAL)
+        assert [row["stat_ind"] for row in rows] == [None, 0]
+        devices = store.devices("inverter")
+        assert {device["PANEL"] for device in devices} == {
+            inverter.PANEL for inverter in response.inverters
+        }
+
+
+def test_queries_use_the_primary_key(response):
+    """Range queries on one device are primary key range scans."""
+    store = DeviceStore()
+    store.write(response)
+    statements = []
+    connection = store._connection  # noqa: SLF001
+    connection.set_trace_callback(statements.append)
+    store.metrics("inverter", serial=response.inverters[0].SERIAL, start=0, end=1)
+    connection.set_trace_callback(None)
+    plan = connection.execute(f"EXPLAIN QUERY PLAN {statements[-1]}").fetchall()
+    steps = [step[-1] for step in plan]
+    assert any(
+        "USING PRIMARY KEY (device=? AND DATATIME>? AND DATATIME<?)" in step
+        for step in steps
+    )
+    assert not any(step.startswith("SCAN") for step in steps)
+
+
+def test_writes_from_many_threads(payload):
+    """The store can be shared between threads."""
+    store = DeviceStore()
+    threads = [
+        threading.Thread(target=store.write, args=(later_poll(payload, minute),))
+        for minute in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.metrics("inverter")) == 8 * 12
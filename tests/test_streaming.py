@@ -0,0 +1,205 @@
+"""Tests for the sungazer.streaming module."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from sungazer.client import AsyncSungazerClient, SungazerClient
+from sungazer.models import (
+    DeviceDetailResponse,
+    PVSDeviceDetail,
+    SolarBridgeDeviceDetail,
+)
+from sungazer.streaming import DeviceListParser
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+HEADERS = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nX-Odd: {not json}\r\n\r\n"
+)
+
+
+@pytest.fixture
+def device_list_body() -> bytes:
+    """Load the raw DeviceList response body."""
+    return (FIXTURES / "DeviceList" / "DeviceList.json").read_bytes()
+
+
+def chunks(data: bytes, size: int) -> list[bytes]:
+    """Split ``data`` into ``size``-byte chunks."""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def feed_all(parser: DeviceListParser, data: bytes, size: int) -> list[dict]:
+    """Feed ``data`` to ``parser`` in chunks and collect the records."""
+    records = []
+    for chunk in chunks(data, size):
+        records.extend(parser.feed(chunk))
+    return records
+
+
+class TestDeviceListParser:
+    """Test cases for the DeviceListParser class."""
+
+    @pytest.mark.parametrize("size", [1, 3, 64, 4096, 1 << 20])
+    def test_matches_json_loads(self, device_list_body, size):
+        """Test that any chunking yields the same records as json.loads."""
+        expected = json.loads(device_list_body)
+        parser = DeviceListParser()
+        assert feed_all(parser, device_list_body, size) == expected["devices"]
+        assert parser.close() == {"devices": [], "result": expected["result"]}
+        assert parser.count == len(expected["devices"])
+
+    def test_records_arrive_incrementally(self, device_list_body):
+        """Test that the first record is returned before the body ends."""
+        parser = DeviceListParser()
+        half = len(device_list_body) // 2
+        first = parser.feed(device_list_body[:half])
+        rest = parser.feed(device_list_body[half:])
+        assert first
+        assert rest
+        assert first[0]["DEVICE_TYPE"] == "PVS"
+
+    def test_buffer_holds_only_the_current_record(self, device_list_body):
+        """Test that consumed bytes are released as parsing proceeds."""
+        parser = DeviceListParser()
+        largest = 0
+        for chunk in chunks(device_list_body, 256):
+            parser.feed(chunk)
+            largest = max(largest, len(parser._buf))  # noqa: SLF001
+        assert largest < len(device_list_body) // 5
+
+    def test_ignores_leading_headers(self, device_list_body):
+        """Test that stray HTTP headers before the body are skipped."""
+        noisy = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n\r\n"
+        parser = DeviceListParser()
+        records = feed_all(parser, noisy + device_list_body + b"\r\n", 7)
+        assert len(records) == len(json.loads(device_list_body)["devices"])
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 4096])
+    def test_brace_inside_header_is_ignored(self, device_list_body, size):
+        """Test that a ``{`` mid-line in a leaked header is not the start."""
+        parser = DeviceListParser()
+        records = feed_all(parser, HEADERS + device_list_body, size)
+        expected = json.loads(device_list_body)
+        assert records == expected["devices"]
+        assert parser.close()["result"] == expected["result"]
+
+    @pytest.mark.parametrize("size", [1, 2, 5])
+    def test_strings_and_nesting(self, size):
+        """Test escapes, brackets in strings and nested or decoy arrays."""
+        body = (
+            b'{"note": "a\\"}{[", "devices": ['
+            b'{"a": "}\\\\", "n": {"b": [1, {}]}}, {"c": "]"}'
+            b'], "result": "succeed", "z": {"devices": [1]}}'
+        )
+        parser = DeviceListParser()
+        assert feed_all(parser, body, size) == json.loads(body)["devices"]
+        rest = parser.close()
+        assert rest["note"] == 'a"}{['
+        assert rest["z"] == {"devices": [1]}
+
+    def test_empty_body(self):
+        """Test that an empty body has no records and no remainder."""
+        parser = DeviceListParser()
+        assert parser.feed(b"") == []
+        assert parser.close() == {}
+
+    def test_truncated_body(self, device_list_body):
+        """Test that a body cut off mid-object is an error."""
+        parser = DeviceListParser()
+        parser.feed(device_list_body[:-10])
+        with pytest.raises(ValueError, match="ended before"):
+            parser.close()
+
+
+def streaming_transport(body: bytes, size: int = 512) -> httpx.MockTransport:
+    """Build a transport that sends ``body`` in ``size``-byte chunks."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["Command"] == "DeviceList"
+        return httpx.Response(200, content=iter(chunks(body, size)))
+
+    return httpx.MockTransport(handler)
+
+
+def async_streaming_transport(body: bytes, size: int = 512) -> httpx.MockTransport:
+    """Build an async transport that sends ``body`` in chunks."""
+
+    async def stream():
+        for chunk in chunks(body, size):
+            yield chunk
+
+    async def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        return httpx.Response(200, content=stream())
+
+    return httpx.MockTransport(handler)
+
+
+class TestClientStreaming:
+    """Test streamed DeviceList requests through the clients."""
+
+    def test_iter_yields_models(self, device_list_body):
+        """Test that devices.iter() yields typed models in order."""
+        http = httpx.Client(
+            base_url="http://pvs/cgi-bin",
+            transport=streaming_transport(device_list_body),
+        )
+        client = SungazerClient(client=http)
+        devices = list(client.devices.iter())
+        expected = DeviceDetailResponse.new(json.loads(device_list_body))
+        assert devices == expected.devices
+        assert isinstance(devices[0], PVSDeviceDetail)
+        assert sum(isinstance(d, SolarBridgeDeviceDetail) for d in devices) == 12
+
+    def test_list_stream_matches_list(self, device_list_body):
+        """Test that list(stream=True) builds the same response."""
+        http = httpx.Client(
+            base_url="http://pvs/cgi-bin",
+            transport=streaming_transport(device_list_body),
+        )
+        client = SungazerClient(client=http)
+        streamed = client.devices.list(stream=True)
+        assert streamed == DeviceDetailResponse.new(json.loads(device_list_body))
+        assert streamed.result == "succeed"
+
+    def test_leaked_headers_with_braces(self, device_list_body):
+        """Test that iter() and list(stream=True) skip leaked headers."""
+        http = httpx.Client(
+            base_url="http://pvs/cgi-bin",
+            transport=streaming_transport(HEADERS + device_list_body, size=16),
+        )
+        client = SungazerClient(client=http)
+        expected = DeviceDetailResponse.new(json.loads(device_list_body))
+        assert list(client.devices.iter()) == expected.devices
+        assert client.devices.list(stream=True) == expected
+
+    def test_iter_raises_http_errors(self):
+        """Test that an error status is raised before anything is yielded."""
+        transport = httpx.MockTransport(lambda _: httpx.Response(500))
+        client = SungazerClient(
+            client=httpx.Client(base_url="http://pvs/cgi-bin", transport=transport)
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            next(client.devices.iter())
+
+    def test_async_iter_and_list(self, device_list_body):
+        """Test the async streaming API."""
+        expected = DeviceDetailResponse.new(json.loads(device_list_body))
+
+        async def run():
+            http = httpx.AsyncClient(
+                base_url="http://pvs/cgi-bin",
+                transport=async_streaming_transport(device_list_body),
+            )
+            async with AsyncSungazerClient(client=http) as client:
+                devices = [device async for device in client.devices.iter()]
+                response = await client.devices.list(stream=True)
+            return devices, response
+
+        devices, response = asyncio.run(run())
+        assert devices == expected.devices
+        assert response == expected
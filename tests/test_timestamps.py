@@ -0,0 +1,82 @@
+"""Tests for the sungazer.models.timestamps module."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from sungazer.models import DeviceDetailResponse, GridProfileRefreshResponse
+from sungazer.models.timestamps import (
+    epoch_seconds,
+    parse_epoch_timestamp,
+    parse_pvs_timestamp,
+)
+
+
+class TestParsePVSTimestamp:
+    """Test cases for parse_pvs_timestamp."""
+
+    def test_parses_utc(self):
+        """Test that PVS6 timestamps become aware UTC datetimes."""
+        assert parse_pvs_timestamp("2025,06,22,00,15,54") == datetime(
+            2025, 6, 22, 0, 15, 54, tzinfo=ZoneInfo("UTC")
+        )
+
+    def test_results_are_shared(self):
+        """Test that a repeated timestamp is parsed once and reused."""
+        parse_pvs_timestamp.cache_clear()
+        first = parse_pvs_timestamp("2025,06,22,00,15,54")
+        assert parse_pvs_timestamp("2025,06,22,00,15,54") is first
+        info = parse_pvs_timestamp.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_cache_is_bounded(self):
+        """Test that the cache has a maximum size."""
+        assert parse_pvs_timestamp.cache_info().maxsize is not None
+
+    @pytest.mark.parametrize(
+        "value",
+        ["", "2025,06,22", "2025,13,22,00,15,54", "a,b,c,d,e,f", "1,2,3,4,5,6,7"],
+    )
+    def test_invalid(self, value):
+        """Test that malformed timestamps raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid datetime value"):
+            parse_pvs_timestamp(value)
+
+    def test_devices_share_datetimes(self):
+        """Test that devices with the same timestamp get the same object."""
+        device = {"DEVICE_TYPE": "Inverter", "DATATIME": "2025,06,22,00,15,54"}
+        response = DeviceDetailResponse.new({"devices": [device, dict(device)]})
+        first, second = response.devices
+        assert first.DATATIME is second.DATATIME
+
+
+class TestParseEpochTimestamp:
+    """Test cases for parse_epoch_timestamp."""
+
+    def test_parses_utc(self):
+        """Test that epoch seconds become aware UTC datetimes."""
+        assert parse_epoch_timestamp(1600704253) == datetime(
+            2020, 9, 21, 16, 4, 13, tzinfo=ZoneInfo("UTC")
+        )
+
+    def test_out_of_range(self):
+        """Test that impossible timestamps raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid Unix timestamp"):
+            parse_epoch_timestamp(10**20)
+
+    def test_grid_profile_refresh_uses_it(self):
+        """Test that GridProfileRefreshResponse parses creation with the cache."""
+        response = GridProfileRefreshResponse(result="succeed", creation="1600704253")
+        assert response.creation is parse_epoch_timestamp(1600704253)
+
+
+class TestEpochSeconds:
+    """Test cases for epoch_seconds."""
+
+    def test_datetimes_and_numbers(self):
+        """Test that datetimes and numbers become whole epoch seconds."""
+        moment = datetime(2020, 9, 21, 16, 4, 13, 500000, tzinfo=ZoneInfo("UTC"))
+        assert epoch_seconds(moment) == 1600704253
+        assert epoch_seconds(1600704253.9) == 1600704253
+        assert epoch_seconds(None) is None